@@ -1,6 +1,8 @@
-from fastapi import APIRouter
-from app.schemas import ClaimRequest, ClaimResponse
-from app.utils.extractor import extract_claims
+from fastapi import APIRouter, HTTPException, Response
+from app.schemas import ClaimRequest, ClaimResponse, IncrementalClaimRequest, IncrementalClaimResponse
+from app.utils.extraction_engine import extract_claims_async
+from app.services.incremental_extraction import incremental_extractor
+from app.services.claim_service import verify_claims
 
 router = APIRouter()
 
@@ -10,5 +12,37 @@ async def extract_claims_endpoint(request: ClaimRequest):
     Step 1: Extract claims from text using spaCy NER.
     Returns a list of sentences that contain verifiable entities.
     """
-    claims_texts = extract_claims(request.text)
+    claims_texts = await extract_claims_async(request.text)
     return {"claims": claims_texts}
+
+
+@router.post("/incremental", response_model=IncrementalClaimResponse)
+async def incremental_claims_endpoint(request: IncrementalClaimRequest):
+    """
+    Claims from the new part of a growing document (live-feed item, transcript).
+    Send the full text or only the appended text with the same document_id on
+    every update; only sentences not seen before are parsed and returned, and
+    with verify only those new claims are verified. A trailing unfinished
+    sentence is held back until it completes or final is set.
+    """
+    try:
+        update = await incremental_extractor.update(
+            request.document_id, text=request.text, append=request.append, final=request.final
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if request.verify and update["new_claims"]:
+        try:
+            update["results"] = await verify_claims(update["new_claims"])
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Verification failed: {str(e)}")
+    return update
+
+
+@router.delete("/incremental/{document_id}", status_code=204)
+async def forget_document(document_id: str):
+    """
+    Drops the stored state of a finished document.
+    """
+    incremental_extractor.forget(document_id)
+    return Response(status_code=204)
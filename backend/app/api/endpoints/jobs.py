@@ -0,0 +1,88 @@
+import asyncio
+import json
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+from app.schemas import VerificationRequest
+from app.services.job_queue import job_queue, JobConflict, QueueFull, TERMINAL
+# Importing the claim service registers the "verification" job handler.
+from app.services import claim_service  # noqa: F401
+
+router = APIRouter()
+
+# How often an event stream re-reads the store, for jobs run by another worker process.
+_POLL_SECONDS = 2.0
+
+
+def _summary(job: dict) -> dict:
+    return {k: v for k, v in job.items() if k != "payload"}
+
+
+@router.post("/verification", status_code=202)
+async def submit_verification(request: VerificationRequest,
+                              idempotency_key: Optional[str] = Header(None)):
+    """
+    Queues a full verification run and returns its job id at once. Poll
+    GET /jobs/{job_id} or follow GET /jobs/{job_id}/events for progress.
+    Retrying with the same Idempotency-Key header returns the original job.
+    """
+    if not request.claim.strip():
+        raise HTTPException(status_code=400, detail="No claim text provided")
+    try:
+        job, created = await job_queue.submit("verification", {"claim": request.claim}, idempotency_key)
+    except JobConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except QueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+    return JSONResponse(
+        status_code=202 if created else 200,
+        content=_summary(job),
+        headers={"Location": f"/jobs/{job['job_id']}"},
+    )
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: str):
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _summary(job)
+
+
+@router.get("/{job_id}/events")
+async def job_events(job_id: str):
+    """
+    Server-Sent Events stream of a job: the current state as a `status`
+    event, then `status` and `progress` events until it finishes. Jobs run
+    by another worker process are followed by polling the shared store.
+    """
+    watcher = job_queue.watch(job_id)
+    job = await job_queue.get(job_id)
+    if job is None:
+        job_queue.unwatch(job_id, watcher)
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events():
+        try:
+            yield f"event: status\ndata: {json.dumps(_summary(job))}\n\n"
+            status, updated_at, local = job["status"], job["updated_at"], False
+            while status not in TERMINAL:
+                try:
+                    event, data = await asyncio.wait_for(watcher.get(), timeout=_POLL_SECONDS)
+                    local = True
+                except asyncio.TimeoutError:
+                    current = None if local else await job_queue.get(job_id)
+                    if current is None or current["updated_at"] == updated_at:
+                        continue
+                    updated_at = current["updated_at"]
+                    event, data = "status", _summary(current)
+                status = data.get("status", status)
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+        finally:
+            job_queue.unwatch(job_id, watcher)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,42 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.services.factcheck_service import factcheck_cache_stats
+from app.services.reasoning_service import verdict_cache_stats
+from app.services.claim_clusters import claim_clusters
+from app.utils.metrics import registry, callback_gauge
+
+router = APIRouter()
+
+_CACHE_EVENTS = ("hits", "misses", "evictions", "expirations")
+
+
+def _cache_samples(stat: str):
+    caches = {f"factcheck_{tier}": stats for tier, stats in factcheck_cache_stats().items()}
+    caches["verdict"] = verdict_cache_stats()
+    if "shared" in caches["verdict"]:
+        caches["verdict_shared"] = caches["verdict"]["shared"]
+    if claim_clusters is not None:
+        caches["claim_clusters"] = claim_clusters.stats()
+    return [({"cache": name}, stats[stat]) for name, stats in caches.items() if stat in stats]
+
+
+def _cache_event_samples():
+    return [
+        ({**labels, "event": event}, value)
+        for event in _CACHE_EVENTS
+        for labels, value in _cache_samples(event)
+    ]
+
+
+callback_gauge("verisense_cache_events_total", "Cache lookups and removals by cache and event.",
+               ("cache", "event"), _cache_event_samples, kind="counter")
+callback_gauge("verisense_cache_entries", "Entries held by each in-process cache.",
+               ("cache",), lambda: _cache_samples("size"))
+
+
+@router.get("", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Counters and histograms in the Prometheus text exposition format.
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -1,9 +1,14 @@
-from fastapi import APIRouter
-from app.services.news_agent import get_combined_news
+from typing import Optional
+from fastapi import APIRouter, Query
+from app.services.news_aggregator import news_aggregator
 
 router = APIRouter()
 
 @router.get("/")
-async def get_news():
-    data = await get_combined_news()
-    return {"articles": data}
+async def get_news(cursor: Optional[str] = None, limit: int = Query(50, ge=1, le=200)):
+    """
+    Serves the aggregated feed from the in-memory snapshot that the
+    background aggregator refreshes. Pass `next_cursor` back as `cursor`
+    for the next page.
+    """
+    return await news_aggregator.page(cursor, limit)
@@ -1,8 +1,9 @@
+import json
 from fastapi import APIRouter
 from app.schemas import ReasoningRequest, ReasoningResponse
-from app.services.reasoning_service import reason_claim
+from app.services.reasoning_service import reason_claim, stream_reasoning
 from typing import List
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 router = APIRouter()
 
@@ -10,7 +11,7 @@ router = APIRouter()
 async def reasoning_endpoint(request: ReasoningRequest):
     try:
         evidence: List[str] = request.evidence or []
-        result = reason_claim(request.claim, evidence)
+        result = await reason_claim(request.claim, evidence)
 
   
         if "reasoning" not in result or not result["reasoning"]:
@@ -27,3 +28,21 @@ async def reasoning_endpoint(request: ReasoningRequest):
             status_code=500,
             content={"error": str(e)}
         )
+
+@router.post("/stream")
+async def reasoning_stream_endpoint(request: ReasoningRequest):
+    """
+    Server-Sent Events version of /run. Emits a `token` event per reasoning
+    chunk as the model produces it and closes with a `verdict` event.
+    """
+    evidence: List[str] = request.evidence or []
+
+    async def events():
+        async for item in stream_reasoning(request.claim, evidence):
+            yield f"event: {item['event']}\ndata: {json.dumps(item['data'])}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
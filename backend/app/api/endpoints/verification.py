@@ -1,5 +1,9 @@
+import json
 from fastapi import APIRouter, HTTPException
-from app.services.claim_service import process_claim
+from fastapi.responses import StreamingResponse
+from app.config import BATCH_MAX_DOCUMENTS
+from app.schemas import BatchVerificationRequest
+from app.services.claim_service import process_claim, stream_batch_verification
 
 router = APIRouter()
 
@@ -18,3 +22,20 @@ async def verify_claim_api(data: dict):
 @router.post("/run")
 async def verify_claim_run(data: dict):
     return await verify_claim_api(data)
+
+@router.post("/batch")
+async def verify_batch(request: BatchVerificationRequest):
+    """
+    Bulk verification for backfills. Streams one NDJSON line per
+    (document, claim) as soon as that claim is verified, then a summary line.
+    """
+    if not request.documents:
+        raise HTTPException(status_code=400, detail="No documents provided")
+    if len(request.documents) > BATCH_MAX_DOCUMENTS:
+        raise HTTPException(status_code=413, detail=f"At most {BATCH_MAX_DOCUMENTS} documents per batch")
+
+    async def ndjson():
+        async for item in stream_batch_verification(request.documents):
+            yield json.dumps(item) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
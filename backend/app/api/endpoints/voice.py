@@ -1,30 +1,148 @@
-from fastapi import APIRouter, UploadFile, File
-from app.utils.stt import transcribe_audio
-from app.utils.tts import generate_speech
-from app.utils.extractor import extract_claims
-from app.utils.verifier import verify_claim
-from app.utils.reasoner import reason_claim
+import asyncio
+import logging
+from fastapi import APIRouter, UploadFile, File, HTTPException
+from app.config import AUDIO_SEGMENT_SECONDS, STT_CONCURRENCY, FACTCHECK_CONCURRENCY
+from app.utils.audio_stream import upload_chunks, decode_to_pcm
+from app.utils.stt_engines import get_stt_engine, vad_segments, TranscriptionError
+from app.utils.tts import synthesize_speech, synthesizer, MEDIA_TYPES
+from app.services.incremental_extraction import DocumentState, extend
+from app.utils.concurrency import get_limiter
+from app.services.factcheck_service import verify_with_google_factcheck
 from fastapi.responses import FileResponse
+from app.utils.metrics import span
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+async def _verify_voice_claim(claim: str):
+    """
+    Same cached, coalesced fact-check lookup as the text pipeline, sharing
+    its upstream concurrency limit.
+    """
+    async with get_limiter("factcheck", FACTCHECK_CONCURRENCY):
+        result = await verify_with_google_factcheck(claim)
+    return {
+        "claim": claim,
+        "evidence": result.get("evidence", []),
+        "sources": result.get("sources", []),
+        "verdict": {
+            "claim": claim,
+            "verdict": result.get("verdict", "Unverified"),
+            "confidence": result.get("confidence", 0.5),
+        },
+    }
+
 
 @router.post("/process-audio")
 async def process_audio(file: UploadFile = File(...)):
-    file_location = f"temp_{file.filename}"
-    with open(file_location, "wb") as f:
-        f.write(file.file.read())
-
-    transcript = transcribe_audio(file_location)
-    claims = extract_claims(transcript)
-    results = []
-    for c in claims:
-        evidence = verify_claim(c)
-        verdict = reason_claim(c)
-        results.append({"claim": c, "evidence": evidence, "verdict": verdict})
-
-    speech_file = generate_speech("All claims processed. Check the dashboard for details.")
+    """
+    Streams the upload through ffmpeg to PCM, splits it into speech segments
+    at pauses (voice activity detection, at most AUDIO_SEGMENT_SECONDS each)
+    and transcribes them in parallel with the configured STT engine. The
+    transcript is extracted incrementally as segments arrive, so claims are
+    verified while later segments are still being transcribed, and a
+    repeated sentence is verified once. Nothing is written to disk, and at
+    most STT_CONCURRENCY segments of PCM are held in memory at once.
+    """
+    engine = get_stt_engine()
+    stt_slots = asyncio.Semaphore(max(1, STT_CONCURRENCY))
+    segments: asyncio.Queue = asyncio.Queue()
+    verifications = []
+    transcript_parts = []
+    transcript_state = DocumentState()
+    stt_errors = []
+
+    def verify_all(claims):
+        for claim in claims:
+            verifications.append(asyncio.create_task(_verify_voice_claim(claim)))
+
+    async def transcribe(segment: bytes):
+        # The STT slot was acquired by the producer.
+        try:
+            with span("stt"):
+                return await engine.transcribe(segment)
+        except TranscriptionError as e:
+            stt_errors.append(str(e))
+            return ""
+        finally:
+            stt_slots.release()
+
+    async def produce():
+        try:
+            async for segment in vad_segments(decode_to_pcm(upload_chunks(file)), max_segment_seconds=AUDIO_SEGMENT_SECONDS):
+                # Decoding waits for a free STT slot, so segments do not pile
+                # up in memory faster than they are transcribed.
+                await stt_slots.acquire()
+                await segments.put(asyncio.create_task(transcribe(segment)))
+        finally:
+            await segments.put(None)
+
+    async def consume():
+        # Segments are consumed in order so the transcript stays in order.
+        while True:
+            task = await segments.get()
+            if task is None:
+                break
+            text = (await task).strip()
+            if not text:
+                continue
+            transcript_parts.append(text)
+            # Segments end at pauses and STT output has no punctuation, so
+            # every segment boundary ends a sentence.
+            verify_all(await extend(transcript_state, text + " ", final=True))
+
+    def cancel_pending():
+        producer.cancel()
+        while not segments.empty():
+            task = segments.get_nowait()
+            if task is not None:
+                task.cancel()
+        for task in verifications:
+            task.cancel()
+
+    producer = asyncio.create_task(produce())
+    try:
+        await consume()
+        await producer
+    except RuntimeError as e:
+        cancel_pending()
+        return {"transcript": str(e), "results": [], "speech_file": None}
+    except BaseException:
+        # Includes the client going away: stop decoding, transcribing and
+        # verifying for a response nobody will read.
+        cancel_pending()
+        raise
+    finally:
+        await file.close()
+
+    transcript = " ".join(transcript_parts)
+    if transcript and not verifications:
+        # Same fallback as text extraction: no entity sentence, check it all.
+        verify_all([transcript])
+    results = list(await asyncio.gather(*verifications))
+    if not transcript:
+        transcript = stt_errors[0] if stt_errors else "Could not understand the audio. Please speak more clearly."
+
+    try:
+        speech_file = await synthesize_speech("All claims processed. Check the dashboard for details.")
+    except Exception as e:
+        logger.warning("Speech synthesis failed: %s", e)
+        speech_file = None
     return {"transcript": transcript, "results": results, "speech_file": speech_file}
 
 @router.get("/speech/{filename}")
 async def get_speech_file(filename: str):
-    return FileResponse(filename, media_type="audio/mpeg")
+    """
+    Serves synthesized audio from the TTS cache only. File names are content
+    hashes, so responses are immutable and can be cached by clients.
+    """
+    path = synthesizer.path_for(filename)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Speech file not found")
+    extension = filename.rsplit(".", 1)[-1]
+    return FileResponse(
+        path,
+        media_type=MEDIA_TYPES.get(extension, "application/octet-stream"),
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
@@ -1,9 +1,13 @@
 
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Default home of the SQLite files (evidence index, jobs), independent of the working directory.
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
 NEWS_API_KEY = os.getenv("NEWS_API_KEY")
 NEWSDATA_API_KEY = os.getenv("NEWSDATA_API_KEY")
 GOOGLE_FACTCHECK_API_KEY = os.getenv("GOOGLE_FACTCHECK_API_KEY")
@@ -14,3 +18,203 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 HUGGINGFACE_API_KEY=os.getenv("HUGGINGFACE_API_KEY")
 GOOGLE_GEMINI_API_KEY = os.getenv("GOOGLE_GEMINI_API_KEY")
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+
+# --- Upstream endpoints ---
+# Overridable so load tests can point the app at local stand-ins (bench/mock_upstreams.py).
+GOOGLE_FACTCHECK_URL = os.getenv("GOOGLE_FACTCHECK_URL", "https://factchecktools.googleapis.com/v1alpha1/claims:search")
+# Unset uses the Groq SDK default.
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL")
+NEWSAPI_URL = os.getenv("NEWSAPI_URL", "https://newsapi.org/v2/top-headlines")
+NEWSDATA_URL = os.getenv("NEWSDATA_URL", "https://newsdata.io/api/1/news")
+PIB_RSS_URL = os.getenv("PIB_RSS_URL", "https://pib.gov.in/rssfeed.aspx")
+TWITTER_SEARCH_URL = os.getenv("TWITTER_SEARCH_URL", "https://api.twitter.com/2/tweets/search/recent")
+REDDIT_URL = os.getenv("REDDIT_URL", "https://www.reddit.com")
+REDDIT_OAUTH_URL = os.getenv("REDDIT_OAUTH_URL", "https://oauth.reddit.com")
+
+# --- Claim pipeline concurrency ---
+# Max in-flight calls per upstream when process_claim fans out over claims.
+FACTCHECK_CONCURRENCY = int(os.getenv("FACTCHECK_CONCURRENCY", "8"))
+REASONING_CONCURRENCY = int(os.getenv("REASONING_CONCURRENCY", "4"))
+# Set to "false" to fall back to the sequential one-claim-at-a-time pipeline.
+PIPELINE_CONCURRENT = os.getenv("PIPELINE_CONCURRENT", "true").lower() == "true"
+
+# --- Shared outbound HTTP client ---
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "20"))
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+HTTP_DNS_CACHE_TTL = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_TOTAL_TIMEOUT = float(os.getenv("HTTP_TOTAL_TIMEOUT", "15"))
+
+# --- Shared cache (multi-worker serving) ---
+# SQLite file (WAL mode) shared by every worker process on the host. When set,
+# fact-check results, reasoning verdicts and the news snapshot are stored there
+# too, so workers share hits instead of each warming its own cache.
+SHARED_CACHE_DB = os.getenv("SHARED_CACHE_DB")
+# How often a worker that does not own the news refresh re-reads the shared snapshot.
+NEWS_SHARED_POLL_SECONDS = float(os.getenv("NEWS_SHARED_POLL_SECONDS", "15"))
+
+# --- Fact-check result cache ---
+FACTCHECK_CACHE_SIZE = int(os.getenv("FACTCHECK_CACHE_SIZE", "4096"))
+# TTL (seconds) for results with fact-checks, and for "no related fact-checks".
+FACTCHECK_CACHE_TTL = float(os.getenv("FACTCHECK_CACHE_TTL", "86400"))
+FACTCHECK_CACHE_EMPTY_TTL = float(os.getenv("FACTCHECK_CACHE_EMPTY_TTL", "3600"))
+# Path of the optional on-disk SQLite tier; leave unset to keep it in memory only
+# (defaults to SHARED_CACHE_DB).
+FACTCHECK_CACHE_DB = os.getenv("FACTCHECK_CACHE_DB", SHARED_CACHE_DB)
+
+# --- Reasoning verdict cache ---
+VERDICT_CACHE_SIZE = int(os.getenv("VERDICT_CACHE_SIZE", "4096"))
+VERDICT_CACHE_TTL = float(os.getenv("VERDICT_CACHE_TTL", "21600"))
+# Reuse a cached verdict when a new claim is a close paraphrase (MinHash LSH).
+VERDICT_NEAR_DUPLICATE = os.getenv("VERDICT_NEAR_DUPLICATE", "false").lower() == "true"
+VERDICT_SIMILARITY_THRESHOLD = float(os.getenv("VERDICT_SIMILARITY_THRESHOLD", "0.8"))
+
+# --- Claim clustering (opt-in) ---
+# Near-duplicate claims (same entities and negations, similar content words)
+# join one cluster and reuse its verification result while it is younger
+# than CLUSTER_STALENESS_SECONDS; an older result is re-verified on next use.
+CLAIM_CLUSTERING = os.getenv("CLAIM_CLUSTERING", "false").lower() == "true"
+CLUSTER_SIMILARITY_THRESHOLD = float(os.getenv("CLUSTER_SIMILARITY_THRESHOLD", "0.8"))
+CLUSTER_STALENESS_SECONDS = float(os.getenv("CLUSTER_STALENESS_SECONDS", "3600"))
+CLUSTER_MAX_CLUSTERS = int(os.getenv("CLUSTER_MAX_CLUSTERS", "20000"))
+# Clusters unused for this long are dropped from the index.
+CLUSTER_TTL = float(os.getenv("CLUSTER_TTL", "86400"))
+
+# --- Claim extraction engine ---
+# Micro-batching of concurrent extract requests into nlp.pipe calls.
+EXTRACTION_BATCH_SIZE = int(os.getenv("EXTRACTION_BATCH_SIZE", "32"))
+EXTRACTION_MAX_WAIT_MS = float(os.getenv("EXTRACTION_MAX_WAIT_MS", "5"))
+# Worker processes for spaCy parsing; 0 runs batches in one background thread.
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", "0"))
+
+# --- Incremental extraction ---
+# Growing documents (live feeds, transcripts) tracked for incremental updates.
+INCREMENTAL_MAX_DOCUMENTS = int(os.getenv("INCREMENTAL_MAX_DOCUMENTS", "10000"))
+# A document's state is dropped after this long without an update.
+INCREMENTAL_STATE_TTL = float(os.getenv("INCREMENTAL_STATE_TTL", "21600"))
+
+# --- Batch verification ---
+# Unique claims allowed in flight before more documents are extracted.
+BATCH_MAX_IN_FLIGHT = int(os.getenv("BATCH_MAX_IN_FLIGHT", "64"))
+BATCH_MAX_DOCUMENTS = int(os.getenv("BATCH_MAX_DOCUMENTS", "50000"))
+# Finished results kept to answer repeats of a claim later in the batch; an
+# older repeat is verified again (cheap through the fact-check/verdict caches).
+BATCH_RECENT_RESULTS = int(os.getenv("BATCH_RECENT_RESULTS", "1024"))
+
+# --- LLM dispatch (Groq) ---
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+# Per-minute budgets enforced with token buckets; 0 disables a limit.
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "60"))
+LLM_TOKENS_PER_MINUTE = float(os.getenv("LLM_TOKENS_PER_MINUTE", "60000"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "20"))
+
+# --- Batched multi-claim reasoning (opt-in) ---
+# Pack all claims of one article into as few Groq prompts as the budget allows.
+REASONING_BATCH_MODE = os.getenv("REASONING_BATCH_MODE", "false").lower() == "true"
+REASONING_BATCH_MAX_CLAIMS = int(os.getenv("REASONING_BATCH_MAX_CLAIMS", "8"))
+# Estimated tokens (prompt + completion) one batched call may use.
+REASONING_BATCH_TOKEN_BUDGET = int(os.getenv("REASONING_BATCH_TOKEN_BUDGET", "8000"))
+# Completion allowance: shared thinking budget plus a per-claim answer budget.
+REASONING_BATCH_BASE_TOKENS = int(os.getenv("REASONING_BATCH_BASE_TOKENS", "1024"))
+REASONING_BATCH_TOKENS_PER_CLAIM = int(os.getenv("REASONING_BATCH_TOKENS_PER_CLAIM", "384"))
+
+# --- Reasoning engines ---
+# Engines in fallback order: "groq", "local" (CPU NLI model), "keyword".
+REASONING_ENGINES = [e.strip() for e in os.getenv("REASONING_ENGINES", "groq,keyword").split(",") if e.strip()]
+# "fallback", "latency_budget" or "hedged".
+REASONING_POLICY = os.getenv("REASONING_POLICY", "fallback")
+REASONING_LATENCY_BUDGET_MS = float(os.getenv("REASONING_LATENCY_BUDGET_MS", "8000"))
+REASONING_HEDGE_DELAY_MS = float(os.getenv("REASONING_HEDGE_DELAY_MS", "1500"))
+LOCAL_NLI_MODEL = os.getenv("LOCAL_NLI_MODEL", "cross-encoder/nli-distilroberta-base")
+LOCAL_NLI_WORKERS = int(os.getenv("LOCAL_NLI_WORKERS", "1"))
+
+# --- News aggregator ---
+NEWS_REFRESH_SECONDS = float(os.getenv("NEWS_REFRESH_SECONDS", "300"))
+NEWS_SNAPSHOT_SIZE = int(os.getenv("NEWS_SNAPSHOT_SIZE", "500"))
+
+# --- Social ingestion ---
+SOCIAL_SUBREDDITS = [s.strip() for s in os.getenv("SOCIAL_SUBREDDITS", "worldnews").split(",") if s.strip()]
+SOCIAL_TWITTER_QUERIES = [q.strip() for q in os.getenv("SOCIAL_TWITTER_QUERIES", "crisis").split(",") if q.strip()]
+# Threads for the synchronous PRAW client.
+SOCIAL_REDDIT_THREADS = int(os.getenv("SOCIAL_REDDIT_THREADS", "4"))
+SOCIAL_CACHE_TTL = float(os.getenv("SOCIAL_CACHE_TTL", "60"))
+
+# --- Voice pipeline ---
+FFMPEG_BINARY = os.getenv("FFMPEG_BINARY", "ffmpeg")
+AUDIO_SAMPLE_RATE = int(os.getenv("AUDIO_SAMPLE_RATE", "16000"))
+AUDIO_UPLOAD_CHUNK_BYTES = int(os.getenv("AUDIO_UPLOAD_CHUNK_BYTES", "65536"))
+# Length of the pieces long recordings are transcribed in.
+AUDIO_SEGMENT_SECONDS = float(os.getenv("AUDIO_SEGMENT_SECONDS", "30"))
+# Segments transcribed at the same time per request.
+STT_CONCURRENCY = int(os.getenv("STT_CONCURRENCY", "2"))
+# "google" (Google Web Speech API) or "vosk" (offline, CPU-only).
+STT_ENGINE = os.getenv("STT_ENGINE", "google")
+# Worker processes for the offline engine; each loads the model once.
+STT_WORKERS = int(os.getenv("STT_WORKERS", "2"))
+VOSK_MODEL_PATH = os.getenv("VOSK_MODEL_PATH", "models/vosk-model-small-en-us-0.15")
+# Energy-based voice activity detection used to split recordings at pauses.
+VAD_FRAME_MS = int(os.getenv("VAD_FRAME_MS", "30"))
+VAD_ENERGY_THRESHOLD = float(os.getenv("VAD_ENERGY_THRESHOLD", "300"))
+VAD_MIN_SILENCE_MS = int(os.getenv("VAD_MIN_SILENCE_MS", "500"))
+VAD_PADDING_MS = int(os.getenv("VAD_PADDING_MS", "200"))
+
+# --- Text-to-speech ---
+# Synthesized audio is cached here by a hash of the text and voice settings.
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", os.path.join(tempfile.gettempdir(), "verisense-tts"))
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(100 * 1024 * 1024)))
+TTS_CACHE_MAX_AGE = float(os.getenv("TTS_CACHE_MAX_AGE", str(7 * 24 * 3600)))
+# pyttsx3 writes WAV with the espeak and SAPI drivers (AIFF on macOS).
+TTS_FILE_EXTENSION = os.getenv("TTS_FILE_EXTENSION", "wav")
+TTS_VOICE = os.getenv("TTS_VOICE") or None
+TTS_RATE = int(os.getenv("TTS_RATE", "0")) or None
+TTS_VOLUME = float(os.getenv("TTS_VOLUME")) if os.getenv("TTS_VOLUME") else None
+
+# --- Local evidence retrieval ---
+# SQLite file holding the BM25 index over ingested news and social posts; empty disables it.
+RETRIEVAL_DB = os.getenv("RETRIEVAL_DB", os.path.join(DATA_DIR, "evidence.db"))
+RETRIEVAL_TOP_K = int(os.getenv("RETRIEVAL_TOP_K", "5"))
+RETRIEVAL_PASSAGE_WORDS = int(os.getenv("RETRIEVAL_PASSAGE_WORDS", "120"))
+RETRIEVAL_MAX_DOCUMENTS = int(os.getenv("RETRIEVAL_MAX_DOCUMENTS", "100000"))
+# Fraction of a claim's terms a passage must contain to count as evidence.
+RETRIEVAL_MIN_OVERLAP = float(os.getenv("RETRIEVAL_MIN_OVERLAP", "0.3"))
+# Optional encoder for the vector index, e.g. "sentence-transformers/all-MiniLM-L6-v2".
+RETRIEVAL_EMBEDDING_MODEL = os.getenv("RETRIEVAL_EMBEDDING_MODEL", "")
+
+# --- Verdict scoring ---
+# Optional JSON file of {"publisher name": reliability weight} merged over the built-in table.
+PUBLISHER_WEIGHTS_FILE = os.getenv("PUBLISHER_WEIGHTS_FILE")
+
+# --- Background jobs ---
+JOB_DB = os.getenv("JOB_DB", os.path.join(DATA_DIR, "jobs.db"))
+# Jobs run at the same time; the rest wait in the queue.
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+# Waiting jobs beyond this are rejected with 503.
+JOB_QUEUE_LIMIT = int(os.getenv("JOB_QUEUE_LIMIT", "1000"))
+# Finished jobs are kept this long for polling.
+JOB_RESULT_TTL = float(os.getenv("JOB_RESULT_TTL", "86400"))
+
+# --- Observability ---
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# Adds a Server-Timing header with per-stage durations to every response.
+SERVER_TIMING_HEADER = os.getenv("SERVER_TIMING_HEADER", "true").lower() == "true"
+
+# --- Startup ---
+# Heavy dependencies loaded in the background right after startup; the rest
+# load on first use. Names: spacy, reddit, googleapiclient, speech_recognition,
+# recognizer, pydub, pyttsx3, evidence_index.
+WARMUP_RESOURCES = [r.strip() for r in os.getenv("WARMUP_RESOURCES", "spacy").split(",") if r.strip()]
+# Resources that must be loaded before /ready reports ready (defaults to the warm-up list).
+READINESS_RESOURCES = [
+    r.strip() for r in os.getenv("READINESS_RESOURCES", ",".join(WARMUP_RESOURCES)).split(",") if r.strip()
+]
+
+# --- Serving (python -m app.serve) ---
+SERVE_HOST = os.getenv("SERVE_HOST", "0.0.0.0")
+SERVE_PORT = int(os.getenv("SERVE_PORT", "10000"))
+# Worker processes forked after the models are loaded.
+SERVE_WORKERS = int(os.getenv("SERVE_WORKERS", "2"))
+# Resources loaded in the parent before forking, shared copy-on-write by the workers.
+PRELOAD_RESOURCES = [r.strip() for r in os.getenv("PRELOAD_RESOURCES", "spacy").split(",") if r.strip()]
@@ -1,6 +1,23 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+import time
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.endpoints import news, social, claims, verification, reasoning, voice
+from app.api.endpoints import news, social, claims, verification, reasoning, voice, jobs, metrics
+from app.config import LOG_LEVEL, SERVER_TIMING_HEADER, WARMUP_RESOURCES, READINESS_RESOURCES
+from app.services.http_client import start_http_client, close_http_client
+from app.utils.extraction_engine import extraction_engine
+from app.services.llm_dispatcher import llm_dispatcher
+from app.services.reasoning_engines import close_engines
+from app.services.news_aggregator import news_aggregator
+from app.utils.stt_engines import get_stt_engine, close_stt_engines
+from app.utils.tts import synthesizer
+from app.services.job_queue import job_queue
+from app.utils.resources import warm_up, resource_status
+from app.utils.metrics import histogram, start_request_timings, finish_request_timings, server_timing_header
+
+logging.basicConfig(level=LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
 
 app = FastAPI(title="VeriSense")
 
@@ -17,8 +34,72 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all methods (GET, POST, etc.)
     allow_headers=["*"],  # Allows all headers
+    expose_headers=["Server-Timing"],
+)
+
+HTTP_DURATION = histogram(
+    "verisense_http_request_duration_seconds", "HTTP request latency by route.", ("method", "route", "status")
 )
 
+
+@app.middleware("http")
+async def record_request_timing(request: Request, call_next):
+    """
+    Records request latency per route and, with SERVER_TIMING_HEADER, reports
+    the stages that ran before the response started in a Server-Timing header.
+    """
+    token = start_request_timings()
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        elapsed = time.perf_counter() - start
+        timings = finish_request_timings(token)
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        HTTP_DURATION.observe(elapsed, method=request.method, route=route, status=str(status))
+    if SERVER_TIMING_HEADER:
+        response.headers["Server-Timing"] = server_timing_header(timings, elapsed)
+    return response
+
+@app.on_event("startup")
+async def startup():
+    await start_http_client()
+    await news_aggregator.start()
+    await job_queue.start()
+    get_stt_engine().warm()
+    # Models load in the background so the server accepts traffic immediately.
+    app.state.warmup = asyncio.get_running_loop().create_task(warm_up(WARMUP_RESOURCES))
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    app.state.warmup.cancel()
+    await job_queue.stop()
+    await news_aggregator.stop()
+    await close_http_client()
+    await extraction_engine.close()
+    await llm_dispatcher.close()
+    close_engines()
+    close_stt_engines()
+    synthesizer.close()
+
+
+@app.get("/ready")
+def readiness():
+    """
+    Per-component load state. 200 once every READINESS_RESOURCES entry is
+    loaded, 503 before that, so load balancers only route to warm replicas.
+    """
+    components = resource_status()
+    ready = all(components.get(name, {}).get("state") == "ready" for name in READINESS_RESOURCES)
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, "required": READINESS_RESOURCES, "components": components},
+    )
+
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to VeriSense Backend! Access API endpoints at /news, /claims, /voice, etc."}
@@ -30,3 +111,5 @@ app.include_router(claims.router, prefix="/claims", tags=["Claims"])
 app.include_router(verification.router, prefix="/verification", tags=["Verification"])
 app.include_router(reasoning.router, prefix="/reasoning", tags=["Reasoning"])
 app.include_router(voice.router, prefix="/voice", tags=["Voice"])
+app.include_router(jobs.router, prefix="/jobs", tags=["Jobs"])
+app.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
@@ -11,6 +11,26 @@ class ClaimResponse(BaseModel):
     claims: List[str]
 
 
+# --- Incremental extraction (growing documents) ---
+class IncrementalClaimRequest(BaseModel):
+    document_id: str
+    text: Optional[str] = None  # full current text of the document...
+    append: Optional[str] = None  # ...or only the text added since the last update
+    final: bool = False  # document complete: process its last sentence too
+    verify: bool = False  # run the verification pipeline on the new claims
+
+
+class IncrementalClaimResponse(BaseModel):
+    document_id: str
+    new_claims: List[str]
+    results: Optional[List[dict]] = None  # verification results when verify is set
+    processed_chars: int
+    pending: str
+    sentences: int
+    claims: int
+    reset: bool
+
+
 # --- Step 2: Verification (Evidence Gathering) ---
 class VerificationRequest(BaseModel):
     claim: str
@@ -31,3 +51,8 @@ class ReasoningResponse(BaseModel):
     verdict: str  # e.g., "True", "False", or "Needs Review"
     confidence: float  # value between 0.0 and 1.0
     reasoning: List[str]  # explanation sentences
+
+
+# --- Bulk verification ---
+class BatchVerificationRequest(BaseModel):
+    documents: List[str]  # raw article texts; claims are extracted from each
@@ -0,0 +1,146 @@
+"""
+Production entry point with several worker processes:
+
+    python -m app.serve [--workers N] [--host HOST] [--port PORT]
+
+Unlike `uvicorn --workers`, which starts every worker as a fresh
+interpreter, the app is imported and the PRELOAD_RESOURCES models are
+loaded once in this parent process, which then forks the workers. The
+workers share those pages copy-on-write, so memory grows with the requests
+they serve rather than with a full model copy per worker. gc.freeze() keeps
+the garbage collector from touching (and so copying) the preloaded objects.
+
+All workers accept on one listening socket. Fact-check results, verdicts
+and the news snapshot are shared through SHARED_CACHE_DB, which defaults to
+DEFAULT_SHARED_CACHE_DB here (set it empty to give every worker its own
+caches). A worker that dies is restarted after its running jobs are
+requeued; SIGTERM/SIGINT stop all workers gracefully.
+"""
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import time
+from typing import Iterable, Set
+
+import uvicorn
+
+# In backend/data, next to the evidence and job databases, whatever the working directory.
+DEFAULT_SHARED_CACHE_DB = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "shared.db")
+# Must be set before app.config is read: several workers without a shared
+# cache would each warm their own caches and poll the news upstreams.
+os.environ.setdefault("SHARED_CACHE_DB", DEFAULT_SHARED_CACHE_DB)
+
+from app.config import LOG_LEVEL, PRELOAD_RESOURCES, SERVE_HOST, SERVE_PORT, SERVE_WORKERS
+from app.main import app
+from app.services.job_queue import job_queue
+from app.utils.resources import get_resource
+
+logger = logging.getLogger(__name__)
+
+# Pause before replacing a worker that exited, so a crash loop does not spin.
+RESTART_DELAY = 1.0
+
+
+def preload(names: Iterable[str]):
+    """
+    Loads resources in this process so forked workers inherit them ready.
+    Failures are logged; the workers then load those resources on first use.
+    """
+    for name in names:
+        resource = get_resource(name)
+        if resource is None:
+            logger.warning("Unknown preload resource: %s", name)
+            continue
+        try:
+            resource.get()
+            logger.info("Preloaded %s in %.2fs", name, resource.load_seconds)
+        except Exception as e:
+            logger.warning("Could not preload %s: %s", name, e)
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(sock: socket.socket):
+    # uvicorn installs its own handlers for a graceful shutdown.
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    config = uvicorn.Config(app, log_level=LOG_LEVEL.lower())
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def _spawn(sock: socket.socket) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            _run_worker(sock)
+        except BaseException:
+            logger.exception("Worker %s crashed", os.getpid())
+            code = 1
+        finally:
+            # Never return into the parent's supervision loop.
+            os._exit(code)
+    return pid
+
+
+def serve(host: str = SERVE_HOST, port: int = SERVE_PORT, workers: int = SERVE_WORKERS):
+    sock = _bind(host, port)
+    preload(PRELOAD_RESOURCES)
+    # Interrupted jobs are requeued once here rather than by each worker.
+    job_queue.store.requeue_running()
+    job_queue.recover_on_start = False
+    gc.collect()
+    gc.freeze()
+
+    children: Set[int] = {_spawn(sock) for _ in range(max(1, workers))}
+    logger.info("Serving on %s:%s with %d workers: %s", host, port, len(children), sorted(children))
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        children.discard(pid)
+        if not stopping:
+            requeued = job_queue.store.requeue_running(owner=pid)
+            logger.warning("Worker %s exited with status %s; requeued %d running jobs; restarting",
+                           pid, status, requeued)
+            time.sleep(RESTART_DELAY)
+            children.add(_spawn(sock))
+    sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run VeriSense with pre-forked workers.")
+    parser.add_argument("--host", default=SERVE_HOST)
+    parser.add_argument("--port", type=int, default=SERVE_PORT)
+    parser.add_argument("--workers", type=int, default=SERVE_WORKERS)
+    args = parser.parse_args()
+    serve(args.host, args.port, args.workers)
+
+
+if __name__ == "__main__":
+    main()
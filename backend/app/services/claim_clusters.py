@@ -0,0 +1,228 @@
+import asyncio
+import copy
+import hashlib
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from app.config import (
+    CLAIM_CLUSTERING,
+    CLUSTER_SIMILARITY_THRESHOLD,
+    CLUSTER_STALENESS_SECONDS,
+    CLUSTER_MAX_CLUSTERS,
+    CLUSTER_TTL,
+)
+from app.services.factcheck_service import normalize_claim
+from app.utils.cache import TTLCache
+from app.utils.extraction_engine import extraction_engine
+from app.utils.extractor import NEGATION_WORDS
+from app.utils.metrics import counter
+from app.utils.minhash import MinHashLSH, shingles
+
+logger = logging.getLogger(__name__)
+
+CLUSTER_CLAIMS = counter(
+    "verisense_claim_cluster_claims_total",
+    "Claims resolved through the cluster index, by outcome "
+    "(reused: fresh cluster result, joined: waited for a verification in flight, verified: ran the pipeline).",
+    ("outcome",),
+)
+
+# Verification callback: claims to verify -> one result per claim, in order.
+VerifyMany = Callable[[List[str]], Awaitable[List[dict]]]
+
+
+def claim_features(entities: List[str], words: List[str]) -> set:
+    """
+    MinHash items of a canonical claim: content-word unigrams and bigrams,
+    plus the entities themselves so that they weigh in twice.
+    """
+    text = " ".join(words)
+    return shingles(text, 1) | shingles(text, 2) | set(entities)
+
+
+class ClaimClusterIndex:
+    """
+    Groups near-duplicate claims into clusters that share one verification
+    result, so fact-checking and reasoning run once per cluster rather than
+    once per copy of a claim.
+
+    A claim is canonicalized from its spaCy parse (entities normalized,
+    stop words and punctuation dropped, but negation, comparison and
+    direction words kept) and matched to the closest cluster through a
+    MinHash LSH index over its content-word shingles. A match only counts if
+    both claims name exactly the same entities and negation words, so
+    "5 killed in Paris" never reuses the result for "50 killed in Paris",
+    nor "X was not born in Kenya" the one for "X was born in Kenya". Exact
+    repeats (same normalized text) skip parsing through an alias table.
+
+    A cluster's result is reused while it is younger than `staleness`
+    seconds; after that the next claim of the cluster is verified again and
+    its result replaces the old one. Concurrent claims of one cluster wait
+    for a single verification, which runs in its own task so that it
+    survives the cancellation of the request that started it. Degraded
+    results (a failed fact-check lookup or reasoning) are handed to the
+    claims that waited for them but never stored. The index lives in the
+    process, like the verdict paraphrase index.
+
+    Args:
+        threshold (float): Minimum estimated Jaccard similarity to join a cluster.
+        staleness (float): Seconds a cluster result may be reused.
+        max_clusters (int): Clusters kept; the least recently used are dropped.
+        ttl (float): Seconds an unused cluster is kept.
+    """
+
+    def __init__(self, threshold: float = 0.8, staleness: float = 3600, max_clusters: int = 20000,
+                 ttl: float = 86400):
+        self.staleness = staleness
+        self._lsh = MinHashLSH(threshold=threshold, num_perm=128, bands=32, max_items=max_clusters)
+        self._clusters = TTLCache(max_size=max_clusters, default_ttl=ttl)
+        self._aliases = TTLCache(max_size=max_clusters * 4, default_ttl=ttl)
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def _cluster(self, cluster_id: str) -> Optional[dict]:
+        cluster = self._clusters.get(cluster_id)
+        if cluster is None:
+            # Expired or evicted; drop its stale index entry.
+            self._lsh.remove(cluster_id)
+        return cluster
+
+    def _match(self, entities: List[str], negations: List[str], features: set) -> Tuple[Optional[dict], float]:
+        match = self._lsh.query(features)
+        if match is None:
+            return None, 0.0
+        cluster = self._cluster(match[0])
+        if cluster is None or cluster["entities"] != entities or cluster["negations"] != negations:
+            return None, 0.0
+        return cluster, match[1]
+
+    async def assign(self, claim: str) -> Tuple[dict, float]:
+        """
+        Returns the cluster of `claim` and its estimated similarity to the
+        cluster's first claim (1.0 for an exact repeat), creating a new
+        cluster when none matches.
+        """
+        key = normalize_claim(claim)
+        cluster_id = self._aliases.get(key)
+        cluster = self._cluster(cluster_id) if cluster_id is not None else None
+        similarity = 1.0
+        if cluster is None:
+            entities, words = await extraction_engine.canonicalize(claim)
+            features = claim_features(entities, words)
+            negations = sorted(NEGATION_WORDS.intersection(words))
+            # No await from here on: a near-duplicate parsed in the same
+            # batch finds the cluster created for this claim.
+            cluster, similarity = self._match(entities, negations, features)
+            if cluster is None:
+                cluster_id = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+                cluster = {"id": cluster_id, "claim": claim, "entities": entities, "negations": negations,
+                           "claims": 0, "result": None, "verified_at": 0.0}
+                self._lsh.insert(cluster_id, features)
+                similarity = 1.0
+            cluster["claims"] += 1
+            self._aliases.set(key, cluster["id"])
+        # Re-set to keep a cluster in use from expiring.
+        self._clusters.set(cluster["id"], cluster)
+        return cluster, similarity
+
+    def _fresh(self, cluster: dict) -> bool:
+        return cluster["result"] is not None and time.time() - cluster["verified_at"] <= self.staleness
+
+    async def resolve(self, claims: List[str], verify_many: VerifyMany) -> List[dict]:
+        """
+        Verification results for `claims`, in order. Only one claim per
+        cluster without a fresh result (and not already being verified) is
+        passed to `verify_many`; every other claim reuses its cluster's
+        result. Each result carries a "cluster" entry: id, size, the claim
+        that was verified, the similarity to the cluster, and whether the
+        result was reused.
+        """
+        assigned = await asyncio.gather(*(self.assign(c) for c in claims))
+
+        loop = asyncio.get_running_loop()
+        waits: Dict[str, asyncio.Future] = {}
+        pending: Dict[str, str] = {}  # cluster id -> claim verified for it
+        for claim, (cluster, _) in zip(claims, assigned):
+            cluster_id = cluster["id"]
+            if cluster_id in waits or self._fresh(cluster):
+                continue
+            if cluster_id in self._inflight:
+                waits[cluster_id] = self._inflight[cluster_id]
+                continue
+            future = self._inflight[cluster_id] = loop.create_future()
+            waits[cluster_id] = future
+            pending[cluster_id] = claim
+
+        if pending:
+            # Detached from this request: a cancelled caller (e.g. a client
+            # that disconnected) must not cancel the work other requests wait on.
+            batch = loop.create_task(verify_many(list(pending.values())))
+            clusters = {cluster["id"]: cluster for cluster, _ in assigned}
+            batch.add_done_callback(lambda task, ids=list(pending): self._settle(task, ids, clusters))
+
+        results = await asyncio.gather(*(asyncio.shield(future) for future in waits.values()))
+        done = dict(zip(waits, results))
+
+        verified_here = set(pending)
+        outputs = []
+        for claim, (cluster, similarity) in zip(claims, assigned):
+            cluster_id = cluster["id"]
+            result = done.get(cluster_id, cluster["result"])
+            reused = pending.get(cluster_id) != claim
+            if not reused:
+                # Later repeats of the same text reuse this result.
+                pending.pop(cluster_id)
+                CLUSTER_CLAIMS.inc(outcome="verified")
+            elif cluster_id in waits and cluster_id not in verified_here:
+                CLUSTER_CLAIMS.inc(outcome="joined")
+            else:
+                CLUSTER_CLAIMS.inc(outcome="reused")
+            output = copy.deepcopy(result)
+            output["claim"] = claim
+            output["cluster"] = {
+                "id": cluster_id,
+                "size": cluster["claims"],
+                "verified_claim": result.get("claim", claim),
+                "similarity": round(similarity, 3),
+                "reused": reused,
+            }
+            outputs.append(output)
+        return outputs
+
+    def _settle(self, batch: asyncio.Task, cluster_ids: List[str], clusters: Dict[str, dict]):
+        """
+        Hands the outcome of a verification batch to everyone waiting on its
+        clusters. Failures and degraded results are not stored, so the next
+        claim retries.
+        """
+        futures = [self._inflight.pop(cluster_id) for cluster_id in cluster_ids]
+        if batch.cancelled():
+            for future in futures:
+                future.cancel()
+            return
+        error = batch.exception()
+        if error is not None:
+            for future in futures:
+                future.set_exception(error)
+                # Mark the exception as retrieved when nobody was left waiting.
+                future.exception()
+            return
+        now = time.time()
+        for cluster_id, future, result in zip(cluster_ids, futures, batch.result()):
+            if not result.get("degraded"):
+                clusters[cluster_id]["result"] = result
+                clusters[cluster_id]["verified_at"] = now
+            future.set_result(result)
+
+    def stats(self) -> dict:
+        stats = self._clusters.stats()
+        stats["aliases"] = len(self._aliases)
+        stats["in_flight"] = len(self._inflight)
+        return stats
+
+
+claim_clusters = ClaimClusterIndex(
+    threshold=CLUSTER_SIMILARITY_THRESHOLD,
+    staleness=CLUSTER_STALENESS_SECONDS,
+    max_clusters=CLUSTER_MAX_CLUSTERS,
+    ttl=CLUSTER_TTL,
+) if CLAIM_CLUSTERING else None
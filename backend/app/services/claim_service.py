@@ -1,40 +1,185 @@
+import asyncio
+import logging
+from collections import OrderedDict
 from datetime import datetime
-from app.utils.extractor import extract_claims
-from app.services.factcheck_service import verify_with_google_factcheck
-from app.services.reasoning_service import reason_claim
+from typing import AsyncIterator, Callable, Dict, List, Optional
+from app.config import (
+    FACTCHECK_CONCURRENCY,
+    REASONING_CONCURRENCY,
+    PIPELINE_CONCURRENT,
+    BATCH_MAX_IN_FLIGHT,
+    BATCH_RECENT_RESULTS,
+    EXTRACTION_BATCH_SIZE,
+    REASONING_BATCH_MODE,
+)
+from app.utils.concurrency import get_limiter
+from app.utils.extraction_engine import extract_claims_async, extraction_engine
+from app.services.factcheck_service import verify_with_google_factcheck, normalize_claim
+from app.services.retrieval_service import retrieve_evidence, format_passage
+from app.services.reasoning_service import reason_claim, reason_claims_batch
+from app.services.llm_dispatcher import PRIORITY_INTERACTIVE, PRIORITY_BATCH
+from app.services.job_queue import job_queue
+from app.services.claim_clusters import claim_clusters
+from app.utils.metrics import counter
 
-async def process_claim(text: str):
+logger = logging.getLogger(__name__)
+
+PIPELINE_FAILURES = counter("verisense_pipeline_failures_total", "process_claim runs that failed.")
+
+
+async def _verify_single_claim(claim: str, priority: int = PRIORITY_INTERACTIVE):
     """
-    Full pipeline: extract claims -> verify -> reason
-    Returns a structured list of verified claims with evidence and reasoning.
+    Fact-check and reason about one claim.
+    Each upstream is capped by its own limiter; `priority` orders the Groq
+    call in the LLM dispatcher (batch work yields to interactive requests).
     """
-    try:
-        claims = extract_claims(text)
-        if not claims:
-            claims = [text]  
+    evidence = await _gather_evidence(claim)
+
+    async with get_limiter("reasoning", REASONING_CONCURRENCY):
+        reasoning = await reason_claim(claim, evidence.get("evidence", []), priority, _passage_context(evidence))
+
+    return _build_result(claim, evidence, reasoning)
+
+
+async def _gather_evidence(claim: str):
+    """
+    Fact-check result plus the top passages from the local evidence index,
+    fetched concurrently.
+    """
+    async def factcheck():
+        async with get_limiter("factcheck", FACTCHECK_CONCURRENCY):
+            return await verify_with_google_factcheck(claim)
+
+    evidence, passages = await asyncio.gather(factcheck(), retrieve_evidence(claim))
+    evidence["passages"] = passages
+    return evidence
+
+
+def _passage_context(evidence: dict) -> List[str]:
+    """
+    Retrieved passages as LLM background. They stay out of the evidence list
+    that rating-based engines score.
+    """
+    return [format_passage(p) for p in evidence.get("passages", [])]
+
+
+def _build_result(claim: str, evidence: dict, reasoning: dict):
+    """
+    The API result for one claim. "degraded" is set when the fact-check
+    lookup or every reasoning engine failed, so the result is not reused.
+    """
+    return {
+        "claim": claim,
+        "verdict": evidence.get("verdict", "Unverified"),
+        "confidence": evidence.get("confidence", 0.5),
+        "sources": evidence.get("sources", []),
+        "evidence": evidence.get("evidence", []),
+        "passages": evidence.get("passages", []),
+        "reasoning": " ".join(reasoning.get("reasoning", [])) or "No reasoning provided.",
+        "degraded": bool(evidence.get("degraded") or reasoning.get("degraded")),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+async def _verify_claims_batched(claims: List[str], priority: int = PRIORITY_INTERACTIVE):
+    """
+    Batched reasoning mode: fact-check all claims concurrently, then reason
+    about them with packed multi-claim prompts instead of one call each.
+    """
+    evidences = await asyncio.gather(*(_gather_evidence(c) for c in claims))
+    reasonings = await reason_claims_batch(
+        [(c, e.get("evidence", [])) for c, e in zip(claims, evidences)], priority,
+        [_passage_context(e) for e in evidences],
+    )
+    return [_build_result(c, e, r) for c, e, r in zip(claims, evidences, reasonings)]
+
+
+async def verify_claims(claims: List[str], concurrent: Optional[bool] = None,
+                        batch_reasoning: Optional[bool] = None,
+                        progress: Optional[Callable[[dict], None]] = None) -> List[dict]:
+    """
+    Verify already extracted claims: fact-check, retrieve evidence, reason.
+    Returns one result per claim, in order.
+
+    In concurrent mode (the default, see PIPELINE_CONCURRENT) every claim is
+    fact-checked and reasoned about at the same time, so latency tracks the
+    slowest claim instead of the sum.
+
+    With batch_reasoning (default REASONING_BATCH_MODE) several claims are
+    reasoned about in packed prompts to cut LLM round-trips.
+
+    With CLAIM_CLUSTERING, near-duplicates (within this call and across
+    requests) share one verification through the claim cluster index, so
+    the work follows the number of unique claims.
+
+    `progress`, if given, is called with {"stage", "claims", "verified"}
+    before verification starts and whenever a claim finishes.
+    """
+    if concurrent is None:
+        concurrent = PIPELINE_CONCURRENT
+    if batch_reasoning is None:
+        batch_reasoning = REASONING_BATCH_MODE
+
+    verified = 0
+
+    def report(stage: str):
+        if progress is not None:
+            progress({"stage": stage, "claims": len(claims), "verified": verified})
+
+    async def verify(claim: str):
+        nonlocal verified
+        result = await _verify_single_claim(claim)
+        verified += 1
+        report("verifying")
+        return result
+
+    async def verify_many(unique: List[str]) -> List[dict]:
+        nonlocal verified
+        if batch_reasoning and len(unique) > 1:
+            results = await _verify_claims_batched(unique)
+            verified += len(unique)
+            report("verifying")
+            return results
+
+        if concurrent:
+            return list(await asyncio.gather(*(verify(c) for c in unique)))
 
         results = []
-        for claim in claims:
-            
-            evidence = await verify_with_google_factcheck(claim)
-
-            
-            reasoning = reason_claim(claim, evidence)
-
-            results.append({
-                "claim": claim,
-                "verdict": evidence.get("verdict", "Unverified"),
-                "confidence": evidence.get("confidence", 0.5),
-                "sources": evidence.get("sources", []),
-                "evidence": evidence.get("evidence", []),
-                "reasoning": reasoning.get("explanation", "No reasoning provided."),
-                "timestamp": datetime.utcnow().isoformat()
-            })
+        for claim in unique:
+            results.append(await verify(claim))
 
         return results
 
+    report("extracted")
+
+    if claim_clusters is None:
+        return await verify_many(claims)
+
+    results = await claim_clusters.resolve(claims, verify_many)
+    if verified < len(claims):
+        # The rest reused a cluster result.
+        verified = len(claims)
+        report("verifying")
+    return results
+
+
+async def process_claim(text: str, concurrent: Optional[bool] = None,
+                        batch_reasoning: Optional[bool] = None,
+                        progress: Optional[Callable[[dict], None]] = None):
+    """
+    Full pipeline: extract claims -> verify -> reason
+    Returns a structured list of verified claims with evidence and reasoning.
+    See verify_claims for the concurrency, batching and progress options.
+    """
+    try:
+        claims = await extract_claims_async(text)
+        if not claims:
+            claims = [text]
+        return await verify_claims(claims, concurrent, batch_reasoning, progress)
+
     except Exception as e:
-        
+        logger.exception("Verification pipeline failed")
+        PIPELINE_FAILURES.inc()
         return [{
             "claim": text,
             "verdict": "Error",
@@ -44,3 +189,101 @@ async def process_claim(text: str):
             "reasoning": "Verification pipeline failed.",
             "timestamp": datetime.utcnow().isoformat()
         }]
+
+
+async def stream_batch_verification(documents: List[str]) -> AsyncIterator[dict]:
+    """
+    Verify many documents at once and yield results as each claim finishes.
+
+    Claims are deduplicated across the whole batch by normalized text, so a
+    claim shared by several documents is extracted, fact-checked and reasoned
+    about once; with CLAIM_CLUSTERING near-duplicates also share one
+    verification. Documents are extracted in chunks, and a new chunk is only
+    pulled in while fewer than BATCH_MAX_IN_FLIGHT unique claims are pending,
+    and only the last BATCH_RECENT_RESULTS finished results are kept to
+    answer repeats, which keeps memory flat for very large batches.
+
+    Yields:
+        dict: {"type": "claim", "document": i, ...result} for every
+        (document, claim) occurrence, {"type": "error", ...} for claims whose
+        verification raised, and a final {"type": "summary", ...}.
+    """
+    tasks: Dict[str, asyncio.Task] = {}
+    waiting: Dict[str, tuple] = {}  # key -> (claim text, document indices)
+    finished: "OrderedDict[str, dict]" = OrderedDict()
+    unique_claims = 0
+    occurrences = 0
+    chunk_size = max(1, EXTRACTION_BATCH_SIZE)
+    next_doc = 0
+
+    def emit(key: str, doc_index: int) -> dict:
+        result = finished[key]
+        finished.move_to_end(key)
+        if "error" in result:
+            return {"type": "error", "document": doc_index, **result}
+        return {"type": "claim", "document": doc_index, **result}
+
+    try:
+        while next_doc < len(documents) or tasks:
+            if next_doc < len(documents) and len(tasks) < BATCH_MAX_IN_FLIGHT:
+                chunk = documents[next_doc:next_doc + chunk_size]
+                extracted = await extraction_engine.extract_many(chunk)
+                for offset, (text, claims) in enumerate(zip(chunk, extracted)):
+                    doc_index = next_doc + offset
+                    for claim in claims or ([text] if text else []):
+                        occurrences += 1
+                        key = normalize_claim(claim)
+                        if key in finished:
+                            yield emit(key, doc_index)
+                        elif key in waiting:
+                            waiting[key][1].append(doc_index)
+                        else:
+                            waiting[key] = (claim, [doc_index])
+                            tasks[key] = asyncio.create_task(_verify_batch_claim(claim))
+                next_doc += len(chunk)
+                # Keep extracting while there is headroom, unless results are ready.
+                if not any(t.done() for t in tasks.values()):
+                    continue
+
+            if not tasks:
+                continue
+            done, _ = await asyncio.wait(tasks.values(), return_when=asyncio.FIRST_COMPLETED)
+            for key in [k for k, t in tasks.items() if t in done]:
+                task = tasks.pop(key)
+                claim, doc_indices = waiting.pop(key)
+                try:
+                    finished[key] = task.result()
+                except Exception as e:
+                    finished[key] = {"claim": claim, "error": str(e)}
+                unique_claims += 1
+                while len(finished) > max(1, BATCH_RECENT_RESULTS):
+                    finished.popitem(last=False)
+                for doc_index in doc_indices:
+                    yield emit(key, doc_index)
+
+        yield {
+            "type": "summary",
+            "documents": len(documents),
+            "claims": occurrences,
+            "unique_claims": unique_claims,
+        }
+    finally:
+        for task in tasks.values():
+            task.cancel()
+
+
+async def _verify_batch_claim(claim: str) -> dict:
+    if claim_clusters is None:
+        return await _verify_single_claim(claim, PRIORITY_BATCH)
+
+    async def verify_many(unique: List[str]) -> List[dict]:
+        return [await _verify_single_claim(c, PRIORITY_BATCH) for c in unique]
+
+    return (await claim_clusters.resolve([claim], verify_many))[0]
+
+
+async def _verification_job(payload: dict, progress: Callable[[dict], None]):
+    return await process_claim(payload["claim"], progress=progress)
+
+
+job_queue.register("verification", _verification_job)
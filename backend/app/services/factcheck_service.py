@@ -1,78 +1,157 @@
-import aiohttp
-from app.config import GOOGLE_FACTCHECK_API_KEY
+import copy
+import logging
+import re
+from app.config import (
+    GOOGLE_FACTCHECK_API_KEY,
+    GOOGLE_FACTCHECK_URL,
+    FACTCHECK_CACHE_SIZE,
+    FACTCHECK_CACHE_TTL,
+    FACTCHECK_CACHE_EMPTY_TTL,
+    FACTCHECK_CACHE_DB,
+)
+from app.services.http_client import get_http_session
+from app.utils.cache import TTLCache, SQLiteCache
+from app.utils.concurrency import SingleFlight
+from app.utils.verdict_scoring import verdict_scorer, SCORING_VERSION
+from app.utils.metrics import span, counter
+
+logger = logging.getLogger(__name__)
+
+FACTCHECK_LOOKUPS = counter(
+    "verisense_factcheck_upstream_total", "Google Fact Check API calls by result.", ("result",)
+)
+
+# Cache tiers: in-process LRU first, then the optional on-disk SQLite file.
+_memory_cache = TTLCache(max_size=FACTCHECK_CACHE_SIZE, default_ttl=FACTCHECK_CACHE_TTL)
+_disk_cache = SQLiteCache(FACTCHECK_CACHE_DB, table="factcheck") if FACTCHECK_CACHE_DB else None
+_inflight = SingleFlight()
+
+# Result kinds worth caching, each with its own TTL.
+_KIND_HIT = "hit"
+_KIND_EMPTY = "empty"
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_claim(claim: str) -> str:
+    """
+    Canonical cache key for a claim: lowercase, punctuation stripped and
+    whitespace collapsed, so trivially different pastes share one entry.
+    """
+    text = _PUNCTUATION.sub(" ", claim.lower())
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def factcheck_cache_stats():
+    """
+    Hit/miss/eviction counters for each fact-check cache tier.
+    """
+    stats = {"memory": _memory_cache.stats()}
+    if _disk_cache is not None:
+        stats["disk"] = _disk_cache.stats()
+    return stats
+
 
 async def verify_with_google_factcheck(claim: str):
     """
     Query Google Fact Check API for evidence about a given claim.
     Returns a structured dict with verdict, confidence, sources, and evidence.
+
+    Results are cached by normalized claim text, and concurrent lookups for
+    the same claim share a single upstream request.
+    """
+    # Cached results hold computed verdicts, so the key carries the scoring version.
+    key = f"v{SCORING_VERSION}:{normalize_claim(claim)}"
+
+    cached = _memory_cache.get(key)
+    if cached is None and _disk_cache is not None:
+        entry = _disk_cache.get_with_ttl(key)
+        if entry is not None:
+            cached, remaining = entry
+            _memory_cache.set(key, cached, remaining)
+    if cached is not None:
+        return copy.deepcopy(cached)
+
+    async def load():
+        with span("factcheck"):
+            result, kind = await _query_google_factcheck(claim)
+        FACTCHECK_LOOKUPS.inc(result=kind or "error")
+        if kind is not None:
+            ttl = FACTCHECK_CACHE_TTL if kind == _KIND_HIT else FACTCHECK_CACHE_EMPTY_TTL
+            _memory_cache.set(key, result, ttl)
+            if _disk_cache is not None:
+                _disk_cache.set(key, result, ttl)
+        return result
+
+    return copy.deepcopy(await _inflight.do(key, load))
+
+
+async def _query_google_factcheck(claim: str):
+    """
+    Perform the upstream request.
+    Returns (result, kind) where kind is "hit", "empty" or None when the
+    result is an error that must not be cached; error results are also
+    marked "degraded".
     """
-    url = "https://factchecktools.googleapis.com/v1alpha1/claims:search"
     params = {"query": claim, "key": GOOGLE_FACTCHECK_API_KEY}
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as res:
-                if res.status != 200:
-                    return {
-                        "verdict": "Unverified",
-                        "confidence": 0.5,
-                        "sources": [],
-                        "evidence": [f"Google API returned status {res.status}."]
-                    }
-
-                data = await res.json()
-                claims = data.get("claims", [])
-
-                if not claims:
-                    return {
-                        "verdict": "Unverified",
-                        "confidence": 0.5,
-                        "sources": [],
-                        "evidence": ["No related fact-checks found for this claim."]
-                    }
-
-                verified_sources = []
-                for c in claims:
-                    text = c.get("text", "")
-                    claim_reviews = c.get("claimReview", [])
-                    for review in claim_reviews:
-                        source_name = review.get("publisher", {}).get("name", "Unknown")
-                        rating = review.get("textualRating", "Unrated")
-                        url = review.get("url", "")
-                        verified_sources.append({
-                            "text": text,
-                            "source": source_name,
-                            "rating": rating,
-                            "url": url
-                        })
-
-                # Compute basic verdict confidence
-                positive = [s for s in verified_sources if "True" in s["rating"] or "Correct" in s["rating"]]
-                negative = [s for s in verified_sources if "False" in s["rating"] or "Fake" in s["rating"]]
-
-                if len(positive) > len(negative):
-                    verdict = "True"
-                    confidence = 0.8
-                elif len(negative) > len(positive):
-                    verdict = "False"
-                    confidence = 0.9
-                else:
-                    verdict = "Mixed"
-                    confidence = 0.6
-
-                evidence_texts = [f"{s['rating']} - {s['source']}" for s in verified_sources]
+        session = get_http_session()
+        async with session.get(GOOGLE_FACTCHECK_URL, params=params) as res:
+            if res.status != 200:
+                return {
+                    "verdict": "Unverified",
+                    "confidence": 0.5,
+                    "sources": [],
+                    "evidence": [f"Google API returned status {res.status}."],
+                    "degraded": True
+                }, None
 
+            data = await res.json()
+            claims = data.get("claims", [])
+
+            if not claims:
                 return {
-                    "verdict": verdict,
-                    "confidence": confidence,
-                    "sources": [s["source"] for s in verified_sources],
-                    "evidence": evidence_texts
-                }
+                    "verdict": "Unverified",
+                    "confidence": 0.5,
+                    "sources": [],
+                    "evidence": ["No related fact-checks found for this claim."]
+                }, _KIND_EMPTY
+
+            verified_sources = []
+            for c in claims:
+                text = c.get("text", "")
+                claim_reviews = c.get("claimReview", [])
+                for review in claim_reviews:
+                    source_name = review.get("publisher", {}).get("name", "Unknown")
+                    rating = review.get("textualRating", "Unrated")
+                    url = review.get("url", "")
+                    verified_sources.append({
+                        "text": text,
+                        "source": source_name,
+                        "rating": rating,
+                        "url": url
+                    })
+
+            scored = verdict_scorer.score_claims([[(s["rating"], s["source"]) for s in verified_sources]])[0]
+
+            evidence_texts = [f"{s['rating']} - {s['source']}" for s in verified_sources]
+
+            return {
+                "verdict": scored["verdict"],
+                "confidence": scored["confidence"],
+                "score": scored["score"],
+                "sources": [s["source"] for s in verified_sources],
+                "evidence": evidence_texts
+            }, _KIND_HIT
 
     except Exception as e:
+        logger.warning("Fact-check lookup failed: %s", e)
         return {
             "verdict": "Unverified",
             "confidence": 0.4,
             "sources": [],
-            "evidence": [f"Evidence gathering failed: {str(e)}"]
-        }
+            "evidence": [f"Evidence gathering failed: {str(e)}"],
+            "degraded": True
+        }, None
@@ -0,0 +1,55 @@
+import aiohttp
+from typing import Optional
+from app.config import (
+    HTTP_POOL_LIMIT,
+    HTTP_POOL_LIMIT_PER_HOST,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_DNS_CACHE_TTL,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_TOTAL_TIMEOUT,
+)
+
+# App-scoped session shared by every outbound service call.
+_session: Optional[aiohttp.ClientSession] = None
+
+
+def _build_session() -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_POOL_LIMIT,
+        limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        use_dns_cache=True,
+        ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+    )
+    timeout = aiohttp.ClientTimeout(total=HTTP_TOTAL_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+
+async def start_http_client():
+    """
+    Open the shared session. Called from the FastAPI startup hook.
+    """
+    global _session
+    if _session is None or _session.closed:
+        _session = _build_session()
+
+
+async def close_http_client():
+    """
+    Close the shared session and its connection pool. Called on shutdown.
+    """
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """
+    Return the shared session, opening it on first use so scripts that never
+    run the app lifecycle still work.
+    """
+    global _session
+    if _session is None or _session.closed:
+        _session = _build_session()
+    return _session
@@ -0,0 +1,229 @@
+import asyncio
+import hashlib
+import re
+import uuid
+import weakref
+from typing import List, Optional, Set, Union
+from app.config import INCREMENTAL_MAX_DOCUMENTS, INCREMENTAL_STATE_TTL, SHARED_CACHE_DB
+from app.services.factcheck_service import normalize_claim
+from app.utils.cache import SQLiteCache, TTLCache
+from app.utils.extraction_engine import extraction_engine
+
+# Characters kept from the end of the processed text to recognise, on the
+# next full-text update, that the document only grew.
+ANCHOR_CHARS = 64
+# A trailing sentence longer than this is processed even if it looks
+# unfinished (transcripts often have no punctuation).
+MAX_PENDING_CHARS = 2000
+
+_SENTENCE_END = re.compile(r"[.!?…][\"'”’)\]]*\s*$")
+
+
+def sentence_hash(sentence: str) -> str:
+    return hashlib.sha1(normalize_claim(sentence).encode("utf-8")).hexdigest()[:16]
+
+
+class SharedSentenceHashes:
+    """
+    The seen-sentence hashes of one document in the shared store, one row
+    per hash, so an update reads and writes only the hashes of its new
+    sentences instead of re-serializing the whole set. Rows are keyed by the
+    document's generation, so a forgotten document starts from an empty set
+    (old rows expire with the TTL).
+    """
+
+    def __init__(self, store: SQLiteCache, generation: str, ttl: float):
+        self.store = store
+        self.prefix = f"{generation}:"
+        self.ttl = ttl
+
+    def __contains__(self, digest: str) -> bool:
+        return self.store.get(self.prefix + digest) is not None
+
+    def add(self, digest: str):
+        self.store.set(self.prefix + digest, 1, self.ttl)
+
+
+class DocumentState:
+    """
+    How far a growing document has been processed: the offset up to which it
+    was split into complete sentences (committed), the last ANCHOR_CHARS
+    characters before that offset, the trailing sentence held back because
+    it may still be growing (pending), and a hash of every sentence seen
+    (a set in memory, or SharedSentenceHashes).
+    """
+
+    def __init__(self, committed: int = 0, anchor: str = "", pending: str = "",
+                 seen: Optional[Union[Set[str], SharedSentenceHashes]] = None, sentences: int = 0,
+                 claims: int = 0, generation: Optional[str] = None):
+        self.committed = committed
+        self.anchor = anchor
+        self.pending = pending
+        self.seen = seen if seen is not None else set()
+        self.sentences = sentences
+        self.claims = claims
+        self.generation = generation or uuid.uuid4().hex
+
+    def to_dict(self) -> dict:
+        """
+        Everything but the hashes, which SharedSentenceHashes stores itself.
+        """
+        return {"committed": self.committed, "anchor": self.anchor, "pending": self.pending,
+                "sentences": self.sentences, "claims": self.claims, "generation": self.generation}
+
+    @classmethod
+    def from_dict(cls, data: dict, seen: SharedSentenceHashes) -> "DocumentState":
+        return cls(data["committed"], data["anchor"], data["pending"], seen,
+                   data["sentences"], data["claims"], data["generation"])
+
+
+async def advance(state: DocumentState, tail: str, final: bool = False) -> List[str]:
+    """
+    Processes `tail`, everything after state.committed (the pending sentence
+    plus new text), and returns the claims among its complete sentences that
+    were not seen before. Only the tail is parsed, so the cost of an update
+    follows the new text, not the document.
+
+    The last sentence is held back as pending unless it ends with terminal
+    punctuation, is longer than MAX_PENDING_CHARS, or `final` is set.
+    """
+    spans = await extraction_engine.segment(tail) if tail.strip() else []
+    hold = len(tail)
+    complete = spans
+    if spans and not final and not _SENTENCE_END.search(tail) and len(tail) - spans[-1][0] <= MAX_PENDING_CHARS:
+        hold = spans[-1][0]
+        complete = spans[:-1]
+
+    new_claims = []
+    for start, end, verifiable in complete:
+        sentence = tail[start:end].strip()
+        if not sentence:
+            continue
+        digest = sentence_hash(sentence)
+        if digest in state.seen:
+            continue
+        state.seen.add(digest)
+        state.sentences += 1
+        if verifiable:
+            new_claims.append(sentence)
+
+    state.committed += hold
+    state.anchor = (state.anchor + tail[:hold])[-ANCHOR_CHARS:]
+    state.pending = tail[hold:]
+    state.claims += len(new_claims)
+    return new_claims
+
+
+async def extend(state: DocumentState, text: str, final: bool = False) -> List[str]:
+    """
+    advance() for text appended to the document.
+    """
+    return await advance(state, state.pending + text, final)
+
+
+class IncrementalExtractor:
+    """
+    Claim extraction for documents that grow over time (live-feed items,
+    transcripts), keyed by a client-chosen document id.
+
+    Each update parses only the part of the document after the last complete
+    sentence and returns only claims from sentences not seen before, so
+    downstream verification runs on new claims only. Updates carry either
+    the full current text or just the appended text. A full text that no
+    longer matches what was processed (an edit before the end) is parsed
+    again from the start; sentences already seen are still not re-emitted.
+
+    State lives in memory, or in the shared SQLite store when one is given,
+    so that with several worker processes any worker can take the next
+    update; there the sentence hashes are kept one row each
+    (`shared_hashes`), so an update never loads or writes the whole set.
+    Updates to one document are serialized within a process; clients
+    should send a document's updates one at a time.
+    """
+
+    def __init__(self, max_documents: int = 10000, ttl: float = 21600, shared: Optional[SQLiteCache] = None,
+                 shared_hashes: Optional[SQLiteCache] = None):
+        self.ttl = ttl
+        self._memory = TTLCache(max_size=max_documents, default_ttl=ttl)
+        self._shared = shared
+        self._shared_hashes = shared_hashes
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+    def _new_state(self) -> DocumentState:
+        state = DocumentState()
+        if self._shared is not None:
+            state.seen = SharedSentenceHashes(self._shared_hashes, state.generation, self.ttl)
+        return state
+
+    def _load(self, document_id: str) -> Optional[DocumentState]:
+        if self._shared is not None:
+            data = self._shared.get(document_id)
+            if data is None:
+                return None
+            return DocumentState.from_dict(data, SharedSentenceHashes(self._shared_hashes, data["generation"],
+                                                                      self.ttl))
+        return self._memory.get(document_id)
+
+    def _save(self, document_id: str, state: DocumentState):
+        if self._shared is not None:
+            self._shared.set(document_id, state.to_dict(), self.ttl)
+        else:
+            self._memory.set(document_id, state)
+
+    def forget(self, document_id: str):
+        if self._shared is not None:
+            self._shared.delete(document_id)
+        self._memory.delete(document_id)
+
+    async def update(self, document_id: str, text: Optional[str] = None, append: Optional[str] = None,
+                     final: bool = False) -> dict:
+        """
+        Args:
+            document_id (str): Identifies the document across updates.
+            text (str): The full current text of the document, or
+            append (str): only the text added since the previous update.
+            final (bool): The document is complete; its last sentence is
+                processed even if it looks unfinished.
+
+        Returns:
+            dict: {"document_id", "new_claims", "processed_chars", "pending",
+            "sentences", "claims", "reset"}; reset is True when the text had
+            changed before the processed point and was parsed again.
+        """
+        if (text is None) == (append is None):
+            raise ValueError("Provide exactly one of text or append")
+
+        lock = self._locks.get(document_id)
+        if lock is None:
+            lock = self._locks[document_id] = asyncio.Lock()
+        async with lock:
+            state = self._load(document_id) or self._new_state()
+            reset = False
+            if text is not None:
+                anchor_start = state.committed - len(state.anchor)
+                if len(text) < state.committed or text[anchor_start:state.committed] != state.anchor:
+                    state = DocumentState(seen=state.seen, sentences=state.sentences, claims=state.claims,
+                                          generation=state.generation)
+                    reset = True
+                new_claims = await advance(state, text[state.committed:], final)
+            else:
+                new_claims = await extend(state, append, final)
+            self._save(document_id, state)
+
+        return {
+            "document_id": document_id,
+            "new_claims": new_claims,
+            "processed_chars": state.committed,
+            "pending": state.pending,
+            "sentences": state.sentences,
+            "claims": state.claims,
+            "reset": reset,
+        }
+
+
+incremental_extractor = IncrementalExtractor(
+    max_documents=INCREMENTAL_MAX_DOCUMENTS,
+    ttl=INCREMENTAL_STATE_TTL,
+    shared=SQLiteCache(SHARED_CACHE_DB, table="documents") if SHARED_CACHE_DB else None,
+    shared_hashes=SQLiteCache(SHARED_CACHE_DB, table="document_sentences") if SHARED_CACHE_DB else None,
+)
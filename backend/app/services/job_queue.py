@@ -0,0 +1,314 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+from app.config import JOB_DB, JOB_WORKERS, JOB_QUEUE_LIMIT, JOB_RESULT_TTL
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+TERMINAL = (SUCCEEDED, FAILED)
+
+
+class JobConflict(Exception):
+    """
+    An idempotency key was reused with a different payload.
+    """
+
+
+class QueueFull(Exception):
+    """
+    Too many jobs are waiting; the client should retry later.
+    """
+
+
+class JobStore:
+    """
+    SQLite persistence for jobs, one connection per thread (WAL mode).
+    Payloads, progress and results are stored as JSON.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, kind TEXT NOT NULL, idempotency_key TEXT UNIQUE, payload_hash TEXT NOT NULL, "
+            "payload TEXT NOT NULL, status TEXT NOT NULL, progress TEXT, result TEXT, error TEXT, "
+            "created_at REAL NOT NULL, updated_at REAL NOT NULL, owner INTEGER)"
+        )
+        try:
+            # Stores created before jobs recorded the pid of the process running them.
+            conn.execute("ALTER TABLE jobs ADD COLUMN owner INTEGER")
+        except sqlite3.OperationalError:
+            pass
+        conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared across threads, nor used in a
+        # worker process forked after the parent opened them.
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def _row(row: Optional[sqlite3.Row]) -> Optional[dict]:
+        if row is None:
+            return None
+        return {
+            "job_id": row["id"],
+            "kind": row["kind"],
+            "status": row["status"],
+            "payload": json.loads(row["payload"]),
+            "progress": json.loads(row["progress"]) if row["progress"] else None,
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+        }
+
+    def get(self, job_id: str) -> Optional[dict]:
+        return self._row(self._conn().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def by_idempotency_key(self, key: str) -> Optional[sqlite3.Row]:
+        return self._conn().execute("SELECT * FROM jobs WHERE idempotency_key = ?", (key,)).fetchone()
+
+    def insert(self, job_id: str, kind: str, payload: dict, payload_hash: str, idempotency_key: Optional[str]):
+        now = time.time()
+        self._conn().execute(
+            "INSERT INTO jobs (id, kind, idempotency_key, payload_hash, payload, status, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (job_id, kind, idempotency_key, payload_hash, json.dumps(payload), QUEUED, now, now),
+        )
+
+    def update(self, job_id: str, **fields):
+        fields["updated_at"] = time.time()
+        for name in ("progress", "result"):
+            if name in fields:
+                fields[name] = json.dumps(fields[name])
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        self._conn().execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def claim(self, job_id: str) -> bool:
+        """
+        Marks a queued job running, owned by this process; False if another
+        worker process got it first.
+        """
+        cursor = self._conn().execute(
+            "UPDATE jobs SET status = ?, owner = ?, updated_at = ? WHERE id = ? AND status = ?",
+            (RUNNING, os.getpid(), time.time(), job_id, QUEUED),
+        )
+        return cursor.rowcount == 1
+
+    def requeue_running(self, owner: Optional[int] = None) -> int:
+        """
+        Puts running jobs back in the queue: all of them, or only those of
+        the process `owner` (a worker that died). Returns how many.
+        """
+        if owner is None:
+            cursor = self._conn().execute(
+                "UPDATE jobs SET status = ?, owner = NULL, updated_at = ? WHERE status = ?",
+                (QUEUED, time.time(), RUNNING),
+            )
+        else:
+            cursor = self._conn().execute(
+                "UPDATE jobs SET status = ?, owner = NULL, updated_at = ? WHERE status = ? AND owner = ?",
+                (QUEUED, time.time(), RUNNING, owner),
+            )
+        return cursor.rowcount
+
+    def count(self, status: str) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (status,)).fetchone()[0]
+
+    def queued(self) -> List[str]:
+        return [r[0] for r in self._conn().execute(
+            "SELECT id FROM jobs WHERE status = ? ORDER BY created_at", (QUEUED,)
+        )]
+
+    def purge(self, older_than: float):
+        self._conn().execute(
+            "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?", (SUCCEEDED, FAILED, older_than)
+        )
+
+
+# A handler gets the job payload and a progress callback and returns the result.
+Handler = Callable[[dict, Callable[[dict], None]], Awaitable[Any]]
+
+
+class JobQueue:
+    """
+    Persistent background jobs for long verification runs.
+
+    submit() stores the job and returns at once; a fixed pool of JOB_WORKERS
+    asyncio workers runs jobs in submission order, so request concurrency no
+    longer depends on upstream latency. Status, progress and results live in
+    SQLite and survive restarts (unfinished jobs are requeued on start).
+    Resubmitting with the same idempotency key returns the original job.
+    Watchers (the SSE endpoint) receive every status/progress change.
+    Store access runs on worker threads, never on the event loop; progress
+    writes are coalesced per job, so a burst of updates costs one write.
+
+    Several worker processes may share one store: a job is claimed atomically
+    before it runs, so it runs once even if more than one worker queued it.
+    The serving parent then requeues interrupted jobs once before forking and
+    clears recover_on_start, so a starting worker never requeues a job that a
+    sibling is still running; claimed jobs record the worker's pid, so the
+    parent requeues a crashed worker's jobs before replacing it.
+    """
+
+    def __init__(self, store_path: str, workers: int = 4, queue_limit: int = 1000, result_ttl: float = 86400):
+        self.store_path = store_path
+        self.workers = max(1, workers)
+        self.queue_limit = queue_limit
+        self.result_ttl = result_ttl
+        self._store: Optional[JobStore] = None
+        self._handlers: Dict[str, Handler] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._watchers: Dict[str, Set[asyncio.Queue]] = {}
+        self._submits = 0
+        self.recover_on_start = True
+
+    @property
+    def store(self) -> JobStore:
+        if self._store is None:
+            self._store = JobStore(self.store_path)
+        return self._store
+
+    def register(self, kind: str, handler: Handler):
+        self._handlers[kind] = handler
+
+    async def start(self):
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+        if self.recover_on_start:
+            await asyncio.to_thread(self.store.requeue_running)
+        for job_id in await asyncio.to_thread(self.store.queued):
+            self._queue.put_nowait(job_id)
+        self._tasks = [asyncio.get_running_loop().create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, kind: str, payload: dict, idempotency_key: Optional[str] = None) -> tuple:
+        """
+        Returns (job, created). Raises JobConflict if the idempotency key was
+        used for a different payload and QueueFull past JOB_QUEUE_LIMIT.
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        payload_hash = hashlib.sha256(json.dumps([kind, payload], sort_keys=True).encode("utf-8")).hexdigest()
+        if idempotency_key:
+            existing = await asyncio.to_thread(self.store.by_idempotency_key, idempotency_key)
+            if existing is not None:
+                if existing["payload_hash"] != payload_hash:
+                    raise JobConflict("Idempotency key already used with a different request")
+                return await self.get(existing["id"]), False
+
+        if self._queue is None:
+            raise RuntimeError("Job queue is not running")
+        if self._queue.qsize() >= self.queue_limit:
+            raise QueueFull(f"More than {self.queue_limit} jobs are waiting")
+
+        job_id = uuid.uuid4().hex
+        try:
+            await asyncio.to_thread(self.store.insert, job_id, kind, payload, payload_hash, idempotency_key)
+        except sqlite3.IntegrityError:
+            # Lost a race with an identical submission.
+            return await self.submit(kind, payload, idempotency_key)
+        self._queue.put_nowait(job_id)
+
+        self._submits += 1
+        if self._submits % 100 == 0:
+            await asyncio.to_thread(self.store.purge, time.time() - self.result_ttl)
+        return await self.get(job_id), True
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    def watch(self, job_id: str) -> asyncio.Queue:
+        watcher: asyncio.Queue = asyncio.Queue()
+        self._watchers.setdefault(job_id, set()).add(watcher)
+        return watcher
+
+    def unwatch(self, job_id: str, watcher: asyncio.Queue):
+        watchers = self._watchers.get(job_id)
+        if watchers is not None:
+            watchers.discard(watcher)
+            if not watchers:
+                del self._watchers[job_id]
+
+    def _publish(self, job_id: str, event: str, data: dict):
+        for watcher in self._watchers.get(job_id, ()):
+            watcher.put_nowait((event, data))
+
+    async def _set(self, job_id: str, event: str, **fields):
+        await asyncio.to_thread(self.store.update, job_id, **fields)
+        self._publish(job_id, event, dict(fields))
+
+    async def _work(self):
+        while True:
+            job_id = await self._queue.get()
+            job = await self.get(job_id)
+            if job is None or job["status"] in TERMINAL:
+                continue
+            handler = self._handlers.get(job["kind"])
+            if not await asyncio.to_thread(self.store.claim, job_id):
+                continue
+            self._publish(job_id, "status", {"status": RUNNING})
+
+            # Handlers report progress synchronously: watchers hear of it at
+            # once, the store gets the latest update from one writer task.
+            latest: List[dict] = []
+            writer: Optional[asyncio.Task] = None
+
+            async def write_progress(job_id=job_id, latest=latest):
+                while latest:
+                    update = latest.pop()
+                    latest.clear()
+                    await asyncio.to_thread(self.store.update, job_id, progress=update)
+
+            def progress(update: dict, job_id=job_id, latest=latest):
+                nonlocal writer
+                self._publish(job_id, "progress", {"progress": update})
+                latest.append(update)
+                if writer is None or writer.done():
+                    writer = asyncio.get_running_loop().create_task(write_progress())
+
+            try:
+                result = await handler(job["payload"], progress)
+                if writer is not None:
+                    await writer
+                await self._set(job_id, "status", status=SUCCEEDED, result=result)
+            except asyncio.CancelledError:
+                # Shutting down: the job stays unfinished and is requeued on the next start.
+                if writer is not None:
+                    writer.cancel()
+                raise
+            except Exception as e:
+                if writer is not None:
+                    await asyncio.gather(writer, return_exceptions=True)
+                await self._set(job_id, "status", status=FAILED, error=str(e))
+
+
+job_queue = JobQueue(JOB_DB, workers=JOB_WORKERS, queue_limit=JOB_QUEUE_LIMIT, result_ttl=JOB_RESULT_TTL)
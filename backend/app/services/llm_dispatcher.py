@@ -0,0 +1,259 @@
+import asyncio
+import hashlib
+import itertools
+import json
+import random
+import time
+from typing import Any, AsyncIterator, Optional
+from groq import AsyncGroq, APIConnectionError, APIStatusError, RateLimitError
+from app.config import (
+    GROQ_API_KEY,
+    GROQ_BASE_URL,
+    LLM_MAX_CONCURRENCY,
+    LLM_REQUESTS_PER_MINUTE,
+    LLM_TOKENS_PER_MINUTE,
+    LLM_MAX_RETRIES,
+    LLM_BACKOFF_BASE,
+    LLM_BACKOFF_MAX,
+)
+from app.utils.concurrency import SingleFlight
+from app.utils.metrics import span, counter
+
+LLM_TOKENS = counter("verisense_llm_tokens_total", "Tokens reported in Groq completion usage.", ("kind",))
+LLM_RETRIES = counter("verisense_llm_retries_total", "Groq calls retried after a retryable error.", ("error",))
+
+# Lower value = served first. Interactive requests overtake queued batch work.
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 1
+
+
+class TokenBucket:
+    """
+    Per-minute budget refilled continuously. A budget <= 0 disables the limit.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1):
+        if self.unlimited:
+            return
+        amount = min(amount, self.capacity)
+        while True:
+            self._refill()
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return
+            await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def adjust(self, delta: float):
+        """
+        Charge (positive) or refund (negative) tokens once real usage is known.
+        """
+        if not self.unlimited:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - delta)
+
+    def drain(self):
+        """
+        Empty the bucket, e.g. after the upstream answered 429.
+        """
+        if not self.unlimited:
+            self._refill()
+            self.tokens = min(self.tokens, 0)
+
+
+class _Job:
+    __slots__ = ("params", "estimate", "future")
+
+    def __init__(self, params: dict, estimate: int, future: asyncio.Future):
+        self.params = params
+        self.estimate = estimate
+        self.future = future
+
+
+def _estimate_tokens(params: dict) -> int:
+    # ~4 characters per token for the prompt, plus the completion allowance.
+    prompt_chars = sum(len(m.get("content", "")) for m in params.get("messages", []))
+    return prompt_chars // 4 + int(params.get("max_completion_tokens", 0))
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, (RateLimitError, APIConnectionError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code >= 500
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class LLMDispatcher:
+    """
+    Async gateway for every Groq chat completion.
+
+    - identical in-flight prompts are coalesced into one upstream call;
+    - requests wait in a priority queue (interactive before batch);
+    - a scheduler admits them under the concurrency cap and the
+      request-per-minute and token-per-minute token buckets;
+    - retryable failures (429, 5xx, connection errors) are retried with
+      jittered exponential backoff, honouring Retry-After.
+    """
+
+    def __init__(self, max_concurrency: int, requests_per_minute: float, tokens_per_minute: float,
+                 max_retries: int, backoff_base: float, backoff_max: float):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._client: Optional[AsyncGroq] = None
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._scheduler: Optional[asyncio.Task] = None
+        self._coalescer = SingleFlight()
+        self._sequence = itertools.count()
+
+    @property
+    def client(self) -> AsyncGroq:
+        if self._client is None:
+            # Retries are handled here, not by the SDK.
+            self._client = AsyncGroq(api_key=GROQ_API_KEY, base_url=GROQ_BASE_URL, max_retries=0)
+        return self._client
+
+    def _ensure_started(self):
+        if self._scheduler is None or self._scheduler.done():
+            self._queue = asyncio.PriorityQueue()
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+            self._scheduler = asyncio.get_running_loop().create_task(self._schedule())
+
+    async def complete(self, priority: int = PRIORITY_INTERACTIVE, **params) -> Any:
+        """
+        Queue a non-streaming chat completion and return the completion object.
+        Takes the same keyword arguments as client.chat.completions.create.
+        """
+        key = hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        return await self._coalescer.do(key, lambda: self._enqueue(priority, params))
+
+    async def _enqueue(self, priority: int, params: dict) -> Any:
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((priority, next(self._sequence), _Job(params, _estimate_tokens(params), future)))
+        return await future
+
+    async def _schedule(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            _, _, job = await self._queue.get()
+            if job.future.done():
+                continue
+            await self._slots.acquire()
+            await self.requests.acquire(1)
+            await self.tokens.acquire(job.estimate)
+            loop.create_task(self._execute(job))
+
+    async def _execute(self, job: _Job):
+        try:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    with span("groq"):
+                        completion = await self.client.chat.completions.create(**job.params)
+                    break
+                except Exception as e:
+                    if attempt >= self.max_retries or not _is_retryable(e):
+                        raise
+                    await self._backoff(attempt, e)
+            usage = getattr(completion, "usage", None)
+            _record_usage(usage)
+            if usage is not None and getattr(usage, "total_tokens", None):
+                self.tokens.adjust(usage.total_tokens - job.estimate)
+            if not job.future.done():
+                job.future.set_result(completion)
+        except Exception as e:
+            if not job.future.done():
+                job.future.set_exception(e)
+        finally:
+            self._slots.release()
+
+    async def _backoff(self, attempt: int, error: Exception):
+        LLM_RETRIES.inc(error=type(error).__name__)
+        if isinstance(error, RateLimitError):
+            # Stop admitting new work until the budget refills.
+            self.requests.drain()
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max))
+        await asyncio.sleep(delay)
+        await self.requests.acquire(1)
+
+    async def stream(self, **params) -> AsyncIterator[Any]:
+        """
+        Streaming chat completion. Streams are always interactive, so they skip
+        the priority queue but still wait for a concurrency slot and budget.
+        Opening the stream is retried; chunks are yielded as they arrive.
+        """
+        self._ensure_started()
+        await self._slots.acquire()
+        try:
+            await self.requests.acquire(1)
+            await self.tokens.acquire(_estimate_tokens(params))
+            for attempt in range(self.max_retries + 1):
+                try:
+                    with span("groq_stream_open"):
+                        stream = await self.client.chat.completions.create(stream=True, **params)
+                    break
+                except Exception as e:
+                    if attempt >= self.max_retries or not _is_retryable(e):
+                        raise
+                    await self._backoff(attempt, e)
+            with span("groq_stream"):
+                async for chunk in stream:
+                    # Groq reports usage on the final chunk under x_groq.
+                    _record_usage(getattr(getattr(chunk, "x_groq", None), "usage", None))
+                    yield chunk
+        finally:
+            self._slots.release()
+
+    async def close(self):
+        if self._scheduler is not None:
+            self._scheduler.cancel()
+            self._scheduler = None
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+def _record_usage(usage):
+    if usage is None:
+        return
+    LLM_TOKENS.inc(getattr(usage, "prompt_tokens", 0) or 0, kind="prompt")
+    LLM_TOKENS.inc(getattr(usage, "completion_tokens", 0) or 0, kind="completion")
+
+
+llm_dispatcher = LLMDispatcher(
+    max_concurrency=LLM_MAX_CONCURRENCY,
+    requests_per_minute=LLM_REQUESTS_PER_MINUTE,
+    tokens_per_minute=LLM_TOKENS_PER_MINUTE,
+    max_retries=LLM_MAX_RETRIES,
+    backoff_base=LLM_BACKOFF_BASE,
+    backoff_max=LLM_BACKOFF_MAX,
+)
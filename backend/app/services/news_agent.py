@@ -1,29 +1,54 @@
-import aiohttp
+import asyncio
 import feedparser
-from app.config import NEWS_API_KEY, NEWSDATA_API_KEY
+from app.config import NEWS_API_KEY, NEWSDATA_API_KEY, NEWSAPI_URL, NEWSDATA_URL, PIB_RSS_URL
+from app.services.http_client import get_http_session
 
 async def fetch_newsapi(query="crisis", country="us"):
-    url = "https://newsapi.org/v2/top-headlines"
     params = {"apiKey": NEWS_API_KEY, "q": query, "country": country, "pageSize": 10}
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, params=params) as res:
-            data = await res.json()
-            return data.get("articles", [])
+    session = get_http_session()
+    async with session.get(NEWSAPI_URL, params=params) as res:
+        data = await res.json()
+        return data.get("articles", [])
 
 async def fetch_newsdataio(query="india crisis"):
-    url = f"https://newsdata.io/api/1/news?apikey={NEWSDATA_API_KEY}&q={query}&country=in"
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as res:
-            return (await res.json()).get("results", [])
+    params = {"apikey": NEWSDATA_API_KEY, "q": query, "country": "in"}
+    session = get_http_session()
+    async with session.get(NEWSDATA_URL, params=params) as res:
+        return (await res.json()).get("results", [])
 
 def fetch_pib_rss():
-    url = "https://pib.gov.in/rssfeed.aspx"
-    feed = feedparser.parse(url)
+    feed = feedparser.parse(PIB_RSS_URL)
     return [{"title": e.title, "link": e.link, "published": e.published} for e in feed.entries]
 
+async def fetch_pib_rss_conditional(etag=None, modified=None):
+    """
+    Conditional GET of the PIB feed using ETag / If-Modified-Since.
+    Returns (entries, etag, modified); entries is None when the feed has not
+    changed (HTTP 304). Parsing runs in a worker thread.
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if modified:
+        headers["If-Modified-Since"] = modified
+
+    session = get_http_session()
+    async with session.get(PIB_RSS_URL, headers=headers) as res:
+        if res.status == 304:
+            return None, etag, modified
+        body = await res.read()
+        etag = res.headers.get("ETag", etag)
+        modified = res.headers.get("Last-Modified", modified)
+
+    feed = await asyncio.to_thread(feedparser.parse, body)
+    entries = [
+        {"title": e.get("title", ""), "link": e.get("link", ""), "published": e.get("published", "")}
+        for e in feed.entries
+    ]
+    return entries, etag, modified
+
 async def get_combined_news():
-    data = []
-    data.extend(await fetch_newsapi())
-    data.extend(await fetch_newsdataio())
-    data.extend(fetch_pib_rss())
-    return data
+    newsapi, newsdata, pib = await asyncio.gather(
+        fetch_newsapi(), fetch_newsdataio(), fetch_pib_rss_conditional()
+    )
+    return newsapi + newsdata + (pib[0] or [])
@@ -0,0 +1,261 @@
+import asyncio
+import base64
+import hashlib
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional, Tuple
+from app.config import NEWS_REFRESH_SECONDS, NEWS_SNAPSHOT_SIZE, NEWS_SHARED_POLL_SECONDS, SHARED_CACHE_DB
+from app.services.factcheck_service import normalize_claim
+from app.services.news_agent import fetch_newsapi, fetch_newsdataio, fetch_pib_rss_conditional
+from app.services.retrieval_service import index_documents, news_documents
+from app.utils.cache import SQLiteCache
+from app.utils.metrics import span
+
+logger = logging.getLogger(__name__)
+
+_SNAPSHOT_KEY = "news:snapshot"
+_LEASE_KEY = "news:refresh_lease"
+# A shared snapshot outlives many refresh intervals: stale news beats none.
+_SNAPSHOT_TTL = 86400
+
+
+def _timestamp(value) -> Optional[float]:
+    """
+    Best-effort parse of the date formats used by NewsAPI (ISO 8601),
+    NewsData.io ("YYYY-MM-DD HH:MM:SS", UTC) and RSS (RFC 822).
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(str(value))
+        except (TypeError, ValueError):
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _article_id(url: str, title: str) -> str:
+    return hashlib.sha1((url or title).encode("utf-8")).hexdigest()[:16]
+
+
+def _normalize_newsapi(item: dict) -> dict:
+    return {
+        "title": item.get("title") or "",
+        "link": item.get("url") or "",
+        "source_name": (item.get("source") or {}).get("name") or "NewsAPI",
+        "pubDate": item.get("publishedAt"),
+        "category": ["news"],
+        "description": item.get("description"),
+        "image_url": item.get("urlToImage"),
+        "origin": "newsapi",
+    }
+
+
+def _normalize_newsdata(item: dict) -> dict:
+    return {
+        "title": item.get("title") or "",
+        "link": item.get("link") or "",
+        "source_name": item.get("source_name") or item.get("source_id") or "NewsData.io",
+        "pubDate": item.get("pubDate"),
+        "category": item.get("category") or ["news"],
+        "description": item.get("description"),
+        "image_url": item.get("image_url"),
+        "origin": "newsdata",
+    }
+
+
+def _normalize_pib(item: dict) -> dict:
+    return {
+        "title": item.get("title") or "",
+        "link": item.get("link") or "",
+        "source_name": "PIB",
+        "pubDate": item.get("published"),
+        "category": ["government"],
+        "description": None,
+        "image_url": None,
+        "origin": "pib",
+    }
+
+
+async def _timed(stage: str, awaitable):
+    with span(stage):
+        return await awaitable
+
+
+def _encode_cursor(sort_key: Tuple[float, str]) -> str:
+    return base64.urlsafe_b64encode(f"{sort_key[0]!r}|{sort_key[1]}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Optional[Tuple[float, str]]:
+    try:
+        ts, article_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return float(ts), article_id
+    except Exception:
+        return None
+
+
+class NewsAggregator:
+    """
+    Background news feed that serves /news from an in-memory snapshot.
+
+    Every NEWS_REFRESH_SECONDS all sources are fetched concurrently (the RSS
+    feed with ETag/If-Modified-Since), normalized into one schema and merged
+    into the snapshot, deduplicated by URL and by title hash. A source that
+    fails keeps its previous articles. The snapshot is ordered newest first
+    and paged with a cursor on (timestamp, id), which stays valid across
+    refreshes. Every refresh also feeds the local evidence index.
+
+    With a shared store (several worker processes), one worker at a time
+    holds a refresh lease and publishes each snapshot there; the others skip
+    the upstream fetches and re-read the published snapshot every
+    shared_poll_seconds. If the owner dies, its lease expires and another
+    worker takes over.
+    """
+
+    def __init__(self, refresh_seconds: float = 300, max_articles: int = 500,
+                 shared: Optional[SQLiteCache] = None, shared_poll_seconds: float = 15):
+        self.refresh_seconds = refresh_seconds
+        self.max_articles = max_articles
+        self.shared = shared
+        self.shared_poll_seconds = shared_poll_seconds
+        self.updated_at: Optional[float] = None
+        self._articles: List[dict] = []
+        self._by_source: Dict[str, List[dict]] = {}
+        self._rss_etag: Optional[str] = None
+        self._rss_modified: Optional[str] = None
+        self._first_seen: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._refresh_lock: Optional[asyncio.Lock] = None
+
+    async def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            delay = self.refresh_seconds
+            try:
+                if self.shared is None or await asyncio.to_thread(self._claim_refresh):
+                    await self.refresh()
+                else:
+                    await self._load_shared()
+                    delay = min(self.refresh_seconds, self.shared_poll_seconds)
+            except Exception as e:
+                logger.warning("News refresh failed: %s", e)
+            await asyncio.sleep(delay)
+
+    def _claim_refresh(self) -> bool:
+        # Identifies this process; the aggregator itself is created before fork.
+        owner = f"{socket.gethostname()}:{os.getpid()}"
+        return self.shared.claim(_LEASE_KEY, owner, ttl=self.refresh_seconds + 60)
+
+    async def _load_shared(self):
+        """
+        Adopts the published snapshot when it is newer than the local one.
+        """
+        snapshot = await asyncio.to_thread(self.shared.get, _SNAPSHOT_KEY)
+        if snapshot and (self.updated_at is None or snapshot["updated_at"] > self.updated_at):
+            self._articles = snapshot["articles"]
+            self.updated_at = snapshot["updated_at"]
+
+    async def refresh(self, only_if_empty: bool = False):
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        async with self._refresh_lock:
+            if only_if_empty and self.updated_at is not None:
+                return
+            newsapi, newsdata, pib = await asyncio.gather(
+                _timed("news_newsapi", fetch_newsapi()),
+                _timed("news_newsdata", fetch_newsdataio()),
+                _timed("news_pib", fetch_pib_rss_conditional(self._rss_etag, self._rss_modified)),
+                return_exceptions=True,
+            )
+            for source, outcome in (("newsapi", newsapi), ("newsdata", newsdata), ("pib", pib)):
+                if isinstance(outcome, BaseException):
+                    logger.warning("News fetch from %s failed: %s", source, outcome)
+            if not isinstance(newsapi, BaseException):
+                self._by_source["newsapi"] = [_normalize_newsapi(a) for a in newsapi]
+            if not isinstance(newsdata, BaseException):
+                self._by_source["newsdata"] = [_normalize_newsdata(a) for a in newsdata]
+            if not isinstance(pib, BaseException):
+                entries, self._rss_etag, self._rss_modified = pib
+                if entries is not None:
+                    self._by_source["pib"] = [_normalize_pib(a) for a in entries]
+            self._rebuild()
+            articles = self._articles
+            if self.shared is not None:
+                snapshot = {"articles": articles, "updated_at": self.updated_at}
+                await asyncio.to_thread(self.shared.set, _SNAPSHOT_KEY, snapshot, _SNAPSHOT_TTL)
+        # Already indexed articles are skipped by id.
+        await index_documents(news_documents(articles))
+
+    def _rebuild(self):
+        now = time.time()
+        seen_urls, seen_titles, articles = set(), set(), []
+        for source_articles in self._by_source.values():
+            for article in source_articles:
+                url = article["link"].strip().rstrip("/").lower()
+                title_hash = hashlib.sha1(normalize_claim(article["title"]).encode("utf-8")).hexdigest()
+                if (url and url in seen_urls) or title_hash in seen_titles or not article["title"]:
+                    continue
+                seen_urls.add(url)
+                seen_titles.add(title_hash)
+                article_id = _article_id(url, article["title"])
+                first_seen = self._first_seen.setdefault(article_id, now)
+                ts = _timestamp(article["pubDate"]) or first_seen
+                articles.append({"article_id": article_id, **article, "_ts": ts})
+
+        articles.sort(key=lambda a: (a["_ts"], a["article_id"]), reverse=True)
+        self._articles = articles[:self.max_articles]
+        live_ids = {a["article_id"] for a in self._articles}
+        self._first_seen = {k: v for k, v in self._first_seen.items() if k in live_ids}
+        self.updated_at = now
+
+    async def page(self, cursor: Optional[str] = None, limit: int = 50) -> dict:
+        """
+        One page of the snapshot, newest first. Waits for the first refresh
+        if the snapshot has never been loaded.
+        """
+        if self.updated_at is None and self.shared is not None:
+            await self._load_shared()
+        if self.updated_at is None:
+            await self.refresh(only_if_empty=True)
+
+        articles = self._articles
+        start = 0
+        after = _decode_cursor(cursor) if cursor else None
+        if after is not None:
+            start = next(
+                (i for i, a in enumerate(articles) if (a["_ts"], a["article_id"]) < after),
+                len(articles),
+            )
+        items = articles[start:start + limit]
+        next_cursor = None
+        if start + limit < len(articles) and items:
+            next_cursor = _encode_cursor((items[-1]["_ts"], items[-1]["article_id"]))
+        return {
+            "articles": [{k: v for k, v in a.items() if k != "_ts"} for a in items],
+            "next_cursor": next_cursor,
+            "updated_at": datetime.fromtimestamp(self.updated_at, timezone.utc).isoformat(),
+        }
+
+
+news_aggregator = NewsAggregator(
+    refresh_seconds=NEWS_REFRESH_SECONDS,
+    max_articles=NEWS_SNAPSHOT_SIZE,
+    shared=SQLiteCache(SHARED_CACHE_DB, table="news") if SHARED_CACHE_DB else None,
+    shared_poll_seconds=NEWS_SHARED_POLL_SECONDS,
+)
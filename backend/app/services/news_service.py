@@ -1,5 +1,5 @@
-import aiohttp
 from app.config import NEWS_API_KEY
+from app.services.http_client import get_http_session
 
 NEWS_API_URL = "https://newsapi.org/v2/top-headlines"
 
@@ -9,9 +9,9 @@ async def fetch_news():
         "country": "us",
         "pageSize": 10
     }
-    async with aiohttp.ClientSession() as session:
-        async with session.get(NEWS_API_URL, params=params) as response:
-            if response.status != 200:
-                raise Exception(f"NewsAPI request failed with status {response.status}")
-            data = await response.json()
-            return data.get("articles", [])
+    session = get_http_session()
+    async with session.get(NEWS_API_URL, params=params) as response:
+        if response.status != 200:
+            raise Exception(f"NewsAPI request failed with status {response.status}")
+        data = await response.json()
+        return data.get("articles", [])
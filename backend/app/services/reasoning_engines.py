@@ -0,0 +1,253 @@
+import abc
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+from app.config import (
+    REASONING_ENGINES,
+    REASONING_POLICY,
+    REASONING_LATENCY_BUDGET_MS,
+    REASONING_HEDGE_DELAY_MS,
+    LOCAL_NLI_MODEL,
+    LOCAL_NLI_WORKERS,
+)
+from app.utils.reasoner import reason_claim as keyword_reason_claim
+from app.utils.metrics import span
+
+logger = logging.getLogger(__name__)
+
+
+class ReasoningEngine(abc.ABC):
+    """
+    Interface every reasoning backend implements.
+
+    reason() returns {"verdict", "confidence", "reasoning": [...]} or raises;
+    the router treats an exception as "try the next engine". `evidence` holds
+    fact-check ratings; `context` holds passages from the local evidence
+    index, which text-reading engines (LLM, NLI) use and rating-based
+    engines ignore.
+    `cacheable` marks engines whose verdicts may be stored in the verdict
+    cache; degraded answers are not cached so later requests retry the
+    primary engine.
+    """
+
+    name = "base"
+    cacheable = False
+
+    @abc.abstractmethod
+    async def reason(self, claim: str, evidence: List[str], priority: int, context: Sequence[str] = ()) -> dict:
+        """
+        Verdict for `claim` given `evidence`; raises when the engine cannot answer.
+        """
+
+
+class KeywordEngine(ReasoningEngine):
+    """
+    Rating-lexicon scoring over fact-check ratings (utils/reasoner). Instant
+    and dependency-free, so it is the natural last resort.
+    """
+
+    name = "keyword"
+
+    async def reason(self, claim: str, evidence: List[str], priority: int, context: Sequence[str] = ()) -> dict:
+        result = keyword_reason_claim(claim, evidence)
+        return {
+            "verdict": result["verdict"],
+            "confidence": result["confidence"],
+            "reasoning": ["Verdict derived from the fact-check ratings and publisher weights."]
+        }
+
+
+# --- Local NLI engine (runs in worker processes) ---
+
+_nli_pipeline = None
+
+
+def _nli_worker_init(model_name: str):
+    global _nli_pipeline
+    from transformers import pipeline
+    _nli_pipeline = pipeline("text-classification", model=model_name, device=-1, top_k=None)
+
+
+def _nli_scores(claim: str, evidence: List[str]) -> List[tuple]:
+    """
+    (entailment, contradiction) probabilities of the claim against each
+    evidence passage, used as premise.
+    """
+    outputs = _nli_pipeline([{"text": e, "text_pair": claim} for e in evidence], truncation=True)
+    scores = []
+    for labels in outputs:
+        by_label = {item["label"].lower(): item["score"] for item in labels}
+        entail = next((v for k, v in by_label.items() if k.startswith("entail")), 0.0)
+        contra = next((v for k, v in by_label.items() if k.startswith("contra")), 0.0)
+        scores.append((entail, contra))
+    return scores
+
+
+class LocalNLIEngine(ReasoningEngine):
+    """
+    CPU-only entailment model (LOCAL_NLI_MODEL) served from a preloaded
+    process pool. Each retrieved passage (`context`) is scored as premise
+    for the claim; the strongest entailment or contradiction decides the
+    verdict. Fact-check rating labels ("False - PolitiFact") are not
+    premises and are not scored.
+    """
+
+    name = "local"
+
+    def __init__(self, model_name: str, workers: int = 1):
+        self.model_name = model_name
+        self.workers = max(1, workers)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_nli_worker_init, initargs=(self.model_name,)
+            )
+        return self._pool
+
+    async def reason(self, claim: str, evidence: List[str], priority: int, context: Sequence[str] = ()) -> dict:
+        premises = [c for c in context if c and c.strip()]
+        if not premises:
+            return {
+                "verdict": "Needs Review",
+                "confidence": 0.3,
+                "reasoning": ["No evidence available for the local entailment model."]
+            }
+
+        scores = await asyncio.get_running_loop().run_in_executor(
+            self._executor(), _nli_scores, claim, premises
+        )
+        entail = max(s[0] for s in scores)
+        contra = max(s[1] for s in scores)
+        if entail >= 0.5 and entail > contra:
+            verdict, confidence = "True", entail
+        elif contra >= 0.5:
+            verdict, confidence = "False", contra
+        else:
+            verdict, confidence = "Needs Review", 1 - max(entail, contra)
+        return {
+            "verdict": verdict,
+            "confidence": round(float(confidence), 3),
+            "reasoning": [f"Local entailment model: entailment {entail:.2f}, contradiction {contra:.2f} "
+                          f"across {len(premises)} evidence passages."]
+        }
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+
+# --- Registry and routing ---
+
+_engines: Dict[str, ReasoningEngine] = {}
+
+
+def register_engine(engine: ReasoningEngine):
+    _engines[engine.name] = engine
+
+
+def get_engine(name: str) -> Optional[ReasoningEngine]:
+    return _engines.get(name)
+
+
+def configured_engines() -> List[ReasoningEngine]:
+    """
+    Engines from REASONING_ENGINES, in fallback order, skipping unknown names.
+    """
+    return [_engines[name] for name in REASONING_ENGINES if name in _engines]
+
+
+async def _attempt(engine: ReasoningEngine, claim: str, evidence: List[str], priority: int,
+                   timeout: Optional[float], context: Sequence[str] = ()):
+    try:
+        with span(f"reasoning_{engine.name}"):
+            result = await asyncio.wait_for(engine.reason(claim, evidence, priority, context), timeout)
+    except Exception as e:
+        logger.warning("Reasoning engine '%s' failed: %r", engine.name, e)
+        return None
+    result["engine"] = engine.name
+    return result, engine
+
+
+async def _route_fallback(engines, claim, evidence, priority, budget, context=()):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + budget if budget else None
+    for position, engine in enumerate(engines):
+        last = position == len(engines) - 1
+        # Every engine but the last gets what remains of the latency budget.
+        timeout = None if deadline is None or last else max(0.0, deadline - loop.time())
+        outcome = await _attempt(engine, claim, evidence, priority, timeout, context)
+        if outcome is not None:
+            return outcome
+    return None
+
+
+async def _route_hedged(engines, claim, evidence, priority, budget, hedge_delay, context=()):
+    """
+    Start the first engine, launch the next one each time hedge_delay passes
+    without an answer, and return the first success. Once the budget is
+    spent, only the last engine is awaited.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + budget if budget else None
+    tasks = []
+    try:
+        for position, engine in enumerate(engines):
+            tasks.append(loop.create_task(_attempt(engine, claim, evidence, priority, None, context)))
+            last = position == len(engines) - 1
+            wait_until = None if last else loop.time() + hedge_delay
+            if deadline is not None and wait_until is not None:
+                wait_until = min(wait_until, deadline)
+            while True:
+                pending = [t for t in tasks if not t.done()]
+                if not pending:
+                    break
+                timeout = None if wait_until is None else max(0.0, wait_until - loop.time())
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.result() is not None:
+                        return task.result()
+                if not done:
+                    break  # hedge delay elapsed: launch the next engine
+        return None
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def route_reasoning(claim: str, evidence: List[str], priority: int, context: Sequence[str] = ()):
+    """
+    Run the configured engines under REASONING_POLICY:
+
+    - "fallback": try engines in order until one answers;
+    - "latency_budget": same order, but every engine except the last must
+      answer within what remains of REASONING_LATENCY_BUDGET_MS;
+    - "hedged": start the next engine whenever REASONING_HEDGE_DELAY_MS
+      passes without an answer and take the first success.
+
+    Returns:
+        (result, engine) of the first successful engine, or None.
+    """
+    engines = configured_engines()
+    if not engines:
+        return None
+    budget = REASONING_LATENCY_BUDGET_MS / 1000
+    if REASONING_POLICY == "hedged":
+        return await _route_hedged(engines, claim, evidence, priority, budget, REASONING_HEDGE_DELAY_MS / 1000,
+                                   context)
+    if REASONING_POLICY == "latency_budget":
+        return await _route_fallback(engines, claim, evidence, priority, budget, context)
+    return await _route_fallback(engines, claim, evidence, priority, None, context)
+
+
+def close_engines():
+    for engine in _engines.values():
+        if hasattr(engine, "close"):
+            engine.close()
+
+
+register_engine(KeywordEngine())
+register_engine(LocalNLIEngine(LOCAL_NLI_MODEL, LOCAL_NLI_WORKERS))
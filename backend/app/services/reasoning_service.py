@@ -1,18 +1,139 @@
+import asyncio
+import copy
+import hashlib
 import json
-from typing import List
-from groq import Groq
-from app.config import GROQ_API_KEY
+import logging
+import re
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
+from app.config import (
+    VERDICT_CACHE_SIZE,
+    VERDICT_CACHE_TTL,
+    VERDICT_NEAR_DUPLICATE,
+    VERDICT_SIMILARITY_THRESHOLD,
+    REASONING_BATCH_MAX_CLAIMS,
+    REASONING_BATCH_TOKEN_BUDGET,
+    REASONING_BATCH_BASE_TOKENS,
+    REASONING_BATCH_TOKENS_PER_CLAIM,
+    REASONING_CONCURRENCY,
+    SHARED_CACHE_DB,
+)
+from app.utils.cache import SQLiteCache, TTLCache
+from app.utils.concurrency import get_limiter
+from app.utils.minhash import MinHashLSH, shingles
+from app.services.llm_dispatcher import llm_dispatcher, PRIORITY_INTERACTIVE
+from app.services.reasoning_engines import ReasoningEngine, configured_engines, register_engine, route_reasoning
 
-# Initialize Groq client
-client = Groq(api_key=GROQ_API_KEY)
+logger = logging.getLogger(__name__)
+
+# Groq calls go through the shared dispatcher (rate limits, retries, coalescing)
 
 MODEL_ID = "qwen/qwen3-32b"
 
-def reason_claim(claim: str, evidence: List[str]):
+# Bump whenever the reasoning prompt changes so stale verdicts are not reused.
+PROMPT_VERSION = "1"
+
+_verdict_cache = TTLCache(max_size=VERDICT_CACHE_SIZE, default_ttl=VERDICT_CACHE_TTL)
+# Second tier shared by all worker processes (see SHARED_CACHE_DB).
+_shared_verdicts = SQLiteCache(SHARED_CACHE_DB, table="verdicts") if SHARED_CACHE_DB else None
+# Near-duplicate index: paraphrased claim -> verdict cache key of the original.
+_paraphrase_index = (
+    MinHashLSH(threshold=VERDICT_SIMILARITY_THRESHOLD, max_items=VERDICT_CACHE_SIZE)
+    if VERDICT_NEAR_DUPLICATE else None
+)
+
+
+def _verdict_key(claim: str, evidence: List[str]) -> str:
+    """
+    Stable hash of (model, prompt version, claim, sorted evidence).
+    """
+    payload = json.dumps([MODEL_ID, PROMPT_VERSION, claim.strip(), sorted(evidence)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _cached_verdict(key: str) -> Optional[dict]:
+    cached = _verdict_cache.get(key)
+    if cached is None and _shared_verdicts is not None:
+        entry = _shared_verdicts.get_with_ttl(key)
+        if entry is not None:
+            cached, remaining = entry
+            _verdict_cache.set(key, cached, remaining)
+    return cached
+
+
+def _lookup_verdict(claim: str, key: str) -> Optional[dict]:
+    cached = _cached_verdict(key)
+    if cached is None and _paraphrase_index is not None:
+        match = _paraphrase_index.query(shingles(claim))
+        if match is not None:
+            cached = _cached_verdict(match[0])
+            if cached is None:
+                # The original verdict expired; drop its stale index entry.
+                _paraphrase_index.remove(match[0])
+    return copy.deepcopy(cached) if cached is not None else None
+
+
+def _store_verdict(claim: str, key: str, result: dict):
+    _verdict_cache.set(key, copy.deepcopy(result))
+    if _shared_verdicts is not None:
+        _shared_verdicts.set(key, result, VERDICT_CACHE_TTL)
+    if _paraphrase_index is not None:
+        _paraphrase_index.insert(key, shingles(claim))
+
+
+def verdict_cache_stats():
+    """
+    Hit/miss/eviction counters for the verdict cache.
+    """
+    stats = _verdict_cache.stats()
+    if _shared_verdicts is not None:
+        stats["shared"] = _shared_verdicts.stats()
+    if _paraphrase_index is not None:
+        stats["paraphrase_index_size"] = len(_paraphrase_index)
+    return stats
+
+
+async def reason_claim(claim: str, evidence: List[str], priority: int = PRIORITY_INTERACTIVE,
+                       context: Sequence[str] = ()):
+    """
+    Generate a structured reasoning verdict through the configured reasoning
+    engines (REASONING_ENGINES / REASONING_POLICY, see reasoning_engines).
+    Verdicts are cached by claim + evidence, and optionally reused for close
+    paraphrases of an already reasoned claim (VERDICT_NEAR_DUPLICATE).
+    `priority` orders Groq requests in the LLM dispatcher queue.
+
+    `context` (retrieved news/social passages) is shown to the LLM as
+    background only: rating-based engines never see it, and it is not part
+    of the cache key, which would otherwise change whenever the index grows.
+    """
+    key = _verdict_key(claim, evidence)
+    cached = _lookup_verdict(claim, key)
+    if cached is not None:
+        return cached
+
+    outcome = await route_reasoning(claim, evidence, priority, context)
+    if outcome is None:
+        return _fallback_reasoning(claim, evidence)
+
+    result, engine = outcome
+    if engine.cacheable:
+        _store_verdict(claim, key, result)
+    return result
+
+
+def _evidence_text(evidence: List[str], context: Sequence[str] = ()) -> str:
+    text = "\n".join(evidence) if evidence else "No evidence provided."
+    if context:
+        text += ("\n\nBackground (recent news and social posts, not fact-check ratings; "
+                 "use only as context):\n" + "\n".join(context))
+    return text
+
+
+async def _reason_with_groq(claim: str, evidence: List[str], priority: int, context: Sequence[str] = ()):
     """
     Generate structured reasoning verdict using Groq's Qwen3 model with reasoning.
+    Raises on failure so the engine router can move on to the next engine.
     """
-    evidence_text = "\n".join(evidence) if evidence else "No evidence provided."
+    evidence_text = _evidence_text(evidence, context)
 
     system_prompt = """You are a factual reasoning assistant with advanced reasoning capabilities. 
 Analyze the claim and evidence carefully, then respond with ONLY a valid JSON object in this exact format:
@@ -27,40 +148,208 @@ Evidence:
 
 Analyze this claim using step-by-step reasoning and respond with only the JSON object."""
 
-    try:
-        completion = client.chat.completions.create(
-            model=MODEL_ID,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ],
-            temperature=0.2,
-            max_completion_tokens=2048,
-            top_p=0.9,
-            reasoning_effort="default",  # Use default reasoning
-            stream=False  # Set to False to get complete response at once
-        )
+    completion = await llm_dispatcher.complete(
+        priority=priority,
+        model=MODEL_ID,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message}
+        ],
+        temperature=0.2,
+        max_completion_tokens=2048,
+        top_p=0.9,
+        reasoning_effort="default"  # Use default reasoning
+    )
 
-        assistant_message = completion.choices[0].message.content.strip()
-        
-        # Extract JSON from response
-        parsed = _extract_json(assistant_message)
+    assistant_message = completion.choices[0].message.content.strip()
 
-        return {
-            "verdict": parsed.get("verdict", "Needs Review"),
-            "confidence": float(parsed.get("confidence", 0.5)),
-            "reasoning": [parsed.get("reasoning", "No reasoning provided.")]
-        }
+    # Extract JSON from response
+    parsed = _extract_json(assistant_message)
 
-    except Exception as e:
-        print(f"Groq Qwen3 reasoning failed: {str(e)}")
-        return _fallback_reasoning(claim, evidence)
+    return {
+        "verdict": parsed.get("verdict", "Needs Review"),
+        "confidence": float(parsed.get("confidence", 0.5)),
+        "reasoning": [parsed.get("reasoning", "No reasoning provided.")]
+    }
 
 
-def reason_claim_streaming(claim: str, evidence: List[str]):
+class GroqEngine(ReasoningEngine):
     """
-    Streaming version for real-time reasoning output.
-    Useful for long-form reasoning from Qwen3.
+    Primary engine: Qwen3 on Groq through the LLM dispatcher.
+    """
+
+    name = "groq"
+    cacheable = True
+
+    async def reason(self, claim: str, evidence: List[str], priority: int, context: Sequence[str] = ()) -> dict:
+        return await _reason_with_groq(claim, evidence, priority, context)
+
+
+register_engine(GroqEngine())
+
+
+def _batch_messages(items: List[Tuple[str, List[str], Sequence[str]]]):
+    """
+    One prompt covering several claims; the model answers with a JSON array
+    whose "id" fields point back at the numbered claims.
+    """
+    system_prompt = """You are a factual reasoning assistant with advanced reasoning capabilities.
+You will receive several numbered claims, each with its own evidence. Judge every claim independently.
+Respond with ONLY a valid JSON array containing one object per claim, in this exact format:
+[{"id": 1, "verdict": "True" or "False" or "Needs Review", "reasoning": "Brief but thorough explanation", "confidence": 0.95}]
+
+Do not include any text outside the JSON array."""
+
+    blocks = []
+    for i, (claim, evidence, context) in enumerate(items, start=1):
+        evidence_text = _evidence_text(evidence, context)
+        blocks.append(f"""Claim {i}: "{claim}"
+Evidence for claim {i}:
+{evidence_text}""")
+
+    user_message = "\n\n".join(blocks) + "\n\nAnalyze each claim and respond with only the JSON array."
+
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_message}
+    ]
+
+
+def _chunk_for_budget(items: List[Tuple[int, str, List[str], Sequence[str]]]):
+    """
+    Greedily packs (index, claim, evidence, context) items into chunks that respect
+    REASONING_BATCH_MAX_CLAIMS and REASONING_BATCH_TOKEN_BUDGET (prompt estimate
+    plus completion allowance).
+    """
+    chunks, current, used = [], [], REASONING_BATCH_BASE_TOKENS
+    for item in items:
+        cost = (len(item[1]) + sum(len(e) for e in item[2]) + sum(len(c) for c in item[3])) // 4 + REASONING_BATCH_TOKENS_PER_CLAIM
+        if current and (len(current) >= REASONING_BATCH_MAX_CLAIMS
+                        or used + cost > REASONING_BATCH_TOKEN_BUDGET):
+            chunks.append(current)
+            current, used = [], REASONING_BATCH_BASE_TOKENS
+        current.append(item)
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+async def reason_claims_batch(items: List[Tuple[str, List[str]]],
+                              priority: int = PRIORITY_INTERACTIVE,
+                              contexts: Optional[List[Sequence[str]]] = None) -> List[dict]:
+    """
+    Reason about several (claim, evidence) pairs with as few Groq calls as
+    possible. Cached verdicts are reused; the rest are packed into
+    multi-claim prompts sized by the token budget. Any claim whose entry is
+    missing or malformed in the returned array falls back to reason_claim.
+    `contexts`, one per item, are background passages as in reason_claim.
+
+    Packing only applies when Groq is the first configured engine; with any
+    other REASONING_ENGINES every claim goes through reason_claim and the
+    engine router. Every LLM call holds the "reasoning" limiter.
+
+    Returns:
+        List[dict]: One reasoning result per input item, in input order.
+    """
+    results: List[Optional[dict]] = [None] * len(items)
+    keys = [_verdict_key(claim, evidence) for claim, evidence in items]
+    pending = []
+    for i, (claim, evidence) in enumerate(items):
+        cached = _lookup_verdict(claim, keys[i])
+        if cached is not None:
+            results[i] = cached
+        else:
+            pending.append((i, claim, evidence, contexts[i] if contexts else ()))
+
+    engines = configured_engines()
+    packed = bool(engines) and engines[0].name == GroqEngine.name
+
+    async def reason_single(claim, evidence, context):
+        async with get_limiter("reasoning", REASONING_CONCURRENCY):
+            return await reason_claim(claim, evidence, priority, context)
+
+    async def run_chunk(chunk):
+        parsed = {}
+        if packed and len(chunk) > 1:
+            try:
+                async with get_limiter("reasoning", REASONING_CONCURRENCY):
+                    completion = await llm_dispatcher.complete(
+                        priority=priority,
+                        model=MODEL_ID,
+                        messages=_batch_messages([(claim, evidence, context)
+                                                  for _, claim, evidence, context in chunk]),
+                        temperature=0.2,
+                        max_completion_tokens=(REASONING_BATCH_BASE_TOKENS
+                                               + REASONING_BATCH_TOKENS_PER_CLAIM * len(chunk)),
+                        top_p=0.9,
+                        reasoning_effort="default"
+                    )
+                parsed = _extract_json_array(completion.choices[0].message.content)
+            except Exception as e:
+                logger.warning("Groq batched reasoning failed: %s", e)
+
+        fallbacks = []
+        for position, (i, claim, evidence, context) in enumerate(chunk, start=1):
+            entry = parsed.get(position)
+            if isinstance(entry, dict) and "verdict" in entry:
+                try:
+                    result = {
+                        "verdict": entry.get("verdict", "Needs Review"),
+                        "confidence": float(entry.get("confidence", 0.5)),
+                        "reasoning": [entry.get("reasoning", "No reasoning provided.")],
+                        "engine": GroqEngine.name,
+                    }
+                except (TypeError, ValueError):
+                    result = None
+                if result is not None:
+                    _store_verdict(claim, keys[i], result)
+                    results[i] = result
+                    continue
+            fallbacks.append((i, claim, evidence, context))
+
+        singles = await asyncio.gather(*(reason_single(claim, evidence, context)
+                                         for _, claim, evidence, context in fallbacks))
+        for (i, _, _, _), result in zip(fallbacks, singles):
+            results[i] = result
+
+    await asyncio.gather(*(run_chunk(chunk) for chunk in _chunk_for_budget(pending)))
+    return results
+
+
+def _extract_json_array(text: str) -> dict:
+    """
+    Parse the batched answer into {id: verdict object}. Returns an empty dict
+    when no JSON array can be recovered.
+    """
+    text = re.sub(r"<think>.*?</think>", "", text, flags=re.DOTALL).strip()
+    start = text.find("[")
+    end = text.rfind("]") + 1
+    if start == -1 or end <= start:
+        return {}
+    try:
+        items = json.loads(text[start:end])
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(items, list):
+        return {}
+
+    parsed = {}
+    for position, item in enumerate(items, start=1):
+        if not isinstance(item, dict):
+            continue
+        try:
+            item_id = int(item.get("id", position))
+        except (TypeError, ValueError):
+            continue
+        parsed[item_id] = item
+    return parsed
+
+
+def _streaming_messages(claim: str, evidence: List[str]):
+    """
+    Chat messages for the streaming prompt, which lets the model think out
+    loud before ending with the JSON verdict.
     """
     evidence_text = "\n".join(evidence) if evidence else "No evidence provided."
 
@@ -75,42 +364,123 @@ Evidence:
 
 Provide step-by-step reasoning, then end with the JSON verdict object."""
 
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_message}
+    ]
+
+
+def _verdict_from_parsed(parsed: dict, full_response: str):
+    return {
+        "verdict": parsed.get("verdict", "Needs Review"),
+        "confidence": float(parsed.get("confidence", 0.5)),
+        "reasoning": [parsed.get("reasoning", "No reasoning provided.")],
+        "full_reasoning": full_response  # Include full reasoning chain
+    }
+
+
+async def reason_claim_streaming(claim: str, evidence: List[str]):
+    """
+    Streaming version for real-time reasoning output.
+    Useful for long-form reasoning from Qwen3.
+    """
+    result = None
+    async for item in stream_reasoning(claim, evidence):
+        if item["event"] == "token":
+            print(item["data"]["text"], end="", flush=True)  # Real-time output
+        elif item["event"] == "verdict":
+            result = item["data"]
+    print()  # New line after streaming
+    return result
+
+
+async def stream_reasoning(claim: str, evidence: List[str]) -> AsyncIterator[dict]:
+    """
+    Async streaming reasoning for the SSE endpoint.
+
+    Yields {"event": "token", "data": {"text": ...}} for every content delta
+    as Groq produces it, then a closing {"event": "verdict", "data": {...}}.
+    The verdict JSON is parsed incrementally while tokens arrive, so no
+    second pass over the full response is needed.
+    """
+    full_response = ""
+    parser = IncrementalVerdictParser()
+
     try:
-        full_response = ""
-        
-        with client.chat.completions.create(
+        stream = llm_dispatcher.stream(
             model=MODEL_ID,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ],
+            messages=_streaming_messages(claim, evidence),
             temperature=0.2,
             max_completion_tokens=2048,
             top_p=0.9,
-            reasoning_effort="default",
-            stream=True
-        ) as completion:
-            for chunk in completion:
-                if chunk.choices[0].delta.content:
-                    content = chunk.choices[0].delta.content
-                    full_response += content
-                    print(content, end="", flush=True)  # Real-time output
-        
-        print()  # New line after streaming
-        
-        # Extract JSON from the full response
-        parsed = _extract_json(full_response)
-
-        return {
-            "verdict": parsed.get("verdict", "Needs Review"),
-            "confidence": float(parsed.get("confidence", 0.5)),
-            "reasoning": [parsed.get("reasoning", "No reasoning provided.")],
-            "full_reasoning": full_response  # Include full reasoning chain
-        }
+            reasoning_effort="default"
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                content = chunk.choices[0].delta.content
+                full_response += content
+                parser.feed(content)
+                yield {"event": "token", "data": {"text": content}}
+
+        parsed = parser.verdict or _extract_json(full_response)
+        yield {"event": "verdict", "data": _verdict_from_parsed(parsed, full_response)}
 
     except Exception as e:
-        print(f"\nGroq streaming reasoning failed: {str(e)}")
-        return _fallback_reasoning(claim, evidence)
+        logger.warning("Groq streaming reasoning failed: %s", e)
+        yield {"event": "error", "data": {"error": str(e)}}
+        yield {"event": "verdict", "data": _fallback_reasoning(claim, evidence)}
+
+
+class IncrementalVerdictParser:
+    """
+    Scans streamed text for top-level JSON objects as chunks arrive.
+
+    Tracks brace depth outside string literals so each object is parsed once,
+    the moment its closing brace is seen. `verdict` holds the last complete
+    object that has a "verdict" key; thinking-out-loud text before it, or
+    stray braces that do not parse, are ignored.
+    """
+
+    def __init__(self):
+        self.verdict: Optional[dict] = None
+        self._buffer: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: str):
+        for ch in chunk:
+            if self._depth == 0:
+                if ch == "{":
+                    self._depth = 1
+                    self._buffer = [ch]
+                continue
+
+            self._buffer.append(ch)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._complete("".join(self._buffer))
+
+    def _complete(self, text: str):
+        self._buffer = []
+        try:
+            obj = json.loads(text)
+        except json.JSONDecodeError:
+            return
+        if isinstance(obj, dict) and "verdict" in obj:
+            self.verdict = obj
 
 
 def _extract_json(text: str):
@@ -144,7 +514,8 @@ def _extract_json(text: str):
 
 def _fallback_reasoning(claim: str, evidence: List[str]):
     """
-    Fallback reasoning using simple heuristics when API fails.
+    Fallback reasoning using simple heuristics when API fails. Marked
+    "degraded" so that it is not reused as a verdict.
     """
     has_evidence = len(evidence) > 0 and any(e.strip() for e in evidence)
     claim_length = len(claim.split())
@@ -165,5 +536,6 @@ def _fallback_reasoning(claim: str, evidence: List[str]):
     return {
         "verdict": verdict,
         "confidence": confidence,
-        "reasoning": [reasoning]
+        "reasoning": [reasoning],
+        "degraded": True
     }
\ No newline at end of file
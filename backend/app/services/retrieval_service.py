@@ -0,0 +1,139 @@
+import asyncio
+import hashlib
+import logging
+import time
+from typing import List, Optional
+from app.config import (
+    RETRIEVAL_DB,
+    RETRIEVAL_TOP_K,
+    RETRIEVAL_PASSAGE_WORDS,
+    RETRIEVAL_MAX_DOCUMENTS,
+    RETRIEVAL_MIN_OVERLAP,
+    RETRIEVAL_EMBEDDING_MODEL,
+)
+from app.utils.resources import lazy_resource
+from app.utils.retrieval import EvidenceIndex, TextEmbedder
+
+logger = logging.getLogger(__name__)
+
+_disabled = not RETRIEVAL_DB
+
+
+def _open_index() -> Optional[EvidenceIndex]:
+    if _disabled:
+        return None
+    embedder = TextEmbedder(RETRIEVAL_EMBEDDING_MODEL) if RETRIEVAL_EMBEDDING_MODEL else None
+    return EvidenceIndex(
+        RETRIEVAL_DB,
+        passage_words=RETRIEVAL_PASSAGE_WORDS,
+        max_documents=RETRIEVAL_MAX_DOCUMENTS,
+        min_overlap=RETRIEVAL_MIN_OVERLAP,
+        embedder=embedder,
+    )
+
+
+# Opening the index loads the embedding model and every stored vector.
+_index = lazy_resource("evidence_index", _open_index)
+
+
+def get_evidence_index() -> Optional[EvidenceIndex]:
+    """
+    The shared evidence index, opened on first use. None when RETRIEVAL_DB
+    is empty or the index cannot be opened (e.g. SQLite without FTS5).
+    Blocks while the index opens; use `evidence_index` on the event loop.
+    """
+    global _disabled
+    if _disabled:
+        return None
+    try:
+        return _index.get()
+    except Exception as e:
+        logger.warning("Evidence index unavailable: %s", e)
+        _disabled = True
+        return None
+
+
+async def evidence_index() -> Optional[EvidenceIndex]:
+    """
+    `get_evidence_index` for coroutines: the first open runs on a worker
+    thread (unless warm-up already did it).
+    """
+    if _disabled or _index.ready:
+        return get_evidence_index()
+    return await asyncio.to_thread(get_evidence_index)
+
+
+def _document_id(source: str, key: str) -> str:
+    return hashlib.sha1(f"{source}:{key}".encode("utf-8")).hexdigest()[:16]
+
+
+def news_documents(articles: List[dict]) -> List[dict]:
+    """
+    Index documents for articles in the news aggregator's schema.
+    """
+    return [
+        {
+            "id": a["article_id"],
+            "title": a.get("title") or "",
+            "text": a.get("description") or "",
+            "url": a.get("link") or "",
+            "source": a.get("source_name") or "",
+            "ts": a.get("_ts") or time.time(),
+        }
+        for a in articles
+    ]
+
+
+def social_documents(snapshot: dict) -> List[dict]:
+    """
+    Index documents for a social snapshot ({"reddit": [...], "twitter": [...]}).
+    """
+    now = time.time()
+    documents = [
+        {"id": _document_id("reddit", p["url"]), "title": p.get("title") or "", "text": "",
+         "url": p["url"], "source": "Reddit", "ts": now}
+        for p in snapshot.get("reddit", [])
+    ]
+    documents += [
+        {"id": _document_id("twitter", t["id"]), "title": "", "text": t.get("text") or "",
+         "url": f"https://twitter.com/i/web/status/{t['id']}", "source": "Twitter", "ts": now}
+        for t in snapshot.get("twitter", [])
+    ]
+    return documents
+
+
+async def index_documents(documents: List[dict]) -> int:
+    """
+    Add documents to the index off the event loop. Failures are logged and
+    never propagate into the ingestion path.
+    """
+    index = await evidence_index()
+    if index is None or not documents:
+        return 0
+    try:
+        return await asyncio.to_thread(index.add_documents, documents)
+    except Exception as e:
+        logger.warning("Evidence indexing failed: %s", e)
+        return 0
+
+
+async def retrieve_evidence(claim: str, k: int = RETRIEVAL_TOP_K) -> List[dict]:
+    """
+    Top-k indexed passages for a claim; [] when the index is disabled or empty.
+    """
+    index = await evidence_index()
+    if index is None:
+        return []
+    try:
+        return await asyncio.to_thread(index.search, claim, k)
+    except Exception as e:
+        logger.warning("Evidence retrieval failed: %s", e)
+        return []
+
+
+def format_passage(hit: dict) -> str:
+    """
+    One retrieved passage as an evidence line for the reasoning prompt.
+    """
+    text = " ".join(part for part in (hit["title"], hit["text"]) if part)
+    return f"{hit['source']}: {text} ({hit['url']})"
@@ -1,24 +1,127 @@
-import aiohttp
-import praw
-from app.config import REDDIT_CLIENT_ID, REDDIT_SECRET, TWITTER_BEARER_TOKEN
-
-reddit = praw.Reddit(
-    client_id=REDDIT_CLIENT_ID,
-    client_secret=REDDIT_SECRET,
-    user_agent="VeriSenseAgent"
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from app.config import (
+    REDDIT_CLIENT_ID,
+    REDDIT_SECRET,
+    TWITTER_BEARER_TOKEN,
+    TWITTER_SEARCH_URL,
+    REDDIT_URL,
+    REDDIT_OAUTH_URL,
+    SOCIAL_SUBREDDITS,
+    SOCIAL_TWITTER_QUERIES,
+    SOCIAL_REDDIT_THREADS,
+    SOCIAL_CACHE_TTL,
 )
+from app.services.http_client import get_http_session
+from app.services.retrieval_service import index_documents, social_documents
+from app.utils.cache import TTLCache
+from app.utils.concurrency import SingleFlight
+from app.utils.metrics import span
+from app.utils.resources import lazy_resource
+
+logger = logging.getLogger(__name__)
+
+
+def _import_praw():
+    import praw
+    return praw
+
+
+# The (slow) praw import is the shared resource; clients are per thread.
+_praw = lazy_resource("reddit", _import_praw)
+_reddit_clients = threading.local()
+
+
+def get_reddit():
+    """
+    This thread's praw.Reddit client. PRAW instances are not thread-safe
+    (session, rate limiter and auth state are shared), so every thread of
+    the Reddit pool builds its own.
+    """
+    client = getattr(_reddit_clients, "client", None)
+    if client is None:
+        client = _reddit_clients.client = _praw.get().Reddit(
+            client_id=REDDIT_CLIENT_ID,
+            client_secret=REDDIT_SECRET,
+            user_agent="VeriSenseAgent",
+            reddit_url=REDDIT_URL,
+            oauth_url=REDDIT_OAUTH_URL,
+        )
+    return client
+
+
+# PRAW is synchronous; its calls run on this bounded pool instead of the event loop.
+_reddit_executor = ThreadPoolExecutor(max_workers=SOCIAL_REDDIT_THREADS, thread_name_prefix="reddit")
+
+_snapshot_cache = TTLCache(max_size=1, default_ttl=SOCIAL_CACHE_TTL)
+_inflight = SingleFlight()
+# Last good result per source, served when a refresh of that source fails.
+_last_good = {"reddit": [], "twitter": []}
+
+def _fetch_reddit_sync(subreddit, limit):
+    return [
+        {"title": sub.title, "url": sub.url, "score": sub.score}
+        for sub in get_reddit().subreddit(subreddit).hot(limit=limit)
+    ]
 
 async def fetch_reddit_posts(subreddit="worldnews", limit=10):
-    posts = []
-    for sub in reddit.subreddit(subreddit).hot(limit=limit):
-        posts.append({"title": sub.title, "url": sub.url, "score": sub.score})
-    return posts
+    loop = asyncio.get_running_loop()
+    with span("social_reddit"):
+        return await loop.run_in_executor(_reddit_executor, _fetch_reddit_sync, subreddit, limit)
 
 async def fetch_twitter_trending(query="crisis", max_results=10):
-    url = "https://api.twitter.com/2/tweets/search/recent"
     headers = {"Authorization": f"Bearer {TWITTER_BEARER_TOKEN}"}
     params = {"query": query, "max_results": max_results}
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, headers=headers, params=params) as res:
+    session = get_http_session()
+    with span("social_twitter"):
+        async with session.get(TWITTER_SEARCH_URL, headers=headers, params=params) as res:
             data = await res.json()
             return [{"text": t["text"], "id": t["id"]} for t in data.get("data", [])]
+
+def _merge(results, key):
+    merged, seen = [], set()
+    for result in results:
+        for item in result:
+            if item[key] not in seen:
+                seen.add(item[key])
+                merged.append(item)
+    return merged
+
+async def _load_snapshot():
+    reddit_calls = [fetch_reddit_posts(s) for s in SOCIAL_SUBREDDITS]
+    twitter_calls = [fetch_twitter_trending(q) for q in SOCIAL_TWITTER_QUERIES]
+    results = await asyncio.gather(*reddit_calls, *twitter_calls, return_exceptions=True)
+    reddit_results = results[:len(reddit_calls)]
+    twitter_results = results[len(reddit_calls):]
+
+    snapshot = {}
+    for source, source_results, key in (("reddit", reddit_results, "url"), ("twitter", twitter_results, "id")):
+        ok = [r for r in source_results if not isinstance(r, BaseException)]
+        for r in source_results:
+            if isinstance(r, BaseException):
+                logger.warning("Social fetch from %s failed: %s", source, r)
+        if ok:
+            _last_good[source] = _merge(ok, key)
+        snapshot[source] = _last_good[source]
+    return snapshot
+
+async def get_social_snapshot():
+    """
+    Latest Reddit and Twitter posts. All subreddits (SOCIAL_SUBREDDITS) and
+    Twitter queries (SOCIAL_TWITTER_QUERIES) are polled concurrently, and the
+    merged snapshot is cached for SOCIAL_CACHE_TTL seconds. Concurrent
+    requests during a refresh share the same fetch.
+    """
+    snapshot = _snapshot_cache.get("social")
+    if snapshot is not None:
+        return snapshot
+
+    async def load():
+        fresh = await _load_snapshot()
+        _snapshot_cache.set("social", fresh)
+        await index_documents(social_documents(fresh))
+        return fresh
+
+    return await _inflight.do("social", load)
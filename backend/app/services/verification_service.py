@@ -1,12 +1,16 @@
+from app.config import RETRIEVAL_TOP_K
+from app.services.retrieval_service import get_evidence_index
+
+
 def verify_claim(claim: str):
     """
-    Simulated verification service — gather evidence (mocked URLs).
+    Gather evidence URLs for a claim from the local evidence index
+    (articles and posts ingested by the news and social services).
     """
     if not claim:
         return []
-   
-    return [
-        "https://www.who.int/news-room/fact-sheets/detail/coffee-and-health",
-        "https://www.nih.gov/news-events/nih-research-matters/coffee-consumption-and-health",
-        "https://pubmed.ncbi.nlm.nih.gov/12345678/"
-    ]
+
+    index = get_evidence_index()
+    if index is None:
+        return []
+    return [hit["url"] for hit in index.search(claim, RETRIEVAL_TOP_K) if hit["url"]]
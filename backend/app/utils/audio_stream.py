@@ -0,0 +1,75 @@
+import asyncio
+from typing import AsyncIterator
+from fastapi import UploadFile
+from app.config import FFMPEG_BINARY, AUDIO_SAMPLE_RATE, AUDIO_UPLOAD_CHUNK_BYTES
+
+# 16-bit mono PCM.
+SAMPLE_WIDTH = 2
+
+
+async def upload_chunks(file: UploadFile, chunk_size: int = AUDIO_UPLOAD_CHUNK_BYTES) -> AsyncIterator[bytes]:
+    """
+    Reads an upload in fixed-size chunks instead of loading it all at once.
+    """
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+async def decode_to_pcm(chunks: AsyncIterator[bytes], sample_rate: int = AUDIO_SAMPLE_RATE,
+                        read_size: int = AUDIO_UPLOAD_CHUNK_BYTES) -> AsyncIterator[bytes]:
+    """
+    Pipes encoded audio through ffmpeg and yields raw 16-bit mono PCM as it
+    is decoded, without writing the input or output to disk.
+
+    Containers that need seeking (e.g. MP4 with the index at the end) cannot
+    be decoded from a pipe; ffmpeg then fails and a RuntimeError is raised.
+    """
+    process = await asyncio.create_subprocess_exec(
+        FFMPEG_BINARY, "-hide_banner", "-loglevel", "error",
+        "-i", "pipe:0",
+        "-f", "s16le", "-acodec", "pcm_s16le", "-ac", "1", "-ar", str(sample_rate),
+        "pipe:1",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+
+    async def feed():
+        try:
+            async for chunk in chunks:
+                process.stdin.write(chunk)
+                await process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            if not process.stdin.is_closing():
+                process.stdin.close()
+
+    async def drain_stderr():
+        return await process.stderr.read()
+
+    feeder = asyncio.create_task(feed())
+    errors = asyncio.create_task(drain_stderr())
+    produced = 0
+    try:
+        while True:
+            pcm = await process.stdout.read(read_size)
+            if not pcm:
+                break
+            produced += len(pcm)
+            yield pcm
+        await feeder
+        returncode = await process.wait()
+        if returncode != 0 and produced == 0:
+            message = (await errors).decode("utf-8", "replace").strip()
+            raise RuntimeError(f"Audio decoding failed: {message or f'ffmpeg exited with {returncode}'}")
+    finally:
+        feeder.cancel()
+        errors.cancel()
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+
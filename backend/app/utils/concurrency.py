@@ -0,0 +1,67 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+# name -> (event loop, semaphore). Semaphores are created lazily inside the
+# running loop because asyncio primitives built at import time bind to the
+# wrong loop on Python 3.9.
+_limiters: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = {}
+
+
+def get_limiter(name: str, limit: int) -> asyncio.Semaphore:
+    """
+    Returns the shared semaphore that caps concurrent calls to one upstream.
+
+    Args:
+        name (str): Upstream name, e.g. "factcheck" or "reasoning".
+        limit (int): Maximum number of concurrent calls (values < 1 mean 1).
+
+    Returns:
+        asyncio.Semaphore: Semaphore bound to the current event loop.
+    """
+    loop = asyncio.get_running_loop()
+    entry = _limiters.get(name)
+    if entry is None or entry[0] is not loop:
+        entry = (loop, asyncio.Semaphore(max(1, limit)))
+        _limiters[name] = entry
+    return entry[1]
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls that share a key into one execution.
+    Every caller waiting on the same key receives the same result (or error).
+
+    The call runs in its own task that every caller awaits through
+    asyncio.shield, so a cancelled caller (e.g. a disconnected client) does
+    not cancel it for the others; it is cancelled only when no caller is
+    left waiting.
+    """
+
+    def __init__(self):
+        # key -> (task, number of callers waiting on it)
+        self._inflight: Dict[str, List] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._inflight.get(key)
+        if entry is None:
+            task = asyncio.get_running_loop().create_task(fn())
+            entry = self._inflight[key] = [task, 0]
+            task.add_done_callback(lambda t, key=key: self._finished(key, t))
+        task = entry[0]
+        entry[1] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and self._inflight.get(key) is entry and entry[1] == 1:
+                task.cancel()
+            raise
+        finally:
+            entry[1] -= 1
+
+    def _finished(self, key: str, task: asyncio.Task):
+        entry = self._inflight.get(key)
+        if entry is not None and entry[0] is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved when nobody was left waiting.
+            task.exception()
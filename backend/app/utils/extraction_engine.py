@@ -0,0 +1,139 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional, Tuple
+from app.config import EXTRACTION_BATCH_SIZE, EXTRACTION_MAX_WAIT_MS, EXTRACTION_WORKERS
+from app.utils.extractor import analyze_batch
+from app.utils.metrics import span
+
+
+def _warm_worker():
+    """
+    Process-pool initializer: loads spaCy once per worker.
+    """
+    from app.utils.extractor import get_nlp
+    get_nlp()
+
+
+class ExtractionEngine:
+    """
+    Collects concurrent extract requests into micro-batches for nlp.pipe and
+    runs them off the event loop. Sentence segmentation (segment()) and
+    claim canonicalization (canonicalize()) requests share the same batches.
+
+    With workers == 0 batches run in a single background thread. With
+    workers > 0 they are spread over a pool of processes that each keep a
+    loaded spaCy model, so parsing throughput scales with cores.
+
+    Args:
+        max_batch_size (int): Maximum texts per nlp.pipe call.
+        max_wait_ms (float): How long the first request of a batch waits for
+            others to join before the batch is dispatched.
+        workers (int): Size of the worker-process pool (0 disables it).
+    """
+
+    def __init__(self, max_batch_size: int = 32, max_wait_ms: float = 5, workers: int = 0):
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self.workers = workers
+        self._queue: Optional[asyncio.Queue] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def _start(self):
+        if self.workers > 0:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="spacy")
+        self._queue = asyncio.Queue()
+        # One batch in flight per worker; the batcher waits for a free slot.
+        self._slots = asyncio.Semaphore(max(1, self.workers))
+        self._batcher = asyncio.get_running_loop().create_task(self._run())
+
+    async def extract(self, text: str) -> List[str]:
+        """
+        Extract claims from one text. Resolves once its batch has been parsed.
+        """
+        return await self._submit("claims", text)
+
+    async def segment(self, text: str) -> List[Tuple[int, int, bool]]:
+        """
+        Sentence spans of one text: (start_char, end_char, has a verifiable entity).
+        """
+        return await self._submit("sentences", text)
+
+    async def canonicalize(self, text: str) -> Tuple[List[str], List[str]]:
+        """
+        (entities, content words) of one claim, see extractor.canonical_form.
+        """
+        return tuple(await self._submit("canonical", text)) or ([], [])
+
+    async def _submit(self, mode: str, text: str) -> list:
+        if not text:
+            return []
+        if self._batcher is None or self._batcher.done():
+            self._start()
+        future = asyncio.get_running_loop().create_future()
+        with span("extraction"):
+            await self._queue.put(((mode, text), future))
+            return await future
+
+    async def extract_many(self, texts: List[str]) -> List[List[str]]:
+        """
+        Extract claims from several texts; they join the same micro-batches.
+        """
+        return list(await asyncio.gather(*(self.extract(t) for t in texts)))
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._slots.acquire()
+            loop.create_task(self._dispatch(batch))
+
+    async def _dispatch(self, batch: List[Tuple[Tuple[str, str], asyncio.Future]]):
+        try:
+            items = [item for item, _ in batch]
+            results = await asyncio.get_running_loop().run_in_executor(
+                self._executor, analyze_batch, items, self.max_batch_size
+            )
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._slots.release()
+
+    async def close(self):
+        if self._batcher is not None:
+            self._batcher.cancel()
+            self._batcher = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+extraction_engine = ExtractionEngine(
+    max_batch_size=EXTRACTION_BATCH_SIZE,
+    max_wait_ms=EXTRACTION_MAX_WAIT_MS,
+    workers=EXTRACTION_WORKERS,
+)
+
+
+async def extract_claims_async(text: str) -> List[str]:
+    """
+    Non-blocking extract_claims backed by the shared batching engine.
+    """
+    return await extraction_engine.extract(text)
@@ -1,5 +1,5 @@
-import spacy
-from typing import List
+from typing import List, Tuple
+from app.utils.resources import lazy_resource
 
 # spaCy model to use
 MODEL_NAME = "en_core_web_sm"
@@ -7,12 +7,35 @@ MODEL_NAME = "en_core_web_sm"
 # Named Entity labels considered verifiable claims
 VERIFIABLE_ENTITY_LABELS = ["PERSON", "ORG", "GPE", "DATE", "EVENT"]
 
-# Load NLP model once at import
-try:
-    nlp = spacy.load(MODEL_NAME)
-except OSError:
-    print(f"Error loading spaCy model '{MODEL_NAME}'. Run: python -m spacy download {MODEL_NAME}")
-    raise
+# Stop words that change what a claim asserts: negation, comparison and
+# direction. canonical_form keeps them (as token norms, so "n't" is "not").
+NEGATION_WORDS = frozenset(["not", "no", "never", "nor", "without", "neither", "none", "nobody",
+                            "nothing", "nowhere", "cannot"])
+POLARITY_WORDS = NEGATION_WORDS | frozenset(["more", "less", "most", "least", "fewer", "above", "below",
+                                             "over", "under", "before", "after", "up", "down", "against",
+                                             "since", "until", "off", "out"])
+
+# Pipeline components the claim filter never reads. Only sentence boundaries
+# (parser) and entities (ner) are used, so POS tags and lemmas are skipped.
+EXCLUDED_COMPONENTS = ["tagger", "attribute_ruler", "lemmatizer"]
+
+
+def _load_nlp():
+    import spacy
+    try:
+        return spacy.load(MODEL_NAME, exclude=EXCLUDED_COMPONENTS)
+    except OSError:
+        print(f"Error loading spaCy model '{MODEL_NAME}'. Run: python -m spacy download {MODEL_NAME}")
+        raise
+
+
+# The model is loaded once, on first use or by the startup warm-up.
+_nlp = lazy_resource("spacy", _load_nlp)
+
+
+def get_nlp():
+    return _nlp.get()
+
 
 def extract_claims(text: str) -> List[str]:
     """
@@ -28,14 +51,99 @@ def extract_claims(text: str) -> List[str]:
     if not text:
         return []
 
-    doc = nlp(text)
+    return claims_from_doc(get_nlp()(text), text)
 
+
+def extract_claims_batch(texts: List[str], batch_size: int = 32) -> List[List[str]]:
+    """
+    Batched variant of extract_claims that runs the texts through nlp.pipe.
+
+    Args:
+        texts (List[str]): Input texts.
+        batch_size (int): Documents per nlp.pipe batch.
+
+    Returns:
+        List[List[str]]: Extracted claims for each input text, in order.
+    """
+    return analyze_batch([("claims", t) for t in texts], batch_size)
+
+
+def analyze_batch(items: List[Tuple[str, str]], batch_size: int = 32) -> list:
+    """
+    Parses (mode, text) items in one nlp.pipe pass. Mode "claims" yields
+    claims_from_doc's list for the text, mode "sentences" yields
+    sentence_spans, mode "canonical" yields canonical_form; empty texts
+    yield [].
+    """
+    results: list = [[] for _ in items]
+    indexed = [(i, mode, t) for i, (mode, t) in enumerate(items) if t]
+    docs = get_nlp().pipe((t for _, _, t in indexed), batch_size=batch_size)
+    for (i, mode, text), doc in zip(indexed, docs):
+        if mode == "sentences":
+            results[i] = sentence_spans(doc)
+        elif mode == "canonical":
+            results[i] = canonical_form(doc)
+        else:
+            results[i] = claims_from_doc(doc, text)
+    return results
+
+
+def _is_verifiable(sent) -> bool:
+    return any(ent.label_ in VERIFIABLE_ENTITY_LABELS for ent in sent.ents)
+
+
+def sentence_spans(doc) -> List[Tuple[int, int, bool]]:
+    """
+    (start_char, end_char, has a verifiable entity) for every sentence.
+    """
+    return [(sent.start_char, sent.end_char, _is_verifiable(sent)) for sent in doc.sents]
+
+
+def _normalize_entity(ent) -> str:
+    words = [t.norm_ for t in ent if not (t.is_punct or t.is_space)]
+    if words and words[0] == "the":
+        words = words[1:]
+    if words and words[-1] == "'s":
+        words = words[:-1]
+    return " ".join(words)
+
+
+def canonical_form(doc) -> Tuple[List[str], List[str]]:
+    """
+    Wording-independent form of a claim for near-duplicate matching.
+
+    Returns:
+        Tuple[List[str], List[str]]: The sorted entities as "LABEL:name"
+        (lower-cased, without a leading "the" or trailing "'s"), and the
+        content words in order: stop words (except POLARITY_WORDS) and
+        punctuation dropped, each entity collapsed into one token.
+    """
+    starts = {ent.start: ent for ent in doc.ents}
+    entities = set()
+    words = []
+    i = 0
+    while i < len(doc):
+        ent = starts.get(i)
+        if ent is not None:
+            name = _normalize_entity(ent)
+            if name:
+                entities.add(f"{ent.label_}:{name}")
+                words.append(name.replace(" ", "_"))
+            i = ent.end
+            continue
+        token = doc[i]
+        if not (token.is_punct or token.is_space) and (not token.is_stop or token.norm_ in POLARITY_WORDS):
+            words.append(token.norm_)
+        i += 1
+    return sorted(entities), words
+
+
+def claims_from_doc(doc, text: str) -> List[str]:
+    """
+    Applies the verifiable-entity sentence filter to an already parsed doc.
+    """
     # Filter sentences with at least one verifiable entity
-    claims = [
-        sent.text.strip()
-        for sent in doc.sents
-        if any(ent.label_ in VERIFIABLE_ENTITY_LABELS for ent in sent.ents)
-    ]
+    claims = [sent.text.strip() for sent in doc.sents if _is_verifiable(sent)]
 
     # Fallback: if no claim detected, treat the full text as one claim
     if not claims:
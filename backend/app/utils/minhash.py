@@ -0,0 +1,132 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+# Mersenne prime used for the universal hash family (a * x + b) mod p.
+_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+_TOKEN = re.compile(r"\w+")
+
+
+def shingles(text: str, size: int = 2) -> Set[str]:
+    """
+    Word n-gram shingles of lower-cased text.
+
+    Args:
+        text (str): Input text.
+        size (int): Number of words per shingle.
+
+    Returns:
+        Set[str]: Shingles; a single-word text still yields one shingle.
+    """
+    tokens = _TOKEN.findall(text.lower())
+    if len(tokens) < size:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+class MinHash:
+    """
+    Computes fixed-length MinHash signatures whose element-wise agreement
+    estimates the Jaccard similarity of two shingle sets.
+    """
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self._a = rng.randint(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 31, size=num_perm, dtype=np.uint64)
+
+    def signature(self, items: Iterable[str]) -> np.ndarray:
+        hashes = np.array(
+            [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little")
+             for s in items],
+            dtype=np.uint64,
+        )
+        if hashes.size == 0:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        # (num_perm, n) matrix of permuted hashes; the column-wise min is the signature.
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _PRIME & _MAX_HASH
+        return permuted.min(axis=1)
+
+    @staticmethod
+    def similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+        return float(np.mean(sig_a == sig_b))
+
+
+class MinHashLSH:
+    """
+    Banded locality-sensitive hash index over MinHash signatures.
+
+    Signatures are split into `bands` bands; two items become candidates when
+    any band matches exactly, and candidates are then confirmed against the
+    similarity threshold. The oldest items are dropped past `max_items`.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64, bands: int = 16,
+                 max_items: int = 10000, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_items = max_items
+        self.minhash = MinHash(num_perm=num_perm, seed=seed)
+        self._signatures: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._buckets: List[dict] = [{} for _ in range(bands)]
+        self._lock = threading.Lock()
+
+    def _band_keys(self, sig: np.ndarray):
+        for band in range(self.bands):
+            yield band, sig[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def insert(self, key: str, items: Iterable[str]) -> np.ndarray:
+        sig = self.minhash.signature(items)
+        with self._lock:
+            if key in self._signatures:
+                self._remove_locked(key)
+            self._signatures[key] = sig
+            for band, band_key in self._band_keys(sig):
+                self._buckets[band].setdefault(band_key, set()).add(key)
+            while len(self._signatures) > self.max_items:
+                self._remove_locked(next(iter(self._signatures)))
+        return sig
+
+    def remove(self, key: str):
+        with self._lock:
+            if key in self._signatures:
+                self._remove_locked(key)
+
+    def _remove_locked(self, key: str):
+        sig = self._signatures.pop(key)
+        for band, band_key in self._band_keys(sig):
+            bucket = self._buckets[band].get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band][band_key]
+
+    def query(self, items: Iterable[str]) -> Optional[Tuple[str, float]]:
+        """
+        Returns (key, estimated similarity) of the closest indexed item at or
+        above the threshold, or None.
+        """
+        sig = self.minhash.signature(items)
+        best = None
+        with self._lock:
+            candidates = set()
+            for band, band_key in self._band_keys(sig):
+                candidates.update(self._buckets[band].get(band_key, ()))
+            for key in candidates:
+                score = MinHash.similarity(sig, self._signatures[key])
+                if score >= self.threshold and (best is None or score > best[1]):
+                    best = (key, score)
+        return best
+
+    def __len__(self):
+        return len(self._signatures)
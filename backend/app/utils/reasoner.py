@@ -1,5 +1,42 @@
-from typing import List
+from typing import List, Tuple
 
+from app.utils.verdict_scoring import verdict_scorer
+
+# Verdict labels used by this reasoner for the shared scorer's outcomes.
+_LABELS = {"True": "True", "False": "False", "Mixed": "Needs Review"}
+
+
+def _as_review(item: str) -> Tuple[str, str]:
+    """
+    Splits a "rating - publisher" evidence line (as produced by the
+    fact-check service); other lines are scored as a bare rating.
+    """
+    rating, sep, publisher = item.rpartition(" - ")
+    return (rating, publisher) if sep else (item, "")
+
+
+def reason_claims(items: List[Tuple[str, List[str]]]) -> List[dict]:
+    """
+    Verdicts for many (claim, evidence) pairs in one vectorized pass.
+
+    Args:
+        items (List[Tuple[str, List[str]]]): Claims with the textual ratings
+            or evidence lines found by the fact-checker.
+
+    Returns:
+        List[dict]: One {"claim", "verdict", "confidence"} per item, in order.
+    """
+    scored = verdict_scorer.score_claims([[_as_review(e) for e in evidence] for _, evidence in items])
+    results = []
+    for (claim, evidence), score in zip(items, scored):
+        if score["rated"]:
+            results.append({"claim": claim, "verdict": _LABELS[score["verdict"]], "confidence": score["confidence"]})
+        elif evidence:
+            # Evidence exists but carries no recognizable rating.
+            results.append({"claim": claim, "verdict": "Needs Review", "confidence": 0.60})
+        else:
+            results.append({"claim": claim, "verdict": "Unverified", "confidence": 0.50})
+    return results
 
 
 def reason_claim(claim: str, evidence: List[str]):
@@ -13,38 +50,4 @@ def reason_claim(claim: str, evidence: List[str]):
     Returns:
         dict: A dictionary containing the claim, verdict, and confidence score.
     """
-
-    false_keywords = ["false", "misleading", "fake", "hoax", "unproven"]
-    
-    for item in evidence:
-        if any(keyword in item.lower() for keyword in false_keywords):
-            return {
-                "claim": claim,
-                "verdict": "False",
-                "confidence": 0.95  
-            }
-
-   
-    true_keywords = ["true", "accurate", "correct"]
-    for item in evidence:
-        if any(keyword in item.lower() for keyword in true_keywords):
-            return {
-                "claim": claim,
-                "verdict": "True",
-                "confidence": 0.90  # High confidence based on strong evidence rating
-            }
-
-    # 3. If there is evidence, but no clear rating, mark as Needs Review.
-    if evidence:
-        return {
-            "claim": claim,
-            "verdict": "Needs Review",
-            "confidence": 0.60
-        }
-
-    # 4. If no evidence was found at all.
-    return {
-        "claim": claim,
-        "verdict": "Unverified",
-        "confidence": 0.50
-    }
+    return reason_claims([(claim, evidence)])[0]
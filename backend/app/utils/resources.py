@@ -0,0 +1,88 @@
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+COLD = "cold"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class LazyResource:
+    """
+    A heavy dependency (model, client, module) built on first use.
+
+    get() runs the loader once, from whichever thread asks first; other
+    callers wait for that load instead of starting their own. A failed load
+    is recorded and retried on the next get().
+    """
+
+    def __init__(self, name: str, loader: Callable[[], Any]):
+        self.name = name
+        self.loader = loader
+        self.state = COLD
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self._value: Any = None
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self.state == READY
+
+    def get(self) -> Any:
+        if self.state == READY:
+            return self._value
+        with self._lock:
+            if self.state != READY:
+                self.state = LOADING
+                start = time.perf_counter()
+                try:
+                    self._value = self.loader()
+                except Exception as e:
+                    self.state = FAILED
+                    self.error = str(e)
+                    raise
+                self.load_seconds = time.perf_counter() - start
+                self.error = None
+                self.state = READY
+        return self._value
+
+    def status(self) -> dict:
+        return {
+            "state": self.state,
+            "load_seconds": None if self.load_seconds is None else round(self.load_seconds, 3),
+            "error": self.error,
+        }
+
+
+_resources: Dict[str, LazyResource] = {}
+
+
+def lazy_resource(name: str, loader: Callable[[], Any]) -> LazyResource:
+    """
+    Registers a lazily loaded resource under `name` (once) and returns it.
+    """
+    return _resources.setdefault(name, LazyResource(name, loader))
+
+
+def get_resource(name: str) -> Optional[LazyResource]:
+    return _resources.get(name)
+
+
+def resource_status() -> Dict[str, dict]:
+    """
+    Load state of every registered resource, for the readiness endpoint.
+    """
+    return {name: resource.status() for name, resource in _resources.items()}
+
+
+async def warm_up(names: Iterable[str]):
+    """
+    Loads the named resources concurrently on worker threads. Failures are
+    kept in the resource status rather than raised; unknown names are
+    ignored.
+    """
+    resources = [_resources[name] for name in names if name in _resources]
+    await asyncio.gather(*(asyncio.to_thread(r.get) for r in resources), return_exceptions=True)
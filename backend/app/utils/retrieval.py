@@ -0,0 +1,266 @@
+import os
+import re
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+_TOKEN = re.compile(r"\w+")
+
+STOP_WORDS = frozenset(
+    "a an and are as at be been but by for from had has have he her his i in is it its of on or "
+    "she that the their there they this to was were will with".split()
+)
+
+
+def query_terms(text: str) -> List[str]:
+    """
+    Lowercased word tokens without stop words and single characters.
+    """
+    terms = []
+    for token in _TOKEN.findall(text.lower()):
+        if len(token) > 1 and token not in STOP_WORDS and token not in terms:
+            terms.append(token)
+    return terms
+
+
+def split_passages(text: str, words: int = 120) -> List[str]:
+    """
+    Splits text into passages of at most `words` words.
+    """
+    tokens = text.split()
+    return [" ".join(tokens[i:i + words]) for i in range(0, len(tokens), words)] or [""]
+
+
+class TextEmbedder:
+    """
+    Mean-pooled sentence embeddings from a transformers encoder on CPU.
+    The model is loaded on first use.
+    """
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self._model = None
+        self._tokenizer = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._model is None:
+                from transformers import AutoModel, AutoTokenizer
+                self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+                self._model = AutoModel.from_pretrained(self.model_name).eval()
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        import torch
+        self._load()
+        with torch.no_grad():
+            batch = self._tokenizer(texts, padding=True, truncation=True, max_length=256, return_tensors="pt")
+            hidden = self._model(**batch).last_hidden_state
+            mask = batch["attention_mask"].unsqueeze(-1).float()
+            vectors = ((hidden * mask).sum(1) / mask.sum(1).clamp(min=1e-9)).numpy().astype(np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-9)
+
+
+class EvidenceIndex:
+    """
+    On-disk passage index over ingested articles and posts.
+
+    Passages live in an SQLite FTS5 table (an inverted index ranked with
+    BM25, title weighted above body). When an embedder is given, passage
+    vectors are stored alongside and kept in an in-memory float32 matrix;
+    search then fuses the BM25 and cosine rankings (reciprocal rank fusion).
+    Documents are indexed once by id, and the oldest are pruned beyond
+    `max_documents`.
+
+    Args:
+        path (str): SQLite database file.
+        passage_words (int): Maximum words per passage.
+        max_documents (int): Documents kept before the oldest are pruned.
+        min_overlap (float): Fraction of the query terms a passage must
+            contain to be returned, which drops matches on a single common word.
+        embedder (TextEmbedder): Optional dense encoder for the vector index.
+    """
+
+    def __init__(self, path: str, passage_words: int = 120, max_documents: int = 100000,
+                 min_overlap: float = 0.3, embedder: Optional[TextEmbedder] = None):
+        self.path = path
+        self.passage_words = passage_words
+        self.max_documents = max_documents
+        self.min_overlap = min_overlap
+        self.embedder = embedder
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        # (passage ids, matrix) swapped as one tuple so readers see a consistent pair.
+        self._vector_state = (np.zeros(0, dtype=np.int64), None)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        conn.execute("CREATE TABLE IF NOT EXISTS documents (doc_id TEXT PRIMARY KEY, ts REAL NOT NULL)")
+        conn.execute("CREATE INDEX IF NOT EXISTS documents_ts ON documents (ts)")
+        conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS passages USING fts5("
+            "title, body, doc_id UNINDEXED, url UNINDEXED, source UNINDEXED)"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS vectors (passage_id INTEGER PRIMARY KEY, vector BLOB NOT NULL)")
+        if self.embedder is not None:
+            self._load_vectors()
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared across threads, nor used in a
+        # worker process forked after the parent opened them.
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _load_vectors(self):
+        rows = self._conn().execute("SELECT passage_id, vector FROM vectors ORDER BY passage_id").fetchall()
+        ids = np.array([r[0] for r in rows], dtype=np.int64)
+        matrix = np.vstack([np.frombuffer(r[1], dtype=np.float32) for r in rows]) if rows else None
+        self._vector_state = (ids, matrix)
+
+    def add_documents(self, documents: List[dict]) -> int:
+        """
+        Index documents ({"id", "title", "text", "url", "source", "ts"}).
+        Already indexed ids are skipped. Returns the number of new documents.
+        """
+        with self._write_lock:
+            conn = self._conn()
+            ids = [d["id"] for d in documents]
+            known = set()
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                known.update(r[0] for r in conn.execute(
+                    f"SELECT doc_id FROM documents WHERE doc_id IN ({','.join('?' * len(chunk))})", chunk
+                ))
+
+            new_passages = []
+            added = 0
+            conn.execute("BEGIN")
+            try:
+                for doc in documents:
+                    if doc["id"] in known:
+                        continue
+                    known.add(doc["id"])
+                    conn.execute("INSERT INTO documents (doc_id, ts) VALUES (?, ?)", (doc["id"], doc["ts"]))
+                    for body in split_passages(doc.get("text") or "", self.passage_words):
+                        cursor = conn.execute(
+                            "INSERT INTO passages (title, body, doc_id, url, source) VALUES (?, ?, ?, ?, ?)",
+                            (doc.get("title") or "", body, doc["id"], doc.get("url") or "", doc.get("source") or ""),
+                        )
+                        new_passages.append((cursor.lastrowid, f"{doc.get('title') or ''}. {body}".strip(". ")))
+                    added += 1
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+            if self.embedder is not None and new_passages:
+                self._add_vectors(new_passages)
+            if added:
+                self._prune()
+            return added
+
+    def _add_vectors(self, passages: List[tuple]):
+        texts = [text for _, text in passages]
+        vectors = np.vstack([self.embedder.embed(texts[i:i + 64]) for i in range(0, len(texts), 64)])
+        conn = self._conn()
+        conn.executemany(
+            "INSERT OR REPLACE INTO vectors (passage_id, vector) VALUES (?, ?)",
+            [(pid, vector.tobytes()) for (pid, _), vector in zip(passages, vectors)],
+        )
+        ids, matrix = self._vector_state
+        new_ids = np.array([pid for pid, _ in passages], dtype=np.int64)
+        self._vector_state = (
+            np.concatenate([ids, new_ids]),
+            vectors if matrix is None else np.vstack([matrix, vectors]),
+        )
+
+    def _prune(self):
+        conn = self._conn()
+        excess = conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0] - self.max_documents
+        if excess <= 0:
+            return
+        stale = [r[0] for r in conn.execute("SELECT doc_id FROM documents ORDER BY ts LIMIT ?", (excess,))]
+        conn.execute("BEGIN")
+        for i in range(0, len(stale), 500):
+            chunk = stale[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            conn.execute(
+                f"DELETE FROM vectors WHERE passage_id IN (SELECT rowid FROM passages WHERE doc_id IN ({marks}))", chunk
+            )
+            conn.execute(f"DELETE FROM passages WHERE doc_id IN ({marks})", chunk)
+            conn.execute(f"DELETE FROM documents WHERE doc_id IN ({marks})", chunk)
+        conn.execute("COMMIT")
+        if self.embedder is not None:
+            self._load_vectors()
+
+    def _bm25(self, terms: List[str], limit: int) -> List[tuple]:
+        match = " OR ".join(f'"{t}"' for t in terms)
+        return self._conn().execute(
+            "SELECT rowid, -bm25(passages, 2.0, 1.0) FROM passages WHERE passages MATCH ? "
+            "ORDER BY bm25(passages, 2.0, 1.0) LIMIT ?",
+            (match, limit),
+        ).fetchall()
+
+    def _dense(self, text: str, limit: int) -> List[tuple]:
+        ids, vectors = self._vector_state
+        if vectors is None or not len(ids):
+            return []
+        scores = vectors @ self.embedder.embed([text])[0]
+        top = np.argpartition(-scores, min(limit, len(scores)) - 1)[:limit]
+        top = top[np.argsort(-scores[top])]
+        return [(int(ids[i]), float(scores[i])) for i in top]
+
+    def search(self, text: str, k: int = 5) -> List[Dict]:
+        """
+        Top-k passages for `text`, at most one per document, best first.
+        Each hit is {"doc_id", "title", "text", "url", "source", "score"}.
+        """
+        terms = query_terms(text)
+        if not terms:
+            return []
+        candidates = k * 4
+        ranked = {pid: score for pid, score in self._bm25(terms, candidates)}
+        if self.embedder is not None:
+            # Reciprocal rank fusion of the lexical and dense rankings.
+            fused: Dict[int, float] = {}
+            for ranking in (list(ranked), [pid for pid, _ in self._dense(text, candidates)]):
+                for rank, pid in enumerate(ranking):
+                    fused[pid] = fused.get(pid, 0.0) + 1.0 / (60 + rank)
+            ranked = fused
+        if not ranked:
+            return []
+
+        ids = list(ranked)
+        rows = self._conn().execute(
+            f"SELECT rowid, doc_id, title, body, url, source FROM passages WHERE rowid IN ({','.join('?' * len(ids))})",
+            ids,
+        ).fetchall()
+        hits, seen = [], set()
+        needed = max(1, round(self.min_overlap * len(terms)))
+        for rowid, doc_id, title, body, url, source in sorted(rows, key=lambda r: ranked[r[0]], reverse=True):
+            if doc_id in seen:
+                continue
+            words = set(query_terms(f"{title} {body}"))
+            if sum(term in words for term in terms) < needed:
+                continue
+            seen.add(doc_id)
+            hits.append({
+                "doc_id": doc_id, "title": title, "text": body, "url": url,
+                "source": source, "score": round(ranked[rowid], 4),
+            })
+            if len(hits) == k:
+                break
+        return hits
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM documents").fetchone()[0]
@@ -1,10 +1,49 @@
-import speech_recognition as sr
-import os
-from pydub import AudioSegment
-from typing import Optional
+from app.config import AUDIO_SAMPLE_RATE
+from app.utils.resources import lazy_resource
 
 
-r = sr.Recognizer()
+def _load_speech_recognition():
+    import speech_recognition
+    return speech_recognition
+
+
+def _load_recognizer():
+    return speech_recognition.get().Recognizer()
+
+
+def _load_pydub():
+    import pydub
+    return pydub
+
+
+# Loaded on first transcription (or by the startup warm-up).
+speech_recognition = lazy_resource("speech_recognition", _load_speech_recognition)
+recognizer = lazy_resource("recognizer", _load_recognizer)
+pydub = lazy_resource("pydub", _load_pydub)
+
+# 16-bit mono PCM, matching utils/audio_stream.
+SAMPLE_WIDTH = 2
+
+def transcribe_pcm(pcm: bytes, sample_rate: int = AUDIO_SAMPLE_RATE) -> str:
+    """
+    Transcribes one segment of raw 16-bit mono PCM with the Google Web Speech
+    API. Blocking; call it from a worker thread.
+
+    Args:
+        pcm (bytes): Raw PCM samples.
+        sample_rate (int): Sample rate of `pcm` in Hz.
+
+    Returns:
+        str: The transcribed text, or "" when the segment holds no speech.
+
+    Raises:
+        sr.RequestError: The speech API could not be reached.
+    """
+    sr = speech_recognition.get()
+    try:
+        return recognizer.get().recognize_google(sr.AudioData(pcm, sample_rate, SAMPLE_WIDTH))
+    except sr.UnknownValueError:
+        return ""
 
 def transcribe_audio(file_path: str) -> str:
     """
@@ -17,34 +56,19 @@ def transcribe_audio(file_path: str) -> str:
     Returns:
         str: The transcribed text or an error message.
     """
-    temp_wav_path: Optional[str] = None
-    original_file_path = file_path
-
+    sr = speech_recognition.get()
     try:
-        
-        temp_wav_path = original_file_path + ".wav"
-        audio = AudioSegment.from_file(original_file_path)
-        audio.export(temp_wav_path, format="wav")
-        
-      
-        with sr.AudioFile(temp_wav_path) as source:
-            
-            r.adjust_for_ambient_noise(source, duration=0.5)
-            audio_data = r.record(source) 
-        
-       
-        transcript = r.recognize_google(audio_data)
-        
-    except sr.UnknownValueError:
-        transcript = "Could not understand the audio. Please speak more clearly."
+        # Decode straight to PCM in memory instead of re-exporting a WAV file.
+        audio = pydub.get().AudioSegment.from_file(file_path)
+        audio = audio.set_channels(1).set_frame_rate(AUDIO_SAMPLE_RATE).set_sample_width(SAMPLE_WIDTH)
+        transcript = transcribe_pcm(audio.raw_data, AUDIO_SAMPLE_RATE)
+        if not transcript:
+            transcript = "Could not understand the audio. Please speak more clearly."
+
     except sr.RequestError as e:
         transcript = f"Speech API error. Check your network or API limits: {e}"
     except Exception as e:
         
         transcript = f"An unexpected transcription error occurred (Missing pydub/FFmpeg dependencies?): {e}"
-    finally:
-        
-        if temp_wav_path and os.path.exists(temp_wav_path):
-            os.remove(temp_wav_path)
             
     return transcript
@@ -0,0 +1,251 @@
+import abc
+import asyncio
+import json
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, List, Optional
+
+import numpy as np
+
+from app.config import (
+    AUDIO_SAMPLE_RATE,
+    STT_ENGINE,
+    STT_WORKERS,
+    VOSK_MODEL_PATH,
+    VAD_FRAME_MS,
+    VAD_ENERGY_THRESHOLD,
+    VAD_MIN_SILENCE_MS,
+    VAD_PADDING_MS,
+    AUDIO_SEGMENT_SECONDS,
+)
+from app.utils.stt import speech_recognition, transcribe_pcm
+
+# 16-bit mono PCM, matching utils/audio_stream.
+SAMPLE_WIDTH = 2
+
+
+class TranscriptionError(Exception):
+    """
+    Raised when an engine cannot transcribe at all (e.g. the web API is down),
+    as opposed to a segment that simply holds no speech.
+    """
+
+
+class SpeechToTextEngine(abc.ABC):
+    """
+    Interface for speech-to-text backends. transcribe() takes raw 16-bit
+    mono PCM and returns the text ("" for no speech).
+    """
+
+    name = "base"
+
+    @abc.abstractmethod
+    async def transcribe(self, pcm: bytes, sample_rate: int = AUDIO_SAMPLE_RATE) -> str:
+        """
+        Text spoken in `pcm`; raises TranscriptionError when the engine fails.
+        """
+
+    def warm(self):
+        """
+        Preload models so the first request does not pay for it.
+        """
+
+    def close(self):
+        pass
+
+
+class GoogleWebSTTEngine(SpeechToTextEngine):
+    """
+    Google Web Speech API through SpeechRecognition, on a worker thread.
+    """
+
+    name = "google"
+
+    async def transcribe(self, pcm: bytes, sample_rate: int = AUDIO_SAMPLE_RATE) -> str:
+        sr = speech_recognition.get()
+        try:
+            return await asyncio.to_thread(transcribe_pcm, pcm, sample_rate)
+        except sr.RequestError as e:
+            raise TranscriptionError(f"Speech API error. Check your network or API limits: {e}") from e
+
+
+# --- Vosk (offline, runs in worker processes) ---
+
+_vosk_model = None
+
+
+def _vosk_init(model_path: str):
+    global _vosk_model
+    from vosk import Model, SetLogLevel
+    SetLogLevel(-1)
+    _vosk_model = Model(model_path)
+
+
+def _vosk_ready() -> bool:
+    return _vosk_model is not None
+
+
+def _vosk_transcribe(pcm: bytes, sample_rate: int) -> str:
+    from vosk import KaldiRecognizer
+    recognizer = KaldiRecognizer(_vosk_model, sample_rate)
+    recognizer.AcceptWaveform(pcm)
+    return json.loads(recognizer.FinalResult()).get("text", "")
+
+
+class VoskSTTEngine(SpeechToTextEngine):
+    """
+    CPU-only offline recognition with a Vosk model (VOSK_MODEL_PATH). Each
+    worker process loads the model once, and segments are spread across
+    the pool so long recordings use every core.
+    """
+
+    name = "vosk"
+
+    def __init__(self, model_path: str, workers: int = 2):
+        self.model_path = model_path
+        self.workers = max(1, workers)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_vosk_init, initargs=(self.model_path,)
+            )
+        return self._pool
+
+    def warm(self):
+        # Submitting one task per worker forces every process to start and load the model.
+        executor = self._executor()
+        for _ in range(self.workers):
+            executor.submit(_vosk_ready)
+
+    async def transcribe(self, pcm: bytes, sample_rate: int = AUDIO_SAMPLE_RATE) -> str:
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor(), _vosk_transcribe, pcm, sample_rate)
+        except Exception as e:
+            raise TranscriptionError(f"Offline transcription failed: {e}") from e
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+
+_engines = {
+    "google": GoogleWebSTTEngine(),
+    "vosk": VoskSTTEngine(VOSK_MODEL_PATH, STT_WORKERS),
+}
+
+
+def get_stt_engine(name: Optional[str] = None) -> SpeechToTextEngine:
+    """
+    The engine named by STT_ENGINE ("google" or "vosk") unless `name` is given.
+    """
+    return _engines[name or STT_ENGINE]
+
+
+def close_stt_engines():
+    for engine in _engines.values():
+        engine.close()
+
+
+# --- Voice activity detection ---
+
+class VoiceActivitySegmenter:
+    """
+    Energy-based voice activity detection over a PCM stream.
+
+    Frames whose RMS exceeds both VAD_ENERGY_THRESHOLD and three times the
+    running noise floor count as speech. A segment ends after
+    VAD_MIN_SILENCE_MS of silence or once it reaches max_segment_seconds.
+    Silence between segments is dropped (apart from VAD_PADDING_MS around
+    speech), so the recognizer only sees audio that contains speech and
+    segments break at natural pauses.
+    """
+
+    def __init__(self, sample_rate: int = AUDIO_SAMPLE_RATE, frame_ms: int = VAD_FRAME_MS,
+                 energy_threshold: float = VAD_ENERGY_THRESHOLD, min_silence_ms: int = VAD_MIN_SILENCE_MS,
+                 padding_ms: int = VAD_PADDING_MS, max_segment_seconds: float = AUDIO_SEGMENT_SECONDS):
+        self.frame_bytes = int(sample_rate * frame_ms / 1000) * SAMPLE_WIDTH
+        self.energy_threshold = energy_threshold
+        self.min_silence_frames = max(1, min_silence_ms // frame_ms)
+        self.padding_frames = max(0, padding_ms // frame_ms)
+        self.max_frames = max(1, int(max_segment_seconds * 1000 / frame_ms))
+        self._pending = bytearray()
+        self._preroll: List[bytes] = []
+        self._segment: List[bytes] = []
+        self._silence_run = 0
+        self._noise_floor: Optional[float] = None
+
+    def _frame_energies(self, data: bytes) -> np.ndarray:
+        samples = np.frombuffer(data, dtype=np.int16).astype(np.float32)
+        frames = samples.reshape(-1, self.frame_bytes // SAMPLE_WIDTH)
+        return np.sqrt(np.mean(frames ** 2, axis=1))
+
+    def feed(self, pcm: bytes) -> List[bytes]:
+        """
+        Add PCM and return the segments completed by it.
+        """
+        self._pending.extend(pcm)
+        usable = len(self._pending) - len(self._pending) % self.frame_bytes
+        if not usable:
+            return []
+        data = bytes(self._pending[:usable])
+        del self._pending[:usable]
+
+        completed = []
+        for index, energy in enumerate(self._frame_energies(data)):
+            frame = data[index * self.frame_bytes:(index + 1) * self.frame_bytes]
+            threshold = self.energy_threshold
+            if self._noise_floor is not None:
+                threshold = max(threshold, 3 * self._noise_floor)
+            is_speech = energy > threshold
+            if not is_speech:
+                self._noise_floor = energy if self._noise_floor is None else 0.95 * self._noise_floor + 0.05 * energy
+
+            if not self._segment:
+                if is_speech:
+                    self._segment = self._preroll + [frame]
+                    self._preroll = []
+                    self._silence_run = 0
+                else:
+                    self._preroll.append(frame)
+                    if len(self._preroll) > self.padding_frames:
+                        self._preroll.pop(0)
+                continue
+
+            self._segment.append(frame)
+            self._silence_run = 0 if is_speech else self._silence_run + 1
+            if self._silence_run >= self.min_silence_frames or len(self._segment) >= self.max_frames:
+                completed.append(self._cut())
+        return completed
+
+    def _cut(self) -> bytes:
+        # Keep only `padding_frames` of the trailing silence.
+        trailing = max(0, self._silence_run - self.padding_frames)
+        frames = self._segment[:len(self._segment) - trailing] if trailing else self._segment
+        self._segment = []
+        self._silence_run = 0
+        return b"".join(frames)
+
+    def flush(self) -> List[bytes]:
+        """
+        Return the final, possibly incomplete segment.
+        """
+        if self._pending and self._segment:
+            self._segment.append(bytes(self._pending))
+        self._pending = bytearray()
+        return [self._cut()] if self._segment else []
+
+
+async def vad_segments(pcm_chunks: AsyncIterator[bytes], sample_rate: int = AUDIO_SAMPLE_RATE,
+                       max_segment_seconds: float = AUDIO_SEGMENT_SECONDS) -> AsyncIterator[bytes]:
+    """
+    Splits a PCM stream into speech segments at pauses as audio arrives.
+    """
+    segmenter = VoiceActivitySegmenter(sample_rate=sample_rate, max_segment_seconds=max_segment_seconds)
+    async for chunk in pcm_chunks:
+        for segment in segmenter.feed(chunk):
+            yield segment
+    for segment in segmenter.flush():
+        yield segment
@@ -1,9 +1,194 @@
-import pyttsx3
-import tempfile
+import asyncio
+import hashlib
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Optional
+from app.config import (
+    TTS_CACHE_DIR,
+    TTS_CACHE_MAX_BYTES,
+    TTS_CACHE_MAX_AGE,
+    TTS_RATE,
+    TTS_VOLUME,
+    TTS_VOICE,
+    TTS_FILE_EXTENSION,
+)
+from app.utils.metrics import span, counter
+from app.utils.resources import lazy_resource
+
+logger = logging.getLogger(__name__)
+
+
+def _load_pyttsx3():
+    import pyttsx3
+    return pyttsx3
+
+
+pyttsx3 = lazy_resource("pyttsx3", _load_pyttsx3)
+
+TTS_REQUESTS = counter("verisense_tts_requests_total", "Speech synthesis requests by cache result.", ("cache",))
+
+MEDIA_TYPES = {"wav": "audio/wav", "mp3": "audio/mpeg", "aiff": "audio/aiff"}
+
+
+class SpeechSynthesizer:
+    """
+    Text-to-speech with one long-lived pyttsx3 engine and a file cache.
+
+    The engine lives on a dedicated worker thread (pyttsx3 engines are not
+    thread-safe and init() is slow), and jobs are queued to it. Output files
+    are named by a hash of the text and voice settings, so a repeated phrase
+    is served from the cache without touching the engine. The cache directory
+    is trimmed by age (TTS_CACHE_MAX_AGE) and total size (TTS_CACHE_MAX_BYTES,
+    least recently used first).
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int, max_age: float):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._jobs: "queue.Queue" = queue.Queue()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def _settings_key(self, text: str) -> str:
+        payload = "\x00".join([text, str(TTS_VOICE), str(TTS_RATE), str(TTS_VOLUME)])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path_for(self, filename: str) -> Optional[str]:
+        """
+        Absolute path of a cached file, or None if the name is not one we issue.
+        """
+        name, _, ext = filename.partition(".")
+        if ext != TTS_FILE_EXTENSION or len(name) != 64 or not all(c in "0123456789abcdef" for c in name):
+            return None
+        path = os.path.join(self.cache_dir, filename)
+        return path if os.path.exists(path) else None
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                os.makedirs(self.cache_dir, exist_ok=True)
+                self._thread = threading.Thread(target=self._work, name="tts", daemon=True)
+                self._thread.start()
+
+    def _work(self):
+        try:
+            engine = pyttsx3.get().init()
+            if TTS_RATE:
+                engine.setProperty("rate", TTS_RATE)
+            if TTS_VOLUME is not None:
+                engine.setProperty("volume", TTS_VOLUME)
+            if TTS_VOICE:
+                engine.setProperty("voice", TTS_VOICE)
+        except Exception as e:
+            logger.warning("TTS engine failed to start: %s", e)
+            self._fail_queued(e)
+            return
+
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            text, path, future = job
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            try:
+                engine.save_to_file(text, tmp_path)
+                engine.runAndWait()
+                os.replace(tmp_path, path)
+                future.set_result(path)
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            self._evict()
+
+    def _fail_queued(self, error: Exception):
+        """
+        Fails every queued job and marks this worker dead, both under the
+        lock that synthesize() and _ensure_worker() take: a job queued
+        before is failed here, a job queued after starts a fresh worker.
+        """
+        with self._lock:
+            while True:
+                try:
+                    job = self._jobs.get_nowait()
+                except queue.Empty:
+                    break
+                if job is not None:
+                    job[2].set_exception(error)
+            self._thread = None
+
+    def _evict(self):
+        now = time.time()
+        entries = []
+        try:
+            for entry in os.scandir(self.cache_dir):
+                if not entry.name.endswith(f".{TTS_FILE_EXTENSION}"):
+                    continue
+                stat = entry.stat()
+                if now - stat.st_mtime > self.max_age:
+                    os.remove(entry.path)
+                else:
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                os.remove(path)
+                total -= size
+        except OSError as e:
+            logger.warning("TTS cache eviction failed: %s", e)
+
+    def synthesize(self, text: str) -> Future:
+        """
+        Returns a future resolving to the path of the audio for `text`.
+        """
+        filename = f"{self._settings_key(text)}.{TTS_FILE_EXTENSION}"
+        path = os.path.join(self.cache_dir, filename)
+        try:
+            # Refresh mtime so size-based eviction treats the file as recently used.
+            os.utime(path)
+            future: Future = Future()
+            future.set_result(path)
+            TTS_REQUESTS.inc(cache="hit")
+            return future
+        except FileNotFoundError:
+            pass
+
+        with self._lock:
+            future = self._inflight.get(path)
+            if future is None:
+                future = Future()
+                self._inflight[path] = future
+                future.add_done_callback(lambda _: self._inflight.pop(path, None))
+                self._jobs.put((text, path, future))
+                TTS_REQUESTS.inc(cache="miss")
+        self._ensure_worker()
+        return future
+
+    def close(self):
+        if self._thread is not None and self._thread.is_alive():
+            self._jobs.put(None)
+
+
+synthesizer = SpeechSynthesizer(TTS_CACHE_DIR, TTS_CACHE_MAX_BYTES, TTS_CACHE_MAX_AGE)
+
+
+async def synthesize_speech(text: str) -> str:
+    """
+    Non-blocking TTS. Returns the cached file name, served by /voice/speech/{filename}.
+    """
+    with span("tts"):
+        path = await asyncio.wrap_future(synthesizer.synthesize(text))
+    return os.path.basename(path)
+
 
 def generate_speech(text):
-    engine = pyttsx3.init()
-    tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3")
-    engine.save_to_file(text, tmp_file.name)
-    engine.runAndWait()
-    return tmp_file.name
+    return synthesizer.synthesize(text).result()
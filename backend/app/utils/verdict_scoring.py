@@ -0,0 +1,233 @@
+import json
+import logging
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.config import PUBLISHER_WEIGHTS_FILE
+
+logger = logging.getLogger(__name__)
+
+# Bump when the lexicon, weights or formula change so cached verdicts are recomputed.
+SCORING_VERSION = "3"
+
+# Textual ratings on a -1 (false) .. +1 (true) scale. Multi-word phrases win
+# over the single words they contain ("mostly false" over "false").
+RATING_SCALE: Dict[str, float] = {
+    "true": 1.0, "correct": 1.0, "accurate": 1.0, "verified": 1.0,
+    "mostly true": 0.6, "mostly correct": 0.6, "largely accurate": 0.6, "partly true": 0.2,
+    "half true": 0.0, "mixture": 0.0, "mixed": 0.0, "half truth": 0.0,
+    "needs context": -0.2, "missing context": -0.3, "lacks context": -0.3, "cherry picks": -0.3,
+    "unproven": -0.3, "unverified": -0.3, "unsupported": -0.4, "unsubstantiated": -0.4, "outdated": -0.3,
+    "disputed": -0.3, "exaggerated": -0.4, "exaggeration": -0.4, "partly false": -0.5,
+    "partially false": -0.5, "mostly false": -0.6, "misleading": -0.7, "distorted": -0.7,
+    "manipulated": -0.8, "altered": -0.8, "out of context": -0.6, "satire": -0.5,
+    "false": -1.0, "incorrect": -1.0, "wrong": -1.0, "fake": -1.0, "hoax": -1.0,
+    "fabricated": -1.0, "scam": -1.0, "pants on fire": -1.0, "debunked": -1.0,
+    "not true": -1.0, "not correct": -1.0, "not accurate": -1.0, "not verified": -0.3,
+    "baseless": -0.9, "no evidence": -0.6, "four pinocchios": -1.0, "three pinocchios": -0.7, "two pinocchios": -0.4, "one pinocchio": -0.2,
+}
+
+# A negator right before a rating flips it ("not false"); with a hedge word
+# in between ("not entirely true") the rating is flipped at HEDGED_NEGATION
+# strength, since a claim that is not entirely true is not simply false.
+NEGATORS = {"not", "never"}
+HEDGES = {"entirely", "quite", "fully", "completely", "exactly", "totally", "wholly", "strictly", "always", "all"}
+HEDGED_NEGATION = 0.5
+
+# Publisher reliability in (0, 1]; unlisted publishers get DEFAULT_PUBLISHER_WEIGHT.
+PUBLISHER_WEIGHTS: Dict[str, float] = {
+    "politifact": 1.0, "snopes": 1.0, "factcheck org": 1.0, "full fact": 1.0,
+    "reuters": 1.0, "afp": 1.0, "afp fact check": 1.0, "associated press": 1.0, "ap": 1.0,
+    "usa today": 0.9, "lead stories": 0.9, "the washington post": 0.9, "science feedback": 1.0,
+    "health feedback": 1.0, "check your fact": 0.8, "boom": 0.9, "boom live": 0.9,
+    "alt news": 0.9, "factly": 0.9, "vishvas news": 0.8, "newschecker": 0.8,
+    "india today": 0.8, "the quint": 0.8, "pib fact check": 0.8, "newsmeter": 0.8,
+}
+DEFAULT_PUBLISHER_WEIGHT = 0.7
+
+# Weighted mean score beyond which a verdict is True / False rather than Mixed.
+VERDICT_THRESHOLD = 0.3
+# Evidence mass (sum of weights) at which confidence saturation reaches ~63%.
+MASS_SCALE = 1.5
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _normalize(text: str) -> str:
+    text = _PUNCTUATION.sub(" ", text.lower().replace("-", " "))
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def _lookup(values: List[str], fn) -> np.ndarray:
+    """
+    fn(value) for every value, evaluated once per distinct value and
+    gathered back into a float array.
+    """
+    codes: Dict[str, int] = {}
+    positions = [codes.setdefault(v, len(codes)) for v in values]
+    table = np.array([fn(v) for v in codes], dtype=np.float64)
+    return table[np.asarray(positions, dtype=np.int64)] if values else np.zeros(0, dtype=np.float64)
+
+
+class PhraseTrie:
+    """
+    Word-level trie for longest-match phrase lookup, so a rating is mapped
+    with one pass over its tokens instead of a scan per keyword.
+    """
+
+    def __init__(self, phrases: Dict[str, float]):
+        self._root: dict = {}
+        for phrase, value in phrases.items():
+            node = self._root
+            for word in _normalize(phrase).split():
+                node = node.setdefault(word, {})
+            node[None] = value
+
+    def matches(self, tokens: Sequence[str]) -> List[Tuple[int, float]]:
+        """
+        (start, value) of every longest phrase, scanning left to right
+        without overlaps.
+        """
+        found = []
+        start = 0
+        while start < len(tokens):
+            node, value, end = self._root, None, start + 1
+            for position in range(start, len(tokens)):
+                node = node.get(tokens[position])
+                if node is None:
+                    break
+                if None in node:
+                    value, end = node[None], position + 1
+            if value is not None:
+                found.append((start, value))
+            start = end
+        return found
+
+
+class VerdictScorer:
+    """
+    Maps textual ratings to a numeric scale and aggregates weighted reviews
+    into a verdict and calibrated confidence for many claims at once.
+
+    Exact (normalized) ratings resolve through a dict; anything else goes
+    through the phrase trie, and both are memoized per distinct rating, so
+    string work is paid once per rating rather than once per review. A
+    rating with several phrases ("True, but misleading") takes the most
+    negative one, after negators are applied.
+    Aggregation runs on flat NumPy arrays (np.bincount per claim index).
+
+    Confidence is 0.5 plus a share of 0.49 that grows with the strength of
+    the weighted mean score, the agreement between reviews (1 - weighted std)
+    and the total evidence weight, so one review never reads as certain and
+    conflicting reviews pull confidence down.
+    """
+
+    def __init__(self, scale: Dict[str, float] = RATING_SCALE,
+                 publisher_weights: Dict[str, float] = PUBLISHER_WEIGHTS,
+                 default_weight: float = DEFAULT_PUBLISHER_WEIGHT):
+        self._exact = {_normalize(k): v for k, v in scale.items()}
+        self._trie = PhraseTrie(scale)
+        self._publishers = {_normalize(k): v for k, v in publisher_weights.items()}
+        self._default_weight = default_weight
+        self._rating_memo: Dict[str, float] = {}
+
+    def rating_score(self, rating: str) -> float:
+        """
+        Score in [-1, 1] for a textual rating: 0.0 (neutral) for a rating
+        outside the lexicon, NaN when there is no rating text at all.
+        """
+        score = self._rating_memo.get(rating)
+        if score is None:
+            normalized = _normalize(rating or "")
+            score = self._exact.get(normalized)
+            if score is None:
+                score = self._phrase_score(normalized.split()) if normalized else float("nan")
+            if len(self._rating_memo) < 100000:
+                self._rating_memo[rating] = score
+        return score
+
+    def _phrase_score(self, tokens: List[str]) -> float:
+        scores = []
+        for start, value in self._trie.matches(tokens):
+            if start >= 1 and tokens[start - 1] in NEGATORS:
+                value = -value
+            elif start >= 2 and tokens[start - 1] in HEDGES and tokens[start - 2] in NEGATORS:
+                value = -HEDGED_NEGATION * value
+            scores.append(value)
+        return min(scores, default=0.0)
+
+    def publisher_weight(self, publisher: str) -> float:
+        return self._publishers.get(_normalize(publisher or ""), self._default_weight)
+
+    def score_claims(self, reviews: List[Iterable[Tuple[str, str]]]) -> List[dict]:
+        """
+        Args:
+            reviews: For each claim, its (textual rating, publisher) pairs.
+
+        Returns:
+            List[dict]: Per claim {"verdict", "confidence", "score", "rated"}
+            where verdict is "True", "False", "Mixed", or "Unverified" when
+            no review carries a rating; score is the weighted
+            mean rating and rated the number of rated reviews.
+        """
+        n = len(reviews)
+        reviews = [list(r) for r in reviews]
+        lengths = np.fromiter((len(r) for r in reviews), dtype=np.int64, count=n)
+        index = np.repeat(np.arange(n, dtype=np.int64), lengths)
+        flat = [pair for claim_reviews in reviews for pair in claim_reviews]
+        scores = _lookup([pair[0] for pair in flat], self.rating_score)
+        weights = _lookup([pair[1] for pair in flat], self.publisher_weight)
+        rated = ~np.isnan(scores)
+        index, scores, weights = index[rated], scores[rated], weights[rated]
+
+        mass = np.bincount(index, weights=weights, minlength=n)
+        counts = np.bincount(index, minlength=n)
+        safe_mass = np.where(mass > 0, mass, 1.0)
+        mean = np.bincount(index, weights=weights * scores, minlength=n) / safe_mass
+        variance = np.bincount(index, weights=weights * (scores - mean[index]) ** 2, minlength=n) / safe_mass
+        agreement = 1.0 - np.clip(np.sqrt(variance), 0.0, 1.0)
+        saturation = 1.0 - np.exp(-mass / MASS_SCALE)
+
+        strength = np.abs(mean)
+        decisive = strength >= VERDICT_THRESHOLD
+        confidence = np.where(
+            decisive,
+            0.5 + 0.49 * strength * agreement * saturation,
+            # Mixed: confident that it is mixed when scores cluster near zero.
+            0.5 + 0.2 * (1.0 - strength / VERDICT_THRESHOLD) * agreement * saturation,
+        )
+
+        verdicts = np.where(decisive, np.where(mean > 0, "True", "False"), "Mixed").astype(object)
+        verdicts[counts == 0] = "Unverified"
+        confidence[counts == 0] = 0.5
+        return [
+            {"verdict": verdict, "confidence": conf, "score": score, "rated": rated}
+            for verdict, conf, score, rated in zip(
+                verdicts.tolist(), np.round(confidence, 3).tolist(), np.round(mean, 3).tolist(), counts.tolist()
+            )
+        ]
+
+
+def _load_publisher_weights(path: Optional[str]) -> Dict[str, float]:
+    weights = dict(PUBLISHER_WEIGHTS)
+    if path:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                weights.update({k: float(v) for k, v in json.load(f).items()})
+        except (OSError, ValueError) as e:
+            logger.warning("Could not load publisher weights from %s: %s", path, e)
+    return weights
+
+
+def build_scorer(publisher_weights_path: Optional[str] = None) -> VerdictScorer:
+    """
+    Scorer with the built-in lexicon and publisher weights, optionally
+    extended or overridden by a JSON file of {"publisher": weight}.
+    """
+    return VerdictScorer(publisher_weights=_load_publisher_weights(publisher_weights_path))
+
+
+verdict_scorer = build_scorer(PUBLISHER_WEIGHTS_FILE)
@@ -1,12 +1,25 @@
 import os
-from googleapiclient.discovery import build
 from app.config import GOOGLE_FACTCHECK_API_KEY
+from app.utils.resources import lazy_resource
 
 GOOGLE_FACTCHECK_API_KEY = os.getenv("GOOGLE_FACTCHECK_API_KEY")
 
+
+def _build_service():
+    from googleapiclient.discovery import build
+    return build("factchecktools", "v1alpha1", developerKey=GOOGLE_FACTCHECK_API_KEY, cache_discovery=False)
+
+
+# Building the client fetches and parses the discovery document, so it is done once.
+_service = lazy_resource("googleapiclient", _build_service)
+
+
 def verify_claim(claim):
-    service = build("factchecktools", "v1alpha1", developerKey=GOOGLE_FACTCHECK_API_KEY)
-    response = service.claims().search(query=claim).execute()
+    """
+    Blocking fact-check lookup. Async code should use
+    services/factcheck_service.verify_with_google_factcheck, which is cached.
+    """
+    response = _service.get().claims().search(query=claim).execute()
     if "claims" in response:
         return response["claims"]
     return []
@@ -0,0 +1,429 @@
+"""
+End-to-end load test: latency percentiles and throughput per endpoint, with
+a baseline file for regression checks.
+
+Run from the backend directory:
+
+    python bench/loadgen.py [--scenarios claims_extract,news] [--concurrency 16]
+                            [--duration 20] [--workers 1] [--latency-ms 50 ...]
+                            [--save-baseline bench/baseline.json]
+                            [--baseline bench/baseline.json --tolerance 0.1]
+
+By default the mock upstreams (bench/mock_upstreams.py) and the app
+(python -m app.serve) are started as subprocesses on free ports, with every
+upstream URL pointed at the mocks, and stopped afterwards; upstream latency
+and errors are set with the mock options (--latency-ms, --error-rate,
+--set groq.latency_ms=800, ...). With --url the scenarios run against an
+already running server instead, which must then be configured by hand.
+
+Each scenario runs `concurrency` closed-loop clients for `duration` seconds
+after `warmup` seconds whose requests are not counted. Reported per
+scenario: completed requests, errors (HTTP >= 400 or connection errors),
+throughput, latency p50/p95/p99/mean of successful requests, and (with
+mocks) upstream calls per request. Claim payloads mix a hot set that repeats
+with fresh claims (--unique-ratio), so cache effects show up in the numbers.
+The app's own Groq budget (LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE)
+still applies against the mocks; raise it in the environment to measure the
+pipeline rather than the limiter.
+
+--save-baseline writes the results with the run parameters, commit and host
+details. --baseline compares against such a file and exits with status 1
+when throughput drops, p95/p99 latency rises by more than --tolerance, or
+the error rate grows by more than one percentage point. Baselines are only
+comparable when taken on the same machine with the same parameters; record
+one on the reference host before changing performance-sensitive code.
+"""
+import argparse
+import asyncio
+import io
+import json
+import math
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import aiohttp
+
+from mock_upstreams import add_behavior_arguments, upstream_env
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.join(BACKEND_DIR, "bench")
+
+# Claims that repeat across requests, as popular claims do in production.
+HOT_CLAIMS = 50
+
+_SUBJECTS = ("The Prime Minister", "Barack Obama", "The health ministry", "Apple", "The Mumbai police",
+             "The election commission", "A viral video", "The finance minister")
+_ACTIONS = ("announced", "denied", "confirmed", "claimed", "reported")
+_OBJECTS = ("a new metro line in Mumbai", "free vaccines for all adults", "a ban on plastic bags in Delhi",
+            "record rainfall in Chennai", "a fuel price cut", "a cyclone warning for Odisha")
+
+
+def make_claim(n: int) -> str:
+    """
+    Claim number n; distinct n give distinct claims.
+    """
+    return (f"{_SUBJECTS[n % len(_SUBJECTS)]} {_ACTIONS[n // 7 % len(_ACTIONS)]} "
+            f"{_OBJECTS[n // 3 % len(_OBJECTS)]} on Monday, affecting {n + 2} thousand people.")
+
+
+def _document(rng: random.Random, claim: str) -> dict:
+    return {"json": {"text": f"{claim} Officials have not commented. {make_claim(rng.randrange(10 ** 6))}"}}
+
+
+@dataclass
+class Scenario:
+    """
+    One endpoint under load. request(rng, claim) returns keyword arguments
+    for aiohttp's session.request (json=, data=, params=).
+    """
+
+    name: str
+    method: str
+    path: str
+    request: Callable[[random.Random, str], dict]
+
+
+def _tone_wav(seconds: float = 2.0, rate: int = 16000) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(b"".join(
+            int(8000 * math.sin(2 * math.pi * 220 * i / rate)).to_bytes(2, "little", signed=True)
+            for i in range(int(seconds * rate))
+        ))
+    return buffer.getvalue()
+
+
+_WAV = None
+
+
+def _audio_upload(rng: random.Random, claim: str) -> dict:
+    global _WAV
+    if _WAV is None:
+        _WAV = _tone_wav()
+    form = aiohttp.FormData()
+    form.add_field("file", _WAV, filename="sample.wav", content_type="audio/wav")
+    return {"data": form}
+
+
+SCENARIOS: Dict[str, Scenario] = {s.name: s for s in (
+    Scenario("claims_extract", "POST", "/claims/extract", _document),
+    Scenario("verification_run", "POST", "/verification/run", lambda rng, claim: {"json": {"claim": claim}}),
+    Scenario("reasoning_run", "POST", "/reasoning/run",
+             lambda rng, claim: {"json": {"claim": claim, "evidence": ["False - Reuters", "Misleading - Snopes"]}}),
+    Scenario("news", "GET", "/news/", lambda rng, claim: {"params": {"limit": "50"}}),
+    Scenario("social", "GET", "/social/", lambda rng, claim: {}),
+    # Needs ffmpeg and a speech-to-text engine on the server.
+    Scenario("voice_process_audio", "POST", "/voice/process-audio", _audio_upload),
+)}
+
+
+def percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    """
+    Nearest-rank percentile of an ascending list, or None when it is empty.
+    """
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float, statuses: Dict[str, int]) -> dict:
+    latencies = sorted(latencies)
+
+    def ms(value: Optional[float]) -> Optional[float]:
+        return None if value is None else round(value * 1000, 2)
+
+    total = len(latencies) + errors
+    return {
+        "requests": total,
+        "errors": errors,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+        "p50_ms": ms(percentile(latencies, 0.50)),
+        "p95_ms": ms(percentile(latencies, 0.95)),
+        "p99_ms": ms(percentile(latencies, 0.99)),
+        "mean_ms": ms(sum(latencies) / len(latencies)) if latencies else None,
+        "statuses": statuses,
+    }
+
+
+async def run_scenario(base_url: str, scenario: Scenario, concurrency: int, duration: float,
+                       warmup: float = 0.0, unique_ratio: float = 0.2, seed: int = 0,
+                       timeout: float = 60.0) -> dict:
+    """
+    Drives one scenario with closed-loop clients and returns summarize()'s report.
+    """
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    errors = 0
+    fresh = [HOT_CLAIMS]
+    started = time.monotonic()
+    measure_from = started + warmup
+    deadline = measure_from + duration
+
+    async def client(session: aiohttp.ClientSession, rng: random.Random):
+        nonlocal errors
+        while time.monotonic() < deadline:
+            if rng.random() < unique_ratio:
+                fresh[0] += 1
+                claim = make_claim(fresh[0])
+            else:
+                claim = make_claim(rng.randrange(HOT_CLAIMS))
+            begin = time.perf_counter()
+            try:
+                async with session.request(scenario.method, base_url + scenario.path,
+                                           **scenario.request(rng, claim)) as response:
+                    await response.read()
+                    status = str(response.status)
+                    ok = response.status < 400
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                status, ok = type(e).__name__, False
+            elapsed = time.perf_counter() - begin
+            if time.monotonic() < measure_from:
+                continue
+            statuses[status] = statuses.get(status, 0) + 1
+            if ok:
+                latencies.append(elapsed)
+            else:
+                errors += 1
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=timeout)) as session:
+        await asyncio.gather(*(client(session, random.Random(seed * 1000 + i)) for i in range(concurrency)))
+    return summarize(latencies, errors, time.monotonic() - max(measure_from, started), statuses)
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def wait_for(url: str, timeout: float, status: int = 200) -> bool:
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(url) as response:
+                    if response.status == status:
+                        return True
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.5)
+    return False
+
+
+async def fetch_json(url: str) -> Optional[dict]:
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(url) as response:
+                return await response.json()
+    except aiohttp.ClientError:
+        return None
+
+
+class Environment:
+    """
+    Mock upstreams plus the app, each in its own subprocess, on free ports.
+    Databases and caches go to a temporary directory.
+    """
+
+    def __init__(self, args):
+        self.args = args
+        self.mock_url = f"http://127.0.0.1:{free_port()}"
+        self.app_url = f"http://127.0.0.1:{free_port()}"
+        self._tmp = tempfile.TemporaryDirectory(prefix="verisense-bench-")
+        self._procs: List[subprocess.Popen] = []
+
+    def _mock_command(self) -> List[str]:
+        a = self.args
+        command = [sys.executable, os.path.join(BENCH_DIR, "mock_upstreams.py"),
+                   "--port", self.mock_url.rsplit(":", 1)[1], "--latency-ms", str(a.latency_ms),
+                   "--jitter-ms", str(a.jitter_ms), "--error-rate", str(a.error_rate),
+                   "--error-status", str(a.error_status), "--seed", str(a.seed)]
+        for override in a.set:
+            command += ["--set", override]
+        return command
+
+    def __enter__(self) -> "Environment":
+        logs = None if self.args.verbose else subprocess.DEVNULL
+        self._procs.append(subprocess.Popen(self._mock_command(), cwd=BACKEND_DIR, stdout=logs, stderr=logs))
+        env = {
+            **os.environ,
+            **upstream_env(self.mock_url),
+            "JOB_DB": os.path.join(self._tmp.name, "jobs.db"),
+            "RETRIEVAL_DB": os.path.join(self._tmp.name, "evidence.db"),
+            "TTS_CACHE_DIR": os.path.join(self._tmp.name, "tts"),
+            "LOG_LEVEL": os.environ.get("LOG_LEVEL", "WARNING"),
+        }
+        if self.args.workers > 1 and "SHARED_CACHE_DB" not in os.environ:
+            env["SHARED_CACHE_DB"] = os.path.join(self._tmp.name, "shared.db")
+        self._procs.append(subprocess.Popen(
+            [sys.executable, "-m", "app.serve", "--host", "127.0.0.1",
+             "--port", self.app_url.rsplit(":", 1)[1], "--workers", str(self.args.workers)],
+            cwd=BACKEND_DIR, env=env, stdout=logs, stderr=logs,
+        ))
+        if not asyncio.run(wait_for(f"{self.app_url}/ready", self.args.startup_timeout)):
+            self.__exit__(None, None, None)
+            raise RuntimeError("The app did not become ready; rerun with --verbose to see its output")
+        return self
+
+    def __exit__(self, *exc):
+        for proc in reversed(self._procs):
+            proc.terminate()
+            try:
+                proc.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        self._procs = []
+        self._tmp.cleanup()
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_all(args) -> dict:
+    names = [n.strip() for n in args.scenarios.split(",") if n.strip()]
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {unknown}; choose from {list(SCENARIOS)}")
+
+    def measure(base_url: str, mock_url: Optional[str]) -> Dict[str, dict]:
+        results = {}
+        for name in names:
+            before = asyncio.run(fetch_json(f"{mock_url}/_stats")) if mock_url else None
+            result = asyncio.run(run_scenario(base_url, SCENARIOS[name], args.concurrency, args.duration,
+                                              args.warmup, args.unique_ratio, args.seed, args.timeout))
+            after = asyncio.run(fetch_json(f"{mock_url}/_stats")) if mock_url else None
+            if before and after and result["requests"]:
+                calls = {k: after["requests"][k] - before["requests"][k] for k in after["requests"]}
+                result["upstream_calls_per_request"] = {
+                    k: round(v / result["requests"], 3) for k, v in calls.items() if v
+                }
+            results[name] = result
+            print(f"  {name}: {result['throughput_rps']} req/s, p95 {result['p95_ms']} ms, "
+                  f"{result['errors']} errors", file=sys.stderr)
+        return results
+
+    if args.url:
+        results = measure(args.url.rstrip("/"), None)
+    else:
+        with Environment(args) as env:
+            results = measure(env.app_url, env.mock_url)
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "target": args.url or "spawned",
+            "params": {
+                "concurrency": args.concurrency, "duration": args.duration, "warmup": args.warmup,
+                "unique_ratio": args.unique_ratio, "workers": args.workers, "latency_ms": args.latency_ms,
+                "jitter_ms": args.jitter_ms, "error_rate": args.error_rate, "overrides": args.set,
+            },
+        },
+        "results": results,
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> List[dict]:
+    """
+    Per scenario and metric: baseline value, current value, relative change
+    and whether it counts as a regression.
+    """
+    rows = []
+    if report["meta"]["params"] != baseline.get("meta", {}).get("params"):
+        print("warning: run parameters differ from the baseline's; the comparison may not be meaningful",
+              file=sys.stderr)
+    for name, current in report["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            continue
+        for metric, higher_is_worse in (("throughput_rps", False), ("p95_ms", True), ("p99_ms", True),
+                                        ("error_rate", True)):
+            old, new = previous.get(metric), current.get(metric)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old if old else (0.0 if new == old else math.inf)
+            if metric == "error_rate":
+                regression = new - old > 0.01
+            else:
+                regression = change > tolerance if higher_is_worse else change < -tolerance
+            rows.append({"scenario": name, "metric": metric, "baseline": old, "current": new,
+                         "change": change, "regression": regression})
+    return rows
+
+
+def print_report(report: dict, comparison: Optional[List[dict]]):
+    print(f"{'scenario':<22}{'requests':>9}{'errors':>8}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, r in report["results"].items():
+        print(f"{name:<22}{r['requests']:>9}{r['errors']:>8}{r['throughput_rps']:>9}"
+              f"{str(r['p50_ms']):>10}{str(r['p95_ms']):>10}{str(r['p99_ms']):>10}")
+    if comparison:
+        print(f"\n{'scenario':<22}{'metric':<16}{'baseline':>10}{'current':>10}{'change':>9}")
+        for row in comparison:
+            flag = "  REGRESSION" if row["regression"] else ""
+            print(f"{row['scenario']:<22}{row['metric']:<16}{row['baseline']:>10}{row['current']:>10}"
+                  f"{row['change']:>+9.1%}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenario names.")
+    parser.add_argument("--url", help="Run against this server instead of spawning mocks and the app.")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for the spawned app.")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20.0, help="Measured seconds per scenario.")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Unmeasured seconds before each scenario.")
+    parser.add_argument("--unique-ratio", type=float, default=0.2,
+                        help="Share of requests with a never-seen claim; the rest repeat a hot set.")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds.")
+    parser.add_argument("--startup-timeout", type=float, default=180.0)
+    parser.add_argument("--save-baseline", metavar="FILE")
+    parser.add_argument("--baseline", metavar="FILE", help="Compare against this baseline file.")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative change before a regression.")
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON.")
+    parser.add_argument("--verbose", action="store_true", help="Show the output of the spawned processes.")
+    add_behavior_arguments(parser)
+    args = parser.parse_args()
+
+    report = run_all(args)
+    comparison = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            comparison = compare(report, json.load(f), args.tolerance)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+    if args.json:
+        print(json.dumps({**report, "comparison": comparison}, indent=2))
+    else:
+        print_report(report, comparison)
+    if comparison and any(row["regression"] for row in comparison):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
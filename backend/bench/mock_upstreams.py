@@ -0,0 +1,343 @@
+"""
+Local stand-ins for every upstream the backend calls, for load tests that
+must not depend on (or be rate limited by) the real services:
+
+    /factcheck   Google Fact Check Tools   claims:search
+    /groq        Groq (OpenAI-compatible)  chat completions, incl. streaming
+    /newsapi     NewsAPI                   top-headlines
+    /newsdata    NewsData.io               news
+    /pib         PIB RSS feed              with ETag / 304
+    /reddit, /r  Reddit                    OAuth token, /r/<sub>/hot listings
+    /twitter     Twitter API v2            recent search
+
+Responses are synthetic but shaped like the real ones, and deterministic for
+a given request, so cache behaviour in the app is the same from run to run.
+Every upstream has its own latency (fixed + uniform jitter) and error
+injection (a share of requests answered with an error status). GET /_stats
+returns the number of requests and injected errors per upstream.
+
+Standalone, from the backend directory:
+
+    python bench/mock_upstreams.py --port 9100 --latency-ms 50 --set groq.latency_ms=800
+
+then start the app with the variables printed at startup (see upstream_env).
+bench/loadgen.py starts the mocks itself unless given --url.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+from dataclasses import dataclass, fields
+from email.utils import formatdate
+from typing import Dict, Iterable, Optional
+
+from aiohttp import web
+
+UPSTREAMS = ("factcheck", "groq", "newsapi", "newsdata", "pib", "reddit", "twitter")
+
+_RATINGS = ("False", "Misleading", "True", "Mostly True", "Half True", "Pants on Fire", "Missing context")
+_PUBLISHERS = ("PolitiFact", "Snopes", "Reuters", "AFP Fact Check", "BOOM", "Alt News")
+_TOPICS = ("monsoon floods", "metro line", "election results", "vaccine drive", "fuel prices",
+           "heatwave", "rail accident", "budget session", "cyclone warning", "stock market")
+
+
+@dataclass
+class Behavior:
+    """
+    Latency and error injection for one upstream.
+    """
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+
+
+def _digest(text: str) -> int:
+    return int(hashlib.sha1(text.encode("utf-8")).hexdigest()[:8], 16)
+
+
+def _headline(i: int, epoch: int) -> str:
+    return f"Update {epoch}-{i}: officials respond to {_TOPICS[(i + epoch) % len(_TOPICS)]}"
+
+
+class MockUpstreams:
+    def __init__(self, behaviors: Dict[str, Behavior], seed: int = 0, news_period: float = 300):
+        self.behaviors = behaviors
+        self.news_period = news_period
+        self.requests = {name: 0 for name in UPSTREAMS}
+        self.errors = {name: 0 for name in UPSTREAMS}
+        self._random = random.Random(seed)
+
+    async def _behave(self, upstream: str) -> Optional[web.Response]:
+        """
+        Sleeps for the upstream's latency; returns an error response when
+        this request is chosen for error injection.
+        """
+        self.requests[upstream] += 1
+        behavior = self.behaviors[upstream]
+        delay = behavior.latency_ms + self._random.uniform(0, behavior.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if behavior.error_rate and self._random.random() < behavior.error_rate:
+            self.errors[upstream] += 1
+            headers = {"Retry-After": "1"} if behavior.error_status == 429 else None
+            return web.json_response({"error": "injected failure"}, status=behavior.error_status, headers=headers)
+        return None
+
+    def _news_epoch(self) -> int:
+        # Headlines rotate every news_period seconds, like a live feed.
+        return int(time.time() // self.news_period)
+
+    async def factcheck(self, request: web.Request) -> web.Response:
+        error = await self._behave("factcheck")
+        if error is not None:
+            return error
+        query = request.query.get("query", "")
+        h = _digest(query)
+        # About a third of claims have no published fact-check.
+        if h % 3 == 0:
+            return web.json_response({})
+        reviews = [
+            {
+                "publisher": {"name": _PUBLISHERS[(h >> (4 * i)) % len(_PUBLISHERS)]},
+                "url": f"https://factcheck.example/{h:x}/{i}",
+                "title": f"Fact check: {query[:60]}",
+                "textualRating": _RATINGS[(h >> (3 * i)) % len(_RATINGS)],
+            }
+            for i in range(1 + h % 3)
+        ]
+        return web.json_response({"claims": [{"text": query, "claimant": "Social media", "claimReview": reviews}]})
+
+    def _groq_answer(self, messages: list) -> str:
+        prompt = "\n".join(str(m.get("content", "")) for m in messages)
+        h = _digest(prompt)
+        verdicts = ("True", "False", "Needs Review")
+        claim_ids = [int(i) for i in re.findall(r"^Claim (\d+):", prompt, flags=re.MULTILINE)]
+        if claim_ids:
+            return json.dumps([
+                {"id": i, "verdict": verdicts[(h + i) % 3], "reasoning": "Synthetic reasoning for claim %d." % i,
+                 "confidence": round(0.55 + ((h >> i) % 40) / 100, 2)}
+                for i in claim_ids
+            ])
+        answer = {"verdict": verdicts[h % 3], "reasoning": "Synthetic reasoning from the mock upstream.",
+                  "confidence": round(0.55 + (h % 40) / 100, 2)}
+        return "Weighing the evidence step by step before answering.\n" + json.dumps(answer)
+
+    async def groq_chat(self, request: web.Request) -> web.StreamResponse:
+        error = await self._behave("groq")
+        if error is not None:
+            return error
+        body = await request.json()
+        content = self._groq_answer(body.get("messages", []))
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in body.get("messages", [])) // 4
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": len(content) // 4,
+                 "total_tokens": prompt_tokens + len(content) // 4}
+        base = {"id": f"chatcmpl-{_digest(content):x}", "created": int(time.time()), "model": body.get("model")}
+
+        if not body.get("stream"):
+            return web.json_response({
+                **base, "object": "chat.completion",
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": usage,
+            })
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        pieces = re.findall(r"\S+\s*", content)
+        behavior = self.behaviors["groq"]
+        for i, piece in enumerate(pieces):
+            chunk = {**base, "object": "chat.completion.chunk",
+                     "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            # Spread the configured latency over the tokens, like a real stream.
+            if behavior.latency_ms and i < len(pieces) - 1:
+                await asyncio.sleep(behavior.latency_ms / 1000 / len(pieces))
+        final = {**base, "object": "chat.completion.chunk",
+                 "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}], "x_groq": {"usage": usage}}
+        await response.write(f"data: {json.dumps(final)}\n\ndata: [DONE]\n\n".encode())
+        await response.write_eof()
+        return response
+
+    async def newsapi(self, request: web.Request) -> web.Response:
+        error = await self._behave("newsapi")
+        if error is not None:
+            return error
+        epoch = self._news_epoch()
+        articles = [
+            {"source": {"id": None, "name": "Mock Wire"}, "title": _headline(i, epoch),
+             "description": "Synthetic article for load testing.", "url": f"https://newsapi.example/{epoch}/{i}",
+             "urlToImage": None, "publishedAt": formatdate(time.time() - i * 60, usegmt=True)}
+            for i in range(int(request.query.get("pageSize", "10")))
+        ]
+        return web.json_response({"status": "ok", "totalResults": len(articles), "articles": articles})
+
+    async def newsdata(self, request: web.Request) -> web.Response:
+        error = await self._behave("newsdata")
+        if error is not None:
+            return error
+        epoch = self._news_epoch()
+        results = [
+            {"title": _headline(i + 100, epoch), "link": f"https://newsdata.example/{epoch}/{i}",
+             "source_id": "mockdata", "source_name": "Mock Data", "pubDate": time.strftime(
+                 "%Y-%m-%d %H:%M:%S", time.gmtime(time.time() - i * 90)),
+             "category": ["top"], "description": "Synthetic article for load testing.", "image_url": None}
+            for i in range(10)
+        ]
+        return web.json_response({"status": "success", "totalResults": len(results), "results": results})
+
+    async def pib(self, request: web.Request) -> web.Response:
+        error = await self._behave("pib")
+        if error is not None:
+            return error
+        epoch = self._news_epoch()
+        etag = f'"pib-{epoch}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        items = "".join(
+            f"<item><title>{_headline(i + 200, epoch)}</title><link>https://pib.example/{epoch}/{i}</link>"
+            f"<pubDate>{formatdate(time.time() - i * 120, usegmt=True)}</pubDate></item>"
+            for i in range(10)
+        )
+        body = f'<?xml version="1.0"?><rss version="2.0"><channel><title>PIB</title>{items}</channel></rss>'
+        return web.Response(text=body, content_type="application/rss+xml",
+                            headers={"ETag": etag, "Last-Modified": formatdate(epoch * self.news_period, usegmt=True)})
+
+    async def reddit_token(self, request: web.Request) -> web.Response:
+        return web.json_response({"access_token": "mock-token", "token_type": "bearer", "expires_in": 86400, "scope": "*"})
+
+    async def reddit_hot(self, request: web.Request) -> web.Response:
+        error = await self._behave("reddit")
+        if error is not None:
+            return error
+        subreddit = request.match_info["subreddit"]
+        epoch = self._news_epoch()
+        children = [
+            {"kind": "t3", "data": {
+                "id": f"{epoch:x}{i}", "name": f"t3_{epoch:x}{i}", "subreddit": subreddit,
+                "title": _headline(i + 300, epoch), "url": f"https://reddit.example/r/{subreddit}/{epoch}/{i}",
+                "score": 1000 - i * 37, "author": "mock_user", "created_utc": time.time() - i * 300,
+                "permalink": f"/r/{subreddit}/comments/{epoch:x}{i}/",
+            }}
+            for i in range(int(request.query.get("limit", "10")))
+        ]
+        return web.json_response({"kind": "Listing", "data": {"after": None, "before": None, "children": children}})
+
+    async def twitter(self, request: web.Request) -> web.Response:
+        error = await self._behave("twitter")
+        if error is not None:
+            return error
+        query = request.query.get("query", "")
+        epoch = self._news_epoch()
+        data = [
+            {"id": str(_digest(f"{query}{epoch}{i}")), "text": f"{_headline(i + 400, epoch)} #{query}"}
+            for i in range(int(request.query.get("max_results", "10")))
+        ]
+        return web.json_response({"data": data, "meta": {"result_count": len(data)}})
+
+    async def stats(self, request: web.Request) -> web.Response:
+        return web.json_response({"requests": self.requests, "errors": self.errors})
+
+
+def build_app(behaviors: Dict[str, Behavior], seed: int = 0, news_period: float = 300) -> web.Application:
+    mock = MockUpstreams(behaviors, seed=seed, news_period=news_period)
+    app = web.Application()
+    app["mock"] = mock
+    app.add_routes([
+        web.get("/factcheck/v1alpha1/claims:search", mock.factcheck),
+        web.post("/groq/openai/v1/chat/completions", mock.groq_chat),
+        web.get("/newsapi/v2/top-headlines", mock.newsapi),
+        web.get("/newsdata/api/1/news", mock.newsdata),
+        web.get("/pib/rssfeed.aspx", mock.pib),
+        web.post("/reddit/api/v1/access_token", mock.reddit_token),
+        # prawcore joins API paths onto the OAuth host root, so listings live at /r/.
+        web.get("/r/{subreddit}/hot", mock.reddit_hot),
+        web.get("/twitter/2/tweets/search/recent", mock.twitter),
+        web.get("/_stats", mock.stats),
+    ])
+    return app
+
+
+def upstream_env(base_url: str) -> Dict[str, str]:
+    """
+    Environment for the app (see app/config.py) that routes every upstream
+    to the mocks at base_url, with placeholder API keys.
+    """
+    return {
+        "GOOGLE_FACTCHECK_URL": f"{base_url}/factcheck/v1alpha1/claims:search",
+        "GROQ_BASE_URL": f"{base_url}/groq",
+        "NEWSAPI_URL": f"{base_url}/newsapi/v2/top-headlines",
+        "NEWSDATA_URL": f"{base_url}/newsdata/api/1/news",
+        "PIB_RSS_URL": f"{base_url}/pib/rssfeed.aspx",
+        "TWITTER_SEARCH_URL": f"{base_url}/twitter/2/tweets/search/recent",
+        "REDDIT_URL": f"{base_url}/reddit",
+        "REDDIT_OAUTH_URL": base_url,
+        "GOOGLE_FACTCHECK_API_KEY": "mock",
+        "GROQ_API_KEY": "mock",
+        "NEWS_API_KEY": "mock",
+        "NEWSDATA_API_KEY": "mock",
+        "REDDIT_CLIENT_ID": "mock",
+        "REDDIT_SECRET": "mock",
+        "TWITTER_BEARER_TOKEN": "mock",
+    }
+
+
+def parse_behaviors(default: Behavior, overrides: Iterable[str]) -> Dict[str, Behavior]:
+    """
+    One Behavior per upstream from the defaults plus "upstream.field=value"
+    overrides, e.g. "groq.latency_ms=800" or "factcheck.error_rate=0.05".
+    """
+    behaviors = {name: Behavior(**vars(default)) for name in UPSTREAMS}
+    types = {f.name: f.type for f in fields(Behavior)}
+    for override in overrides:
+        target, _, value = override.partition("=")
+        upstream, _, field = target.partition(".")
+        if upstream not in behaviors or field not in types:
+            raise ValueError(f"Bad override {override!r}: expected <upstream>.<field>=<value>, "
+                             f"upstream in {UPSTREAMS}, field in {tuple(types)}")
+        setattr(behaviors[upstream], field, int(value) if field == "error_status" else float(value))
+    return behaviors
+
+
+def add_behavior_arguments(parser: argparse.ArgumentParser):
+    group = parser.add_argument_group("upstream behaviour")
+    group.add_argument("--latency-ms", type=float, default=50.0, help="Base latency of every upstream.")
+    group.add_argument("--jitter-ms", type=float, default=20.0, help="Uniform random extra latency.")
+    group.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with an error.")
+    group.add_argument("--error-status", type=int, default=503)
+    group.add_argument("--set", action="append", default=[], metavar="UPSTREAM.FIELD=VALUE",
+                       help="Per-upstream override, e.g. groq.latency_ms=800 (repeatable).")
+    group.add_argument("--seed", type=int, default=0)
+
+
+def behaviors_from_args(args) -> Dict[str, Behavior]:
+    default = Behavior(args.latency_ms, args.jitter_ms, args.error_rate, args.error_status)
+    return parse_behaviors(default, args.set)
+
+
+async def start(host: str, port: int, behaviors: Dict[str, Behavior], seed: int = 0) -> web.AppRunner:
+    runner = web.AppRunner(build_app(behaviors, seed=seed), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    add_behavior_arguments(parser)
+    args = parser.parse_args()
+
+    base_url = f"http://{args.host}:{args.port}"
+    for name, value in upstream_env(base_url).items():
+        print(f"export {name}={value}")
+    web.run_app(build_app(behaviors_from_args(args), seed=args.seed), host=args.host, port=args.port,
+                access_log=None, print=None)
+
+
+if __name__ == "__main__":
+    main()
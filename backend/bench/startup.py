@@ -0,0 +1,106 @@
+"""
+Startup benchmark: how long `import app.main` takes, which modules dominate
+it, and how long each lazily loaded resource takes to warm up.
+
+Run from the backend directory:
+
+    python bench/startup.py [--top 20] [--json]
+
+The import is measured in a fresh interpreter with `-X importtime`, so
+nothing is cached from this process. Warm-up times are measured here by
+loading every registered resource one after another; resources whose
+dependency is missing are reported as failed.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_import(top: int) -> dict:
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - start
+
+    modules = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        modules.append({
+            "module": name.strip(),
+            # Nested imports are indented under the module that triggered them.
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+
+    # The heaviest modules at any depth, which surfaces third-party packages
+    # pulled in by app modules, not just app.main itself.
+    heaviest = sorted(
+        (m for m in modules if m["module"] not in ("site", "app.main")),
+        key=lambda m: m["cumulative_ms"], reverse=True,
+    )
+    return {
+        "ok": proc.returncode == 0,
+        "error": proc.stderr.strip().splitlines()[-1] if proc.returncode != 0 and proc.stderr.strip() else None,
+        "wall_seconds": round(wall, 3),
+        "top_modules": heaviest[:top],
+    }
+
+
+def measure_warmup() -> dict:
+    sys.path.insert(0, BACKEND_DIR)
+    os.chdir(BACKEND_DIR)
+    import app.main  # noqa: F401  (registers every resource)
+    from app.utils.resources import get_resource, resource_status
+
+    results = {}
+    for name in list(resource_status()):
+        start = time.perf_counter()
+        try:
+            get_resource(name).get()
+            results[name] = {"ok": True, "seconds": round(time.perf_counter() - start, 3)}
+        except Exception as e:
+            error = str(e).strip().splitlines()[0] if str(e).strip() else type(e).__name__
+            results[name] = {"ok": False, "seconds": round(time.perf_counter() - start, 3), "error": error}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=20, help="modules to list by cumulative import time")
+    parser.add_argument("--json", action="store_true", help="print a JSON report")
+    args = parser.parse_args()
+
+    report = {"import": measure_import(args.top)}
+    if report["import"]["ok"]:
+        report["warmup"] = measure_warmup()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    imp = report["import"]
+    print(f"import app.main: {imp['wall_seconds']:.3f}s wall (fresh interpreter)")
+    if not imp["ok"]:
+        print(f"  import failed: {imp['error']}")
+        return
+    print(f"\n{'cumulative ms':>14} {'self ms':>9}  module (depth)")
+    for m in imp["top_modules"]:
+        print(f"{m['cumulative_ms']:>14.1f} {m['self_ms']:>9.1f}  {m['module']} ({m['depth']})")
+    print(f"\n{'warm-up s':>10}  resource")
+    for name, result in report["warmup"].items():
+        status = "" if result["ok"] else f"  (failed: {result['error']})"
+        print(f"{result['seconds']:>10.3f}  {name}{status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Worker-count benchmark: throughput and memory of `python -m app.serve` with
+1, 2, 4... pre-forked workers.
+
+Run from the backend directory:
+
+    python bench/workers.py [--workers 1,2,4] [--concurrency 32] [--duration 20]
+                            [--scenario claims_extract] [--json]
+
+For every worker count the server is started on a free port, warmed until
+/ready answers 200, then driven with `concurrency` closed-loop clients for
+`duration` seconds (the scenarios and load loop of bench/loadgen.py).
+Reported per run: requests/sec, error count, p50/p95/p99 latency, and the
+memory of the whole process tree (parent + workers) sampled at the end of
+the load:
+
+  rss_mb   sum of resident set sizes; pages shared copy-on-write between
+           workers are counted once per process, so this overstates usage.
+  pss_mb   proportional set size (Linux): shared pages are split between
+           the processes that map them, so this is the real footprint and
+           shows what preloading before fork saves.
+
+The default scenario (claim extraction) is CPU-bound spaCy work and needs no
+upstream API keys; for the others, use bench/loadgen.py --workers N, which
+also starts the mock upstreams. app.serve shares caches through
+SHARED_CACHE_DB (default backend/data/shared.db); set it empty in the environment to
+benchmark per-worker caches.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+from loadgen import SCENARIOS, free_port, run_scenario, wait_for
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _process_tree(root: int) -> List[int]:
+    parents: Dict[int, int] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                # The command name may contain spaces; fields resume after ")".
+                fields = f.read().rsplit(")", 1)[1].split()
+            parents[int(entry)] = int(fields[1])
+        except (OSError, IndexError, ValueError):
+            continue
+    tree, frontier = [root], [root]
+    while frontier:
+        frontier = [pid for pid, ppid in parents.items() if ppid in frontier]
+        tree.extend(frontier)
+    return tree
+
+
+def _memory_kb(pid: int, field: str, path: str) -> int:
+    try:
+        with open(f"/proc/{pid}/{path}", "r") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def tree_memory(root: int) -> dict:
+    pids = _process_tree(root)
+    return {
+        "processes": len(pids),
+        "rss_mb": round(sum(_memory_kb(p, "VmRSS", "status") for p in pids) / 1024, 1),
+        "pss_mb": round(sum(_memory_kb(p, "Pss", "smaps_rollup") for p in pids) / 1024, 1),
+    }
+
+
+def run(workers: int, args) -> dict:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "app.serve", "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers)],
+        cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        if not asyncio.run(wait_for(f"{base_url}/ready", args.startup_timeout)):
+            return {"workers": workers, "error": "server did not become ready"}
+        idle = tree_memory(proc.pid)
+        result = asyncio.run(run_scenario(base_url, SCENARIOS[args.scenario], args.concurrency, args.duration,
+                                          warmup=args.warmup))
+        loaded = tree_memory(proc.pid)
+        return {
+            "workers": workers,
+            **{k: result[k] for k in ("requests", "errors", "throughput_rps", "p50_ms", "p95_ms", "p99_ms")},
+            "idle_pss_mb": idle["pss_mb"],
+            "rss_mb": loaded["rss_mb"],
+            "pss_mb": loaded["pss_mb"],
+            "processes": loaded["processes"],
+        }
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts.")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds of load per run.")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Unmeasured seconds before measuring.")
+    parser.add_argument("--scenario", default="claims_extract", choices=sorted(SCENARIOS))
+    parser.add_argument("--startup-timeout", type=float, default=120.0)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    results = [run(int(n), args) for n in args.workers.split(",") if n.strip()]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'workers':>7}  {'req/s':>8}  {'errors':>6}  {'p50 ms':>8}  {'p95 ms':>8}  {'p99 ms':>8}  "
+          f"{'RSS MB':>8}  {'PSS MB':>8}  {'idle PSS':>8}")
+    for r in results:
+        if "error" in r:
+            print(f"{r['workers']:>7}  {r['error']}")
+            continue
+        print(f"{r['workers']:>7}  {r['throughput_rps']:>8}  {r['errors']:>6}  {str(r['p50_ms']):>8}  "
+              f"{str(r['p95_ms']):>8}  {str(r['p99_ms']):>8}  "
+              f"{r['rss_mb']:>8}  {r['pss_mb']:>8}  {r['idle_pss_mb']:>8}")
+
+
+if __name__ == "__main__":
+    main()